@@ -1,22 +1,514 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, abort, g, render_template, request, jsonify, send_from_directory, session, redirect, url_for
 from flask_cors import CORS
+import json
+import mimetypes
+import os
 import random
+import time
 from config import Config
 from utils.ai_helper import AIHelper
+from utils.analytics import AnalyticsExporter
+from utils.assets import AssetManifest
+from utils.job_manager import DONE, FAILED, JobLimitReached, JobManager
+from utils.llm_scheduler import LLMOverloaded, client_key, set_current_session
+from utils.metrics import HTTP_REQUEST_DURATION, registry
+from utils.page_cache import PageCache
+from utils.prefetcher import QuestionPrefetcher
 from utils.session_manager import SessionManager
+from utils.token_budget import fit_qa_pairs
 
 app = Flask(__name__)
-app.config.from_object(Config)
-CORS(app)
 
-# Initialize helpers
-ai_helper = AIHelper()
-session_manager = SessionManager()
+# Helpers are built by create_app, so importing this module stays cheap
+page_cache = None
+assets = None
+ai_helper = None
+session_manager = None
+job_manager = None
+question_prefetcher = None
+
+def create_app(start_background: bool = True) -> Flask:
+    """
+    Configure the application and build its helpers; later calls return the same app.
+    
+    Heavy libraries (the OpenAI SDK, scikit-learn, numpy) are still imported on first use;
+    call warm_up to load them ahead of traffic.
+    
+    Args:
+        start_background: Start the background threads now. Pass False when the process will
+            fork afterwards (gunicorn --preload) and call start_background_work in each worker.
+        
+    Returns:
+        The Flask application
+    """
+    global page_cache, assets, ai_helper, session_manager, job_manager, question_prefetcher
+    if ai_helper is not None:
+        return app
+    
+    app.config.from_object(Config)
+    CORS(app)
+    
+    page_cache = PageCache()
+    assets = AssetManifest(os.path.join(app.static_folder, 'dist'), enabled=Config.ASSET_FINGERPRINTS)
+    ai_helper = AIHelper()
+    session_manager = SessionManager()
+    if Config.ANALYTICS_EXPORT_ENABLED:
+        session_manager.exporter = AnalyticsExporter(
+            Config.ANALYTICS_EXPORT_DIR,
+            batch_rows=Config.ANALYTICS_EXPORT_BATCH,
+            flush_interval=Config.ANALYTICS_EXPORT_INTERVAL
+        )
+    job_manager = JobManager(
+        workers=Config.JOBS_WORKERS,
+        max_active=Config.JOBS_MAX_ACTIVE,
+        ttl=Config.JOBS_TTL
+    )
+    question_prefetcher = QuestionPrefetcher(
+        ai_helper.generate_question,
+        workers=Config.PREFETCH_WORKERS,
+        max_in_flight=Config.PREFETCH_MAX_IN_FLIGHT,
+        max_slots=Config.PREFETCH_MAX_SLOTS,
+        wait_timeout=Config.PREFETCH_WAIT_TIMEOUT
+    )
+    _register_metrics()
+    
+    if start_background:
+        start_background_work()
+    return app
+
+def start_background_work() -> None:
+    """Start the session reaper, job sweeper, analytics export and LLM connection warmup; threads don't survive a fork, so run this per worker."""
+    session_manager.start_reaper()
+    job_manager.start_sweeper(Config.JOBS_SWEEP_INTERVAL)
+    if session_manager.exporter is not None:
+        session_manager.exporter.start()
+    if Config.OPENAI_API_KEY and Config.LLM_WARM_CONNECTIONS:
+        ai_helper.llm.warm_in_background(Config.LLM_WARM_CONNECTIONS)
+
+def warm_up() -> None:
+    """Import the lazily loaded libraries now, e.g. in a preloading master so workers share them."""
+    ai_helper.warm_up()
+
+def _register_metrics() -> None:
+    """Expose the helpers' live counters on /metrics; they are read at scrape time."""
+    def session_evictions():
+        return {('expired',): session_manager.expired_evictions, ('pressure',): session_manager.pressure_evictions}
+    
+    def prefetch_results():
+        stats = question_prefetcher.stats()
+        return {('hit',): stats['hits'], ('miss',): stats['misses'], ('skipped',): stats['skipped']}
+    
+    def coalesced_calls():
+        stats = ai_helper.single_flight.stats()
+        return {('upstream',): stats['upstream'], ('coalesced',): stats['coalesced']}
+    
+    def breaker_state():
+        state = ai_helper.llm.breaker.state
+        return {(name,): int(name == state) for name in ('closed', 'half_open', 'open')}
+    
+    def queue_depth():
+        waiting = ai_helper.llm.scheduler.stats()['waiting_by_priority']
+        return {(str(priority),): count for priority, count in waiting.items()}
+    
+    registry.callback('mockmate_llm_queue_depth', 'LLM calls waiting for admission by priority',
+                      queue_depth, ['priority'])
+    registry.callback('mockmate_llm_in_flight', 'LLM calls admitted and not yet finished',
+                      lambda: ai_helper.llm.scheduler.stats()['in_flight'])
+    registry.callback('mockmate_jobs_active', 'Background jobs queued or running',
+                      lambda: job_manager.stats()['active'])
+    registry.callback('mockmate_session_event_streams', 'Open session event streams',
+                      lambda: session_manager.events.stats()['subscribers'])
+    registry.callback('mockmate_llm_circuit_state', 'Upstream circuit breaker state (1 for the current state)',
+                      breaker_state, ['state'])
+    registry.callback('mockmate_llm_circuit_rejections_total', 'Upstream calls refused while the circuit was open',
+                      lambda: ai_helper.llm.breaker.rejected, kind='counter')
+    registry.callback('mockmate_sessions_active', 'Sessions held by the session store', session_manager.store.count)
+    registry.callback('mockmate_session_evictions_total', 'Sessions evicted by reason',
+                      session_evictions, ['reason'], kind='counter')
+    registry.callback('mockmate_prefetch_total', 'Prefetched question lookups by result',
+                      prefetch_results, ['result'], kind='counter')
+    registry.callback('mockmate_llm_coalescing_total', 'Coalescable LLM requests by whether they reached the upstream',
+                      coalesced_calls, ['path'], kind='counter')
+    
+    if ai_helper.question_cache:
+        def cache_lookups():
+            stats = ai_helper.question_cache.stats()
+            return {('hit',): stats['hits'], ('miss',): stats['misses']}
+        
+        registry.callback('mockmate_question_cache_lookups_total', 'Question cache lookups by result',
+                          cache_lookups, ['result'], kind='counter')
+        registry.callback('mockmate_question_cache_questions', 'Questions held in the question cache',
+                          lambda: ai_helper.question_cache.stats()['questions'])
+        registry.callback('mockmate_question_cache_bytes', 'Approximate size of the question cache',
+                          lambda: ai_helper.question_cache.stats()['bytes'])
+    
+    if ai_helper.evaluation_cache:
+        def evaluation_lookups():
+            stats = ai_helper.evaluation_cache.stats()
+            return {('hit',): stats['hits'], ('disk_hit',): stats['disk_hits'], ('miss',): stats['misses']}
+        
+        registry.callback('mockmate_evaluation_cache_lookups_total', 'Evaluation cache lookups by result',
+                          evaluation_lookups, ['result'], kind='counter')
+        registry.callback('mockmate_evaluation_cache_entries', 'Evaluations held in memory',
+                          lambda: ai_helper.evaluation_cache.stats()['entries'])
+    
+    if session_manager.exporter:
+        registry.callback('mockmate_analytics_rows_exported_total', 'Response rows written to the analytics export',
+                          lambda: session_manager.exporter.rows_written, kind='counter')
+
+@app.before_request
+def start_timer():
+    """Note when request handling started."""
+    g.request_start = time.perf_counter()
+
+@app.before_request
+def bind_llm_session():
+    """Queue this request's LLM calls under its session (or its client), so sessions are scheduled fairly."""
+    set_current_session(session.get('session_id') or client_key(request.remote_addr))
+
+@app.after_request
+def record_request_duration(response):
+    """Record route latency; for streamed responses this is the time to the first byte."""
+    start = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            route=route,
+            method=request.method,
+            status=response.status_code
+        )
+    return response
+
+@app.template_global()
+def asset_url(filename: str) -> str:
+    """URL of a static file, fingerprinted when a built copy exists so it can be cached forever."""
+    path = assets.fingerprinted(filename)
+    if path:
+        return url_for('built_asset', path=path)
+    return url_for('static', filename=filename)
+
+def _preferred_encoding(available) -> str:
+    """Pick the best precompressed encoding the client accepts, or None for uncompressed."""
+    for encoding in ('br', 'gzip'):
+        if encoding in available and request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+def _cached_page(template: str, status: int = 200, **context) -> Response:
+    """
+    Serve a page that depends on no per-user state from the page cache.
+    
+    The page is rendered once; later hits send the stored (precompressed) bytes, and
+    revalidations with a matching If-None-Match get an empty 304.
+    """
+    page = page_cache.get(template) if Config.PAGE_CACHE_ENABLED else None
+    if page is None:
+        html = render_template(template, **context)
+        if not Config.PAGE_CACHE_ENABLED:
+            return Response(html, status=status, mimetype='text/html')
+        page = page_cache.put(template, html)
+    
+    encoding = _preferred_encoding(page.encoded)
+    response = Response(page.encoded[encoding] if encoding else page.body, status=status, mimetype='text/html')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if status != 200:
+        return response
+    
+    # Each encoding is a different representation, so it gets its own strong ETag
+    response.set_etag(f"{page.etag}-{encoding}" if encoding else page.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def _sse_event(event: str, data, event_id=None) -> str:
+    """Format a Server-Sent Events message, with an id the browser sends back as Last-Event-ID on reconnect."""
+    message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return f"id: {event_id}\n{message}" if event_id is not None else message
+
+def _sse_response(events) -> Response:
+    """Wrap an event generator in a streaming text/event-stream response."""
+    return Response(events, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+class ApiError(Exception):
+    """A JSON error answer, raised by the request helpers these routes share with asgi.py."""
+    
+    def __init__(self, message: str, status: int = 400, retry_after: int = None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.retry_after = retry_after
+    
+    def to_dict(self) -> dict:
+        """The JSON body of the error."""
+        if self.retry_after is None:
+            return {'error': self.message}
+        return {'error': self.message, 'retry_after': self.retry_after}
+    
+    def headers(self) -> dict:
+        """Headers telling clients when to retry, if they should."""
+        return {'Retry-After': str(self.retry_after)} if self.retry_after is not None else {}
+
+def _overloaded_error(error: LLMOverloaded) -> ApiError:
+    """Tell clients to back off when the LLM scheduler can't take more work."""
+    return ApiError('The AI coach is busy, please try again shortly', error.status, error.retry_after)
+
+def _overloaded_event(error: LLMOverloaded) -> str:
+    """The event a stream ends with when the LLM scheduler turned its calls away."""
+    return _sse_event('error', {'error': str(error), 'retry_after': error.retry_after})
+
+def _interview_session(session_id) -> dict:
+    """The session an interview route works on; raises ApiError when there isn't one."""
+    if not session_id:
+        raise ApiError('No active session')
+    
+    user_session = session_manager.get_session(session_id)
+    if not user_session:
+        raise ApiError('Session expired')
+    return user_session
+
+def _question_request(user_session: dict, data: dict) -> tuple:
+    """Read a question request; returns (category, difficulty, questions already asked)."""
+    return data.get('category', 'behavioral'), user_session['difficulty_level'], _asked_questions(user_session)
+
+def _question_result(question: str, category: str, difficulty: str) -> dict:
+    """Body of a generated question response."""
+    return {
+        'question': question,
+        'category': category,
+        'difficulty': difficulty
+    }
+
+def _submission(session_id, data: dict, headers=None) -> tuple:
+    """
+    Validate an answer submission.
+    
+    Returns:
+        (question, response, category, idempotency key, evaluation already recorded under that key or None)
+    """
+    user_session = _interview_session(session_id)
+    user_response = data.get('response', '')
+    question = user_session.get('current_question', '')
+    category = data.get('category', 'behavioral')
+    
+    if not user_response or not question:
+        raise ApiError('Missing response or question')
+    
+    # A retried submission gets the evaluation recorded the first time
+    idempotency_key = _idempotency_key(data, headers)
+    submitted = session_manager.get_submission(session_id, idempotency_key)
+    return question, user_response, category, idempotency_key, submitted['evaluation'] if submitted else None
+
+def _record_response(session_id: str, question: str, user_response: str, evaluation: dict, category: str,
+                     idempotency_key) -> None:
+    """Add an evaluated response to the session and start on the next question."""
+    session_manager.add_response(session_id, question, user_response, evaluation, category, idempotency_key)
+    _prefetch_next_question(session_id, category)
+
+def _role_questions_request(data: dict) -> tuple:
+    """Read a role questions request; returns (role, number of questions)."""
+    role = data.get('role', 'General')
+    if not role:
+        raise ApiError('Role is required')
+    return role, data.get('num_questions', 3)
+
+def _role_questions_result(questions: list, role: str) -> dict:
+    """Body of a role questions response."""
+    return {
+        'questions': questions,
+        'role': role,
+        'count': len(questions)
+    }
+
+def _qa_feedback_request(data: dict) -> tuple:
+    """Read a Q&A feedback request; returns (pairs, role, whether pairs were truncated, parallel)."""
+    qa_list, error = _qa_pairs(data)
+    if error:
+        raise ApiError(error)
+    
+    # Long answers are shortened to fit the prompt budget; the response says so
+    qa_list, truncated = fit_qa_pairs(qa_list)
+    return qa_list, data.get('role', 'General'), truncated, _qa_feedback_parallel(data)
+
+def _qa_feedback_body(qa_list: list, role: str, truncated: bool, feedback: str) -> dict:
+    """Body of a Q&A feedback response."""
+    return {
+        'feedback': feedback,
+        'role': role,
+        'qa_count': len(qa_list),
+        'truncated': truncated
+    }
+
+def _qa_feedback_result(qa_list: list, role: str, truncated: bool, parallel: bool, on_item=None) -> dict:
+    """Generate Q&A feedback, passing each pair's feedback to on_item as it finishes in parallel mode."""
+    if not parallel:
+        return _qa_feedback_body(qa_list, role, truncated, ai_helper.generate_qa_feedback(qa_list, role))
+    
+    items = []
+    for item in ai_helper.iter_qa_feedback(qa_list, role):
+        items.append(item)
+        if on_item:
+            on_item(item)
+    return _qa_feedback_items_result(qa_list, role, truncated, items)
+
+def _qa_feedback_items_result(qa_list: list, role: str, truncated: bool, items: list) -> dict:
+    """Body of a parallel Q&A feedback response, merging the per-pair feedback."""
+    items = sorted(items, key=lambda item: item['index'])
+    result = _qa_feedback_body(qa_list, role, truncated, ai_helper.merge_qa_feedback(items))
+    result['items'] = items
+    return result
+
+def _qa_pairs(data: dict) -> tuple:
+    """Read the Q&A pairs of a feedback request; returns (pairs, None), or (None, error message)."""
+    questions_answers = data.get('questions_answers', [])
+    if not questions_answers:
+        return None, 'Questions and answers are required'
+    
+    # Validate input format
+    try:
+        qa_list = []
+        for qa in questions_answers:
+            if isinstance(qa, dict):
+                question = qa.get('question', '')
+                answer = qa.get('answer', '')
+            elif isinstance(qa, list) and len(qa) == 2:
+                question, answer = qa
+            else:
+                return None, 'Invalid Q&A format'
+            
+            if question and answer:
+                qa_list.append((question, answer))
+    except Exception:
+        return None, 'Invalid input format'
+    
+    if not qa_list:
+        return None, 'No valid Q&A pairs found'
+    return qa_list, None
+
+def _qa_feedback_parallel(data: dict) -> bool:
+    """Whether a feedback request evaluates each pair in its own call."""
+    return data.get('mode', 'parallel' if Config.QA_FEEDBACK_PARALLEL else 'combined') == 'parallel'
+
+def _submit_qa_feedback_job(qa_list: list, role: str, truncated: bool, parallel: bool, url_for) -> tuple:
+    """
+    Start Q&A feedback as a background job.
+    
+    Args:
+        url_for: The framework's URL builder, called as url_for(route name, job_id=...)
+        
+    Returns:
+        (response body, status URL)
+    """
+    try:
+        job = job_manager.submit(
+            'qa_feedback',
+            lambda job: _qa_feedback_result(qa_list, role, truncated, parallel, on_item=job.add_item)
+        )
+    except JobLimitReached:
+        raise ApiError('Too many feedback requests in progress, please try again shortly', 503,
+                       Config.JOBS_RETRY_AFTER)
+    
+    status_url = str(url_for('job_status', job_id=job.id))
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': status_url,
+        'stream_url': str(url_for('job_stream', job_id=job.id))
+    }, status_url
+
+def _job(job_id: str):
+    """A background job; raises ApiError when it doesn't exist or has expired."""
+    job = job_manager.get(job_id)
+    if not job:
+        raise ApiError('Job not found', 404)
+    return job
+
+def _job_progress(job, sent: int, status) -> tuple:
+    """
+    Check a job for progress since the last check.
+    
+    Returns:
+        (events to send, items sent so far, status, whether the job has finished)
+    """
+    state = job.to_dict(since=sent)
+    events = [_sse_event('item', item) for item in state['items']]
+    
+    if state['status'] == DONE:
+        events.append(_sse_event('done', state['result']))
+    elif state['status'] == FAILED:
+        events.append(_sse_event('failed', {'error': state['error'], 'retry_after': state['retry_after']}))
+    elif state['status'] != status:
+        events.append(_sse_event('status', {'status': state['status']}))
+    return events, state['item_count'], state['status'], state['status'] in (DONE, FAILED)
+
+def _session_events_version(session_id, last_event_id, version) -> int:
+    """Check a session events request; returns the version the client has already seen, -1 for none."""
+    if not session_id:
+        raise ApiError('No active session')
+    if session_manager.get_session_version(session_id) is None:
+        raise ApiError('Session not found')
+    
+    # Resume from the browser's last event, otherwise start by sending the current state
+    if last_event_id is not None:
+        return last_event_id
+    return version if version is not None else -1
+
+def _session_update(session_id: str, version: int) -> tuple:
+    """
+    Check a session for changes since a version.
+    
+    Returns:
+        (current version, event to send or None); the version is None once the session has ended
+    """
+    current = session_manager.get_session_version(session_id)
+    if current == version:
+        return current, None
+    
+    summary = session_manager.get_session_summary(session_id) if current is not None else None
+    if summary is None:
+        return None, _sse_event('ended', {})
+    return current, _sse_event('session', {
+        'version': current,
+        'changes': session_manager.events.changes_since(session_id, version),
+        'summary': summary
+    }, event_id=current)
+
+def _asked_questions(user_session) -> list:
+    """Questions already put to the user in this session."""
+    asked = [response['question'] for response in user_session['responses']]
+    if user_session.get('current_question'):
+        asked.append(user_session['current_question'])
+    return asked
+
+def _idempotency_key(data: dict, headers=None):
+    """Client key identifying one submission, from the Idempotency-Key header or the body."""
+    headers = request.headers if headers is None else headers
+    key = headers.get('Idempotency-Key') or data.get('idempotency_key')
+    return str(key)[:100] if key else None
+
+def _prefetch_next_question(session_id: str, category: str) -> None:
+    """Start generating the session's next question at its adjusted difficulty."""
+    if not Config.PREFETCH_ENABLED:
+        return
+    
+    user_session = session_manager.get_session(session_id)
+    if user_session and not user_session['session_complete']:
+        question_prefetcher.prefetch(
+            session_id,
+            user_session['user_profile'],
+            [category],
+            user_session['difficulty_level'],
+            _asked_questions(user_session)
+        )
 
 @app.route('/')
 def index():
     """Home page with user profile setup."""
-    return render_template('index.html')
+    return _cached_page('index.html')
 
 @app.route('/setup', methods=['GET', 'POST'])
 def setup():
@@ -36,9 +528,9 @@ def setup():
         
         return redirect(url_for('interview'))
     
-    return render_template('setup.html', 
-                         career_fields=Config.CAREER_FIELDS,
-                         interview_categories=Config.INTERVIEW_CATEGORIES)
+    return _cached_page('setup.html',
+                        career_fields=Config.CAREER_FIELDS,
+                        interview_categories=Config.INTERVIEW_CATEGORIES)
 
 @app.route('/interview')
 def interview():
@@ -59,130 +551,163 @@ def interview():
 def generate_question():
     """Generate a new interview question."""
     session_id = session.get('session_id')
-    if not session_id:
-        return jsonify({'error': 'No active session'}), 400
+    user_session = _interview_session(session_id)
+    category, difficulty, asked_questions = _question_request(user_session, request.get_json())
     
-    user_session = session_manager.get_session(session_id)
-    if not user_session:
-        return jsonify({'error': 'Session expired'}), 400
+    # Use the prefetched question if there is one, otherwise generate it now
+    question = question_prefetcher.take(session_id, category, difficulty, asked_questions)
+    if not question:
+        question = ai_helper.generate_question(
+            user_session['user_profile'], 
+            category, 
+            difficulty,
+            asked_questions=asked_questions
+        )
     
-    data = request.get_json()
-    category = data.get('category', 'behavioral')
-    difficulty = user_session['difficulty_level']
+    # Update session
+    session_manager.record_question(session_id, question, category)
     
-    # Generate question using AI
-    question = ai_helper.generate_question(
-        user_session['user_profile'], 
-        category, 
-        difficulty
-    )
+    return jsonify(_question_result(question, category, difficulty))
+
+@app.route('/api/generate-question/stream', methods=['POST'])
+def generate_question_stream():
+    """Stream a new interview question as Server-Sent Events."""
+    session_id = session.get('session_id')
+    user_session = _interview_session(session_id)
+    category, difficulty, asked_questions = _question_request(user_session, request.get_json())
+    user_profile = user_session['user_profile']
     
-    # Update session
-    session_manager.update_session(session_id, {
-        'current_question': question,
-        'categories_covered': user_session['categories_covered'].union([category])
-    })
+    def events():
+        parts = []
+        prefetched = question_prefetcher.take(session_id, category, difficulty, asked_questions)
+        chunks = [prefetched] if prefetched else ai_helper.stream_question(
+            user_profile, category, difficulty, asked_questions
+        )
+        for content in chunks:
+            parts.append(content)
+            yield _sse_event('chunk', {'text': content})
+        
+        question = ''.join(parts).strip()
+        session_manager.record_question(session_id, question, category)
+        
+        yield _sse_event('done', _question_result(question, category, difficulty))
     
-    return jsonify({
-        'question': question,
-        'category': category,
-        'difficulty': difficulty
-    })
+    return _sse_response(events())
 
 @app.route('/api/evaluate-response', methods=['POST'])
 def evaluate_response():
     """Evaluate user's response to a question."""
     session_id = session.get('session_id')
-    if not session_id:
-        return jsonify({'error': 'No active session'}), 400
-    
-    user_session = session_manager.get_session(session_id)
-    if not user_session:
-        return jsonify({'error': 'Session expired'}), 400
-    
-    data = request.get_json()
-    user_response = data.get('response', '')
-    question = user_session.get('current_question', '')
-    category = data.get('category', 'behavioral')
-    
-    if not user_response or not question:
-        return jsonify({'error': 'Missing response or question'}), 400
+    question, user_response, category, idempotency_key, submitted = _submission(session_id, request.get_json())
+    if submitted:
+        return jsonify(submitted)
     
     # Evaluate response using AI
     evaluation = ai_helper.evaluate_response(question, user_response, category)
     
     # Add response to session
-    session_manager.add_response(session_id, question, user_response, evaluation)
+    _record_response(session_id, question, user_response, evaluation, category, idempotency_key)
     
     return jsonify(evaluation)
 
+@app.route('/api/evaluate-response/stream', methods=['POST'])
+def evaluate_response_stream():
+    """Stream the evaluation of a response as Server-Sent Events."""
+    session_id = session.get('session_id')
+    question, user_response, category, idempotency_key, submitted = _submission(session_id, request.get_json())
+    if submitted:
+        return _sse_response(iter([_sse_event('done', submitted)]))
+    
+    def events():
+        for event, payload in ai_helper.stream_evaluation(question, user_response, category):
+            if event == 'done':
+                # Record the final evaluation before telling the client we're finished
+                _record_response(session_id, question, user_response, payload, category, idempotency_key)
+            yield _sse_event(event, payload)
+    
+    return _sse_response(events())
+
 @app.route('/api/generate-role-questions', methods=['POST'])
 def generate_role_questions():
     """Generate interview questions based on a specific role."""
-    data = request.get_json()
-    role = data.get('role', 'General')
-    num_questions = data.get('num_questions', 3)
-    
-    if not role:
-        return jsonify({'error': 'Role is required'}), 400
+    role, num_questions = _role_questions_request(request.get_json())
     
     try:
         questions = ai_helper.generate_role_questions(role, num_questions)
-        return jsonify({
-            'questions': questions,
-            'role': role,
-            'count': len(questions)
-        })
+    except LLMOverloaded:
+        raise
     except Exception as e:
         print(f"Error generating role questions: {e}")
-        return jsonify({'error': 'Failed to generate questions'}), 500
+        raise ApiError('Failed to generate questions', 500)
+    
+    return jsonify(_role_questions_result(questions, role))
 
 @app.route('/api/qa-feedback', methods=['POST'])
 def qa_feedback():
     """Generate structured feedback for a list of Q&A pairs."""
     data = request.get_json()
-    questions_answers = data.get('questions_answers', [])
-    role = data.get('role', 'General')
+    qa_list, role, truncated, parallel = _qa_feedback_request(data)
     
-    if not questions_answers:
-        return jsonify({'error': 'Questions and answers are required'}), 400
+    # Job mode answers at once; the client follows the job at /api/jobs/<id>
+    if data.get('async'):
+        body, status_url = _submit_qa_feedback_job(qa_list, role, truncated, parallel, url_for)
+        return jsonify(body), 202, {'Location': status_url}
     
-    # Validate input format
-    try:
-        qa_list = []
-        for qa in questions_answers:
-            if isinstance(qa, dict):
-                question = qa.get('question', '')
-                answer = qa.get('answer', '')
-            elif isinstance(qa, list) and len(qa) == 2:
-                question, answer = qa
-            else:
-                return jsonify({'error': 'Invalid Q&A format'}), 400
+    if parallel and data.get('stream'):
+        def events():
+            items = []
+            try:
+                for item in ai_helper.iter_qa_feedback(qa_list, role):
+                    items.append(item)
+                    yield _sse_event('item', item)
+            except LLMOverloaded as e:
+                yield _overloaded_event(e)
+                return
             
-            if question and answer:
-                qa_list.append((question, answer))
-        
-        if not qa_list:
-            return jsonify({'error': 'No valid Q&A pairs found'}), 400
+            yield _sse_event('done', _qa_feedback_body(qa_list, role, truncated, ai_helper.merge_qa_feedback(items)))
         
-    except Exception as e:
-        return jsonify({'error': 'Invalid input format'}), 400
+        return _sse_response(events())
     
     try:
-        feedback = ai_helper.generate_qa_feedback(qa_list, role)
-        return jsonify({
-            'feedback': feedback,
-            'role': role,
-            'qa_count': len(qa_list)
-        })
+        return jsonify(_qa_feedback_result(qa_list, role, truncated, parallel))
+    except LLMOverloaded:
+        raise
     except Exception as e:
         print(f"Error generating Q&A feedback: {e}")
-        return jsonify({'error': 'Failed to generate feedback'}), 500
+        raise ApiError('Failed to generate feedback', 500)
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Get a background job's status, new partial results and, once finished, its result."""
+    job = _job(job_id)
+    return jsonify(job.to_dict(since=max(0, request.args.get('since', 0, type=int))))
+
+@app.route('/api/jobs/<job_id>/stream')
+def job_stream(job_id):
+    """Stream a background job's progress as Server-Sent Events until it finishes."""
+    job = _job(job_id)
+    since = max(0, request.args.get('since', 0, type=int))
+    
+    def events():
+        sent = since
+        status = None
+        while True:
+            version = job.version
+            progress, sent, status, finished = _job_progress(job, sent, status)
+            yield from progress
+            if finished:
+                return
+            
+            if job.wait_for_change(version, Config.JOBS_STREAM_HEARTBEAT) == version:
+                # Keep proxies from closing an idle connection
+                yield ': keep-alive\n\n'
+    
+    return _sse_response(events())
 
 @app.route('/qa-feedback-form')
 def qa_feedback_form():
     """Q&A feedback form page."""
-    return render_template('qa_feedback.html')
+    return _cached_page('qa_feedback.html')
 
 @app.route('/session-summary')
 def session_summary():
@@ -191,11 +716,109 @@ def session_summary():
     if not session_id:
         return jsonify({'error': 'No active session'}), 400
     
-    summary = session_manager.get_session_summary(session_id)
-    if not summary:
+    etag = session_manager.get_summary_etag(session_id)
+    if not etag:
         return jsonify({'error': 'Session not found'}), 400
     
-    return jsonify(summary)
+    # Pollers revalidate and get a 304 without the summary being rebuilt
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        summary = session_manager.get_session_summary(session_id)
+        if not summary:
+            return jsonify({'error': 'Session not found'}), 400
+        response = jsonify(summary)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/session-events')
+def session_events():
+    """Stream the session summary as Server-Sent Events whenever the session changes."""
+    session_id = session.get('session_id')
+    seen = _session_events_version(
+        session_id,
+        request.headers.get('Last-Event-ID', type=int),
+        request.args.get('version', type=int)
+    )
+    
+    def events():
+        session_manager.events.subscribe(session_id)
+        try:
+            version = seen
+            # This stream holds a worker thread, so it is released sooner than the async one in asgi.py
+            deadline = time.monotonic() + Config.SESSION_EVENTS_THREAD_MAX_AGE
+            waited = False
+            while True:
+                current, event = _session_update(session_id, version)
+                if event:
+                    yield event
+                    if current is None:
+                        return
+                    version = current
+                elif waited:
+                    # Keep proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Free the worker now and then; the browser reconnects with Last-Event-ID
+                    return
+                # Changes made in this process wake the stream at once; the timeout catches
+                # changes made by other workers sharing the store
+                session_manager.events.wait(session_id, version, min(Config.SESSION_EVENTS_RECHECK, remaining))
+                waited = True
+        finally:
+            session_manager.events.unsubscribe(session_id)
+    
+    return _sse_response(events())
+
+@app.route('/api/session-responses')
+def session_responses():
+    """Get one page of the session's response history."""
+    session_id = session.get('session_id')
+    if not session_id:
+        return jsonify({'error': 'No active session'}), 400
+    
+    page = session_manager.get_responses(
+        session_id,
+        cursor=request.args.get('cursor'),
+        limit=request.args.get('limit', 20, type=int)
+    )
+    if page is None:
+        return jsonify({'error': 'Session not found'}), 400
+    
+    return jsonify(page)
+
+@app.route('/api/similar-questions')
+def similar_questions():
+    """Find previously generated questions similar to a question or topic."""
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({'error': 'Query is required'}), 400
+    
+    limit = max(1, min(request.args.get('limit', 5, type=int), Config.SIMILAR_QUESTIONS_MAX))
+    return jsonify({'questions': ai_helper.find_similar_questions(text, limit=limit)})
+
+@app.route('/api/stats')
+def stats():
+    """Get operational counters for sessions, caching and upstream calls."""
+    return jsonify({
+        'sessions': session_manager.get_stats(),
+        'question_cache': ai_helper.question_cache.stats() if ai_helper.question_cache else None,
+        'evaluation_cache': ai_helper.evaluation_cache.stats() if ai_helper.evaluation_cache else None,
+        'prefetch': question_prefetcher.stats(),
+        'jobs': job_manager.stats(),
+        'session_events': session_manager.events.stats(),
+        'analytics_export': session_manager.exporter.stats() if session_manager.exporter else None,
+        'llm_coalescing': ai_helper.single_flight.stats(),
+        'llm': ai_helper.llm.stats()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Expose metrics in the Prometheus text format."""
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/results')
 def results():
@@ -208,13 +831,26 @@ def results():
     if not summary:
         return redirect(url_for('setup'))
     
-    return render_template('results.html', summary=summary)
+    # The results page lists every answer, so page through the full history
+    responses = []
+    cursor = None
+    while True:
+        page = session_manager.get_responses(session_id, cursor=cursor, limit=Config.RESPONSES_PAGE_MAX)
+        if not page:
+            break
+        responses.extend(page['responses'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    
+    return render_template('results.html', summary=summary, responses=responses)
 
 @app.route('/api/end-session', methods=['POST'])
 def end_session():
     """End the current interview session."""
     session_id = session.get('session_id')
     if session_id:
+        question_prefetcher.cancel(session_id)
         session_manager.update_session(session_id, {'session_complete': True})
         session.pop('session_id', None)
     
@@ -225,6 +861,7 @@ def restart_session():
     """Restart a new interview session."""
     session_id = session.get('session_id')
     if session_id:
+        question_prefetcher.cancel(session_id)
         session_manager.delete_session(session_id)
     
     session.pop('session_id', None)
@@ -233,19 +870,52 @@ def restart_session():
 @app.route('/resources')
 def resources():
     """Display learning resources."""
-    return render_template('resources.html')
+    return _cached_page('resources.html')
+
+@app.route('/assets/<path:path>')
+def built_asset(path):
+    """Serve a fingerprinted static file, precompressed when the client allows, with far-future caching."""
+    encodings = assets.encodings(path)
+    if encodings is None:
+        abort(404)
+    
+    encoding = _preferred_encoding(encodings)
+    suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+    response = send_from_directory(
+        assets.dist_folder,
+        path + suffix,
+        mimetype=mimetypes.guess_type(path)[0],
+        max_age=Config.ASSET_MAX_AGE
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f"public, max-age={Config.ASSET_MAX_AGE}, immutable"
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
-    return render_template('404.html'), 404
+    return _cached_page('404.html', status=404)
+
+@app.errorhandler(ApiError)
+def api_error(error):
+    """Answer a failed API request with its JSON error."""
+    return jsonify(error.to_dict()), error.status, error.headers()
+
+@app.errorhandler(LLMOverloaded)
+def llm_overloaded(error):
+    """Tell clients to back off when the LLM scheduler can't take more work."""
+    return api_error(_overloaded_error(error))
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
-    return render_template('500.html'), 500
+    return _cached_page('500.html', status=500)
 
 if __name__ == '__main__':
+    create_app()
+    
     # Clean up expired sessions on startup
     session_manager.cleanup_expired_sessions()
     
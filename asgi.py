@@ -0,0 +1,358 @@
+"""
+ASGI entry point for production.
+
+Every /api route that waits (on the LLM, on a session change or on a background job) runs
+as a coroutine, so a waiting request holds no thread and one process can keep thousands in
+flight. Pages and the quick JSON routes are served by the Flask app on a thread pool.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from itsdangerous import BadSignature
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+import app as mockmate
+from config import Config
+from utils.llm_scheduler import LLMOverloaded, client_key, set_current_session
+from utils.metrics import HTTP_REQUEST_DURATION
+from utils.session_store import MemorySessionStore
+
+flask_app = mockmate.create_app()
+
+
+class _WsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs every WSGI request on one shared thread unless told otherwise
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, thread_sensitive=False)
+
+
+class _Wsgi(WsgiToAsgi):
+    """Serve a WSGI app from the event loop's default thread pool."""
+
+    async def __call__(self, scope, receive, send):
+        await _WsgiInstance(self.wsgi_application)(scope, receive, send)
+
+
+def _session_id(request: Request):
+    """Read the session id from Flask's signed session cookie; async routes never modify the cookie."""
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    if not cookie or serializer is None:
+        return None
+    try:
+        data = serializer.loads(cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+    except BadSignature:
+        return None
+    return data.get('session_id')
+
+
+async def _sessions(method, *args):
+    """
+    Call a SessionManager method, or an app helper built on one, from the event loop.
+
+    The memory store only takes short in-process locks, so it is called inline; SQLite can
+    wait on the database lock, so those calls go to the thread pool.
+    """
+    if isinstance(mockmate.session_manager.store, MemorySessionStore):
+        return method(*args)
+    return await asyncio.to_thread(method, *args)
+
+
+async def _json_body(request: Request) -> dict:
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    return data if isinstance(data, dict) else {}
+
+
+def _error_response(error) -> JSONResponse:
+    """Answer with an app.ApiError's JSON error."""
+    return JSONResponse(error.to_dict(), status_code=error.status, headers=error.headers())
+
+
+def _sse_response(events) -> StreamingResponse:
+    """Wrap an async event generator in a streaming text/event-stream response."""
+    return StreamingResponse(events, media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+async def _once(event: str):
+    yield event
+
+
+def _int_param(value, default=None):
+    """Parse an integer header or query value the way Flask's type=int does."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _route(path: str, handler, methods=('POST',)) -> Route:
+    """Build a route that binds the LLM session, maps errors to JSON and records latency."""
+    # Recorded under the same label as the Flask rule, e.g. /api/jobs/<job_id>
+    label = path.replace('{', '<').replace('}', '>')
+
+    async def endpoint(request: Request):
+        start = time.perf_counter()
+        session_id = _session_id(request)
+        set_current_session(session_id or client_key(request.client.host if request.client else None))
+        try:
+            response = await handler(request, session_id)
+        except LLMOverloaded as e:
+            response = _error_response(mockmate._overloaded_error(e))
+        except mockmate.ApiError as e:
+            response = _error_response(e)
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            route=label,
+            method=request.method,
+            status=response.status_code
+        )
+        return response
+
+    return Route(path, endpoint, methods=list(methods), name=handler.__name__)
+
+
+async def generate_question(request: Request, session_id):
+    """Async version of app.generate_question."""
+    user_session = await _sessions(mockmate._interview_session, session_id)
+    category, difficulty, asked_questions = mockmate._question_request(user_session, await _json_body(request))
+
+    question = await mockmate.question_prefetcher.atake(session_id, category, difficulty, asked_questions)
+    if not question:
+        question = await mockmate.ai_helper.agenerate_question(
+            user_session['user_profile'],
+            category,
+            difficulty,
+            asked_questions=asked_questions
+        )
+
+    await _sessions(mockmate.session_manager.record_question, session_id, question, category)
+
+    return JSONResponse(mockmate._question_result(question, category, difficulty))
+
+
+async def generate_question_stream(request: Request, session_id):
+    """Async version of app.generate_question_stream."""
+    user_session = await _sessions(mockmate._interview_session, session_id)
+    category, difficulty, asked_questions = mockmate._question_request(user_session, await _json_body(request))
+    user_profile = user_session['user_profile']
+
+    async def events():
+        parts = []
+        prefetched = await mockmate.question_prefetcher.atake(session_id, category, difficulty, asked_questions)
+        if prefetched:
+            parts.append(prefetched)
+            yield mockmate._sse_event('chunk', {'text': prefetched})
+        else:
+            async for content in mockmate.ai_helper.astream_question(user_profile, category, difficulty, asked_questions):
+                parts.append(content)
+                yield mockmate._sse_event('chunk', {'text': content})
+
+        question = ''.join(parts).strip()
+        await _sessions(mockmate.session_manager.record_question, session_id, question, category)
+
+        yield mockmate._sse_event('done', mockmate._question_result(question, category, difficulty))
+
+    return _sse_response(events())
+
+
+async def _submission(request: Request, session_id):
+    """Async version of app._submission."""
+    return await _sessions(mockmate._submission, session_id, await _json_body(request), request.headers)
+
+
+async def evaluate_response(request: Request, session_id):
+    """Async version of app.evaluate_response."""
+    question, user_response, category, idempotency_key, submitted = await _submission(request, session_id)
+    if submitted:
+        return JSONResponse(submitted)
+
+    evaluation = await mockmate.ai_helper.aevaluate_response(question, user_response, category)
+    await _sessions(mockmate._record_response, session_id, question, user_response, evaluation, category, idempotency_key)
+
+    return JSONResponse(evaluation)
+
+
+async def evaluate_response_stream(request: Request, session_id):
+    """Async version of app.evaluate_response_stream."""
+    question, user_response, category, idempotency_key, submitted = await _submission(request, session_id)
+    if submitted:
+        return _sse_response(_once(mockmate._sse_event('done', submitted)))
+
+    async def events():
+        async for event, payload in mockmate.ai_helper.astream_evaluation(question, user_response, category):
+            if event == 'done':
+                # Record the final evaluation before telling the client we're finished
+                await _sessions(
+                    mockmate._record_response, session_id, question, user_response, payload, category, idempotency_key
+                )
+            yield mockmate._sse_event(event, payload)
+
+    return _sse_response(events())
+
+
+async def session_events(request: Request, session_id):
+    """Async version of app.session_events; a stream waiting for a change holds no thread."""
+    manager = mockmate.session_manager
+    seen = await _sessions(
+        mockmate._session_events_version,
+        session_id,
+        _int_param(request.headers.get('Last-Event-ID')),
+        _int_param(request.query_params.get('version'))
+    )
+
+    async def events():
+        manager.events.subscribe(session_id)
+        try:
+            version = seen
+            deadline = time.monotonic() + Config.SESSION_EVENTS_MAX_AGE
+            waited = False
+            while True:
+                current, event = await _sessions(mockmate._session_update, session_id, version)
+                if event:
+                    yield event
+                    if current is None:
+                        return
+                    version = current
+                elif waited:
+                    # Keep proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                # Changes made in this process wake the stream at once; the timeout catches
+                # changes made by other workers sharing the store
+                await manager.events.await_change(session_id, version, min(Config.SESSION_EVENTS_RECHECK, remaining))
+                waited = True
+        finally:
+            manager.events.unsubscribe(session_id)
+
+    return _sse_response(events())
+
+
+async def generate_role_questions(request: Request, session_id):
+    """Async version of app.generate_role_questions."""
+    role, num_questions = mockmate._role_questions_request(await _json_body(request))
+
+    try:
+        questions = await mockmate.ai_helper.agenerate_role_questions(role, num_questions)
+    except LLMOverloaded:
+        raise
+    except Exception as e:
+        print(f"Error generating role questions: {e}")
+        raise mockmate.ApiError('Failed to generate questions', 500)
+
+    return JSONResponse(mockmate._role_questions_result(questions, role))
+
+
+async def _qa_feedback_result(qa_list: list, role: str, truncated: bool, parallel: bool) -> dict:
+    """Async version of app._qa_feedback_result."""
+    if not parallel:
+        feedback = await mockmate.ai_helper.agenerate_qa_feedback(qa_list, role)
+        return mockmate._qa_feedback_body(qa_list, role, truncated, feedback)
+
+    items = [item async for item in mockmate.ai_helper.aiter_qa_feedback(qa_list, role)]
+    return mockmate._qa_feedback_items_result(qa_list, role, truncated, items)
+
+
+async def qa_feedback(request: Request, session_id):
+    """Async version of app.qa_feedback."""
+    data = await _json_body(request)
+    qa_list, role, truncated, parallel = mockmate._qa_feedback_request(data)
+
+    if data.get('async'):
+        body, status_url = mockmate._submit_qa_feedback_job(
+            qa_list, role, truncated, parallel, request.app.url_path_for
+        )
+        return JSONResponse(body, status_code=202, headers={'Location': status_url})
+
+    if parallel and data.get('stream'):
+        async def events():
+            items = []
+            try:
+                async for item in mockmate.ai_helper.aiter_qa_feedback(qa_list, role):
+                    items.append(item)
+                    yield mockmate._sse_event('item', item)
+            except LLMOverloaded as e:
+                yield mockmate._overloaded_event(e)
+                return
+
+            feedback = mockmate.ai_helper.merge_qa_feedback(items)
+            yield mockmate._sse_event('done', mockmate._qa_feedback_body(qa_list, role, truncated, feedback))
+
+        return _sse_response(events())
+
+    try:
+        return JSONResponse(await _qa_feedback_result(qa_list, role, truncated, parallel))
+    except LLMOverloaded:
+        raise
+    except Exception as e:
+        print(f"Error generating Q&A feedback: {e}")
+        raise mockmate.ApiError('Failed to generate feedback', 500)
+
+
+async def job_status(request: Request, session_id):
+    """Async version of app.job_status, here so job links can be built from this app's routes."""
+    job = mockmate._job(request.path_params['job_id'])
+    return JSONResponse(job.to_dict(since=max(0, _int_param(request.query_params.get('since'), 0))))
+
+
+async def job_stream(request: Request, session_id):
+    """Async version of app.job_stream; waiting for the job holds no thread."""
+    job = mockmate._job(request.path_params['job_id'])
+    since = max(0, _int_param(request.query_params.get('since'), 0))
+
+    async def events():
+        sent = since
+        status = None
+        while True:
+            version = job.version
+            progress, sent, status, finished = mockmate._job_progress(job, sent, status)
+            for event in progress:
+                yield event
+            if finished:
+                return
+
+            if await job.await_change(version, Config.JOBS_STREAM_HEARTBEAT) == version:
+                # Keep proxies from closing an idle connection
+                yield ': keep-alive\n\n'
+
+    return _sse_response(events())
+
+
+def _use_thread_pool() -> None:
+    """Size the pool that runs Flask routes and SQLite session calls."""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=Config.ASGI_THREADS, thread_name_prefix='asgi-sync')
+    )
+
+
+app = Starlette(
+    routes=[
+        _route('/api/generate-question', generate_question),
+        _route('/api/generate-question/stream', generate_question_stream),
+        _route('/api/evaluate-response', evaluate_response),
+        _route('/api/evaluate-response/stream', evaluate_response_stream),
+        _route('/api/session-events', session_events, methods=('GET',)),
+        _route('/api/generate-role-questions', generate_role_questions),
+        _route('/api/qa-feedback', qa_feedback),
+        _route('/api/jobs/{job_id}', job_status, methods=('GET',)),
+        _route('/api/jobs/{job_id}/stream', job_stream, methods=('GET',)),
+        Mount('/', app=_Wsgi(flask_app))
+    ],
+    on_startup=[_use_thread_pool]
+)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Cohort Report Benchmark
+Writes a synthetic analytics export of millions of responses in the exporter's format and times
+loading it and computing the cohort aggregates
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import Config
+from utils.analytics import DIMENSIONS, cohort_report, export_schema, load_responses
+
+VALUES = {
+    'career_field': Config.CAREER_FIELDS,
+    'experience_level': ['entry', 'mid', 'senior'],
+    'interview_type': Config.INTERVIEW_CATEGORIES,
+    'category': Config.INTERVIEW_CATEGORIES,
+    'difficulty': Config.DIFFICULTY_LEVELS
+}
+ROLES = ['Backend Engineer', 'Data Analyst', 'Product Manager', 'Designer', 'Account Executive']
+
+
+def synthetic_part(rng: np.random.Generator, rows: int, first_session: int, start: np.datetime64) -> pa.Table:
+    """One part file's worth of responses, ten per session, spread over 90 days."""
+    sessions = first_session + np.arange(rows) // 10
+    columns = {
+        'session_id': pa.array(np.char.add('session-', sessions.astype(str))),
+        'recorded_at': pa.array(start + rng.integers(0, 90 * 24 * 3600 * 1000, rows).astype('timedelta64[ms]')),
+        'question_number': pa.array((np.arange(rows) % 10 + 1).astype(np.int16)),
+        'score': pa.array(np.clip(rng.normal(6.5, 1.8, rows), 1, 10).round().astype(np.float32)),
+        'response_words': pa.array(rng.integers(5, 400, rows).astype(np.int32)),
+        'target_role': pa.array(np.array(ROLES)[rng.integers(0, len(ROLES), rows)])
+    }
+    for name in DIMENSIONS:
+        indices = pa.array(rng.integers(0, len(VALUES[name]), rows).astype(np.int32))
+        columns[name] = pa.DictionaryArray.from_arrays(indices, pa.array(VALUES[name]))
+    return pa.Table.from_pydict(columns, schema=export_schema())
+
+
+def main():
+    """Write the export, run the report and print machine-readable timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2_000_000, help='responses in the export')
+    parser.add_argument('--rows-per-file', type=int, default=Config.ANALYTICS_EXPORT_BATCH * 20)
+    parser.add_argument('--period', default='week', help="trend period, or 'none'")
+    parser.add_argument('--dir', default=None, help='keep the export here instead of a temporary directory')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix='mockmate-analytics-')
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    start = np.datetime64('2026-01-01T00:00:00', 'ms')
+
+    try:
+        write_start = time.perf_counter()
+        files = 0
+        for offset in range(0, args.rows, args.rows_per_file):
+            rows = min(args.rows_per_file, args.rows - offset)
+            pq.write_table(synthetic_part(rng, rows, offset // 10, start),
+                           os.path.join(directory, f"responses-{files:06d}.parquet"), compression='zstd')
+            files += 1
+        write_seconds = time.perf_counter() - write_start
+        export_bytes = sum(entry.stat().st_size for entry in os.scandir(directory))
+
+        period = None if args.period == 'none' else args.period
+        by = ['career_field', 'category', 'difficulty']
+        load_start = time.perf_counter()
+        frame = load_responses(directory, ['session_id', 'score', 'recorded_at'] + by)
+        load_seconds = time.perf_counter() - load_start
+
+        aggregate_start = time.perf_counter()
+        report = cohort_report(frame, by, period=period)
+        aggregate_seconds = time.perf_counter() - aggregate_start
+
+        print(json.dumps({
+            'rows': args.rows,
+            'files': files,
+            'export_mb': round(export_bytes / 1e6, 1),
+            'write_s': round(write_seconds, 3),
+            'load_s': round(load_seconds, 3),
+            'aggregate_s': round(aggregate_seconds, 3),
+            'frame_mb': round(frame.memory_usage(deep=True).sum() / 1e6, 1),
+            'cohorts': len(report),
+            'rows_per_second': round(args.rows / (load_seconds + aggregate_seconds))
+        }, indent=2))
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
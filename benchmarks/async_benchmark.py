@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Async vs Thread-per-Request Benchmark
+Serves the app with gunicorn (gthread) and with uvicorn (asgi.py) against the stub OpenAI server,
+submits many evaluations at once and compares throughput, latency and the threads each server holds
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from load_test import ANSWERS, CATEGORIES, percentile
+
+PROFILE = {
+    'name': 'Async Benchmark',
+    'career_field': 'software_engineering',
+    'experience_level': 'mid',
+    'target_role': 'Backend Engineer',
+    'interview_type': 'behavioral'
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid: int) -> list:
+    """A process and its descendants (gunicorn serves from a forked worker)."""
+    pids, index = [pid], 0
+    while index < len(pids):
+        try:
+            with open(f"/proc/{pids[index]}/task/{pids[index]}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+        index += 1
+    return pids
+
+
+def tree_usage(pid: int) -> tuple:
+    """Threads and resident KB across a process tree."""
+    threads = rss_kb = 0
+    for member in process_tree(pid):
+        try:
+            threads += len(os.listdir(f"/proc/{member}/task"))
+            with open(f"/proc/{member}/statm") as statm:
+                rss_kb += int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+        except (OSError, ValueError):
+            pass
+    return threads, rss_kb
+
+
+class UsageSampler:
+    """Track the peak thread count and memory of a server while it runs."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self._pid = pid
+        self._interval = interval
+        self._stop = threading.Event()
+        self.peak_threads = 0
+        self.peak_rss_kb = 0
+        self._thread = threading.Thread(target=self._run, name='usage-sampler', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            threads, rss_kb = tree_usage(self._pid)
+            self.peak_threads = max(self.peak_threads, threads)
+            self.peak_rss_kb = max(self.peak_rss_kb, rss_kb)
+            self._stop.wait(self._interval)
+
+
+def start_server(mode: str, port: int, upstream: str, args: argparse.Namespace) -> subprocess.Popen:
+    """Start the app under gunicorn ('wsgi') or uvicorn ('asgi') with the scheduler opened up to the test load."""
+    env = dict(os.environ)
+    env.update({
+        'OPENAI_BASE_URL': upstream,
+        'OPENAI_API_KEY': 'sk-stub',
+        'FLASK_DEBUG': 'False',
+        'LLM_WARM_CONNECTIONS': '0',
+        'LLM_REQUESTS_PER_MINUTE': '0',
+        'LLM_TOKENS_PER_MINUTE': '0',
+        'LLM_MAX_CONCURRENT': str(args.concurrency),
+        'LLM_MAX_CONNECTIONS': str(args.concurrency),
+        'LLM_QUEUE_MAX': str(2 * args.concurrency),
+        'PREFETCH_ENABLED': 'False'
+    })
+    if mode == 'wsgi':
+        env.update({
+            'GUNICORN_BIND': f"127.0.0.1:{port}",
+            'GUNICORN_WORKERS': '1',
+            'GUNICORN_THREADS': str(args.threads)
+        })
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--backlog', '4096', 'wsgi:app']
+    else:
+        env['ASGI_THREADS'] = str(args.threads)
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port),
+                   '--log-level', 'warning', '--backlog', '4096']
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+async def upstream_evaluations(upstream: str) -> int:
+    """Evaluation calls the stub has served so far."""
+    async with httpx.AsyncClient(timeout=30) as client:
+        response = await client.get(f"{upstream}/stats")
+    return response.json()['calls'].get('evaluation', 0)
+
+
+async def run_load(app_url: str, upstream: str, server_pid: int, args: argparse.Namespace) -> dict:
+    """Open the sessions, then have every session submit its evaluations at the same time."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    clients = [
+        httpx.AsyncClient(base_url=app_url, timeout=args.request_timeout, transport=transport)
+        for _ in range(args.concurrency)
+    ]
+    setup_slots = asyncio.Semaphore(50)
+
+    async def open_session(index: int, client: httpx.AsyncClient) -> bool:
+        async with setup_slots:
+            response = await client.post('/setup', data=PROFILE)
+            if response.status_code != 302:
+                return False
+            response = await client.post('/api/generate-question', json={'category': CATEGORIES[index % len(CATEGORIES)]})
+            return response.status_code == 200
+
+    latencies, statuses = [], {}
+
+    async def evaluate(index: int, client: httpx.AsyncClient) -> None:
+        for round_number in range(args.rounds):
+            # Distinct answers so the evaluation cache and call coalescing don't short-circuit the load
+            answer = f"{ANSWERS[index % len(ANSWERS)]} (session {index}, answer {round_number})"
+            start = time.perf_counter()
+            try:
+                response = await client.post('/api/evaluate-response', json={'response': answer})
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    try:
+        opened = await asyncio.gather(*(open_session(index, client) for index, client in enumerate(clients)))
+        ready = [(index, client) for (index, client), ok in zip(enumerate(clients), opened) if ok]
+
+        # Threads left over from opening the sessions are the baseline
+        threads_before, _ = tree_usage(server_pid)
+        upstream_before = await upstream_evaluations(upstream)
+        with UsageSampler(server_pid) as usage:
+            start = time.perf_counter()
+            await asyncio.gather(*(evaluate(index, client) for index, client in ready))
+            elapsed = time.perf_counter() - start
+        # An overloaded app still answers 200 with a local evaluation; only these reached the AI
+        ai_evaluations = await upstream_evaluations(upstream) - upstream_before
+    finally:
+        for client in clients:
+            await client.aclose()
+
+    succeeded = statuses.get('200', 0)
+    return {
+        'sessions': len(ready),
+        'evaluations': len(latencies),
+        'statuses': statuses,
+        'ai_evaluations': ai_evaluations,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(succeeded / elapsed, 2) if elapsed else 0,
+        'latency': {
+            'p50_ms': round(1000 * percentile(latencies, 50), 2),
+            'p95_ms': round(1000 * percentile(latencies, 95), 2),
+            'p99_ms': round(1000 * percentile(latencies, 99), 2)
+        },
+        'threads': {'before': threads_before, 'peak': usage.peak_threads},
+        'peak_rss_kb': usage.peak_rss_kb
+    }
+
+
+def main():
+    """Run each server mode in turn and print machine-readable results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--concurrency', type=int, default=1000, help='sessions submitting an evaluation at once')
+    parser.add_argument('--rounds', type=int, default=1, help='evaluations per session')
+    parser.add_argument('--threads', type=int, default=32, help='gunicorn threads, or the ASGI sync pool size')
+    parser.add_argument('--latency-median', type=float, default=2.0, help='stub seconds to first token')
+    parser.add_argument('--latency-sigma', type=float, default=0.3)
+    parser.add_argument('--request-timeout', type=float, default=300.0)
+    parser.add_argument('--output', default=None, help='write the JSON report to a file as well')
+    args = parser.parse_args()
+
+    stub_port = free_port()
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'benchmarks', 'stub_openai.py'), '--port', str(stub_port),
+         '--latency-median', str(args.latency_median), '--latency-sigma', str(args.latency_sigma)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    upstream = f"http://127.0.0.1:{stub_port}/v1"
+
+    report = {
+        'config': {key: getattr(args, key) for key in ('concurrency', 'rounds', 'threads', 'latency_median', 'latency_sigma')},
+        'modes': {}
+    }
+    try:
+        wait_until_ready(f"{upstream}/stats")
+        for mode in args.modes:
+            port = free_port()
+            server = start_server(mode, port, upstream, args)
+            try:
+                app_url = f"http://127.0.0.1:{port}"
+                wait_until_ready(app_url)
+                report['modes'][mode] = asyncio.run(run_load(app_url, upstream, server.pid, args))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+    finally:
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
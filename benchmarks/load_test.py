@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+End-to-End Load Benchmark
+Runs the Flask app against the stub OpenAI server and drives concurrent interview scripts through every route
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from werkzeug.serving import make_server
+
+from stub_openai import add_stub_arguments, settings_from_args, start_stub_server
+
+CATEGORIES = ['behavioral', 'technical', 'situational', 'teamwork', 'leadership', 'problem_solving']
+ANSWERS = [
+    "When I was at my last company our team missed a release because of an unclear requirement. "
+    "My task was to get the feature back on track, so I set up a daily check-in with product and rewrote the spec. "
+    "As a result we shipped two weeks later and cut follow-up bugs by 30%.",
+    "I would start by understanding the problem and asking the stakeholders what success looks like. "
+    "Then I would break the work into small steps and check progress often.",
+    "In my previous role I led a migration of 40 services. I organized the work into phases and "
+    "ultimately we finished a month early with no customer-facing downtime.",
+    "Honestly I'm not sure, I guess I would just try my best and ask for help if needed."
+]
+SESSION_MODULES = ('session_manager.py', 'session_store.py', 'session_records.py')
+
+
+class LatencyRecorder:
+    """Thread-safe per-route latency samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.samples.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    'count': len(values),
+                    'errors': self.errors.get(route, 0),
+                    'mean_ms': round(1000 * sum(values) / len(values), 2),
+                    'p50_ms': round(1000 * percentile(values, 50), 2),
+                    'p95_ms': round(1000 * percentile(values, 95), 2),
+                    'p99_ms': round(1000 * percentile(values, 99), 2)
+                }
+                for route, values in sorted(self.samples.items())
+            }
+
+    def all_samples(self) -> list:
+        with self._lock:
+            return [value for values in self.samples.values() for value in values]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def current_rss_kb() -> int:
+    """Resident set size of this process in KB."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def session_memory_bytes() -> int:
+    """Bytes currently allocated from the session modules (requires tracemalloc)."""
+    if not tracemalloc.is_tracing():
+        return 0
+    snapshot = tracemalloc.take_snapshot()
+    return sum(
+        stat.size for stat in snapshot.statistics('filename')
+        if stat.traceback[0].filename.endswith(SESSION_MODULES)
+    )
+
+
+def timed(recorder: LatencyRecorder, route: str, send) -> httpx.Response:
+    """Send a request, reading the whole body, and record its latency."""
+    start = time.perf_counter()
+    try:
+        response = send()
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        response = None
+        ok = False
+    recorder.record(route, time.perf_counter() - start, ok)
+    return response
+
+
+def run_interview(base_url: str, recorder: LatencyRecorder, args: argparse.Namespace, rng: random.Random) -> bool:
+    """Walk one user through a full interview."""
+    with httpx.Client(base_url=base_url, timeout=args.request_timeout, follow_redirects=False) as client:
+        profile = {
+            'name': 'Load Test',
+            'career_field': rng.choice(['software_engineering', 'data_science', 'product_management']),
+            'experience_level': rng.choice(['entry', 'mid', 'senior']),
+            'target_role': rng.choice(['Backend Engineer', 'Data Analyst', 'Product Manager']),
+            'interview_type': 'behavioral'
+        }
+        response = timed(recorder, 'POST /setup', lambda: client.post('/setup', data=profile))
+        if response is None or response.status_code != 302:
+            return False
+
+        asked = []
+        for _ in range(args.questions):
+            category = rng.choice(CATEGORIES)
+            if args.stream:
+                response = timed(recorder, 'POST /api/generate-question/stream',
+                                 lambda: client.post('/api/generate-question/stream', json={'category': category}))
+            else:
+                response = timed(recorder, 'POST /api/generate-question',
+                                 lambda: client.post('/api/generate-question', json={'category': category}))
+                if response is not None and response.status_code == 200:
+                    asked.append(response.json()['question'])
+
+            if args.think_time:
+                time.sleep(rng.uniform(0, 2 * args.think_time))
+
+            answer = rng.choice(ANSWERS)
+            body = {'response': answer, 'category': category}
+            if args.stream:
+                timed(recorder, 'POST /api/evaluate-response/stream',
+                      lambda: client.post('/api/evaluate-response/stream', json=body))
+            else:
+                timed(recorder, 'POST /api/evaluate-response', lambda: client.post('/api/evaluate-response', json=body))
+
+        timed(recorder, 'GET /session-summary', lambda: client.get('/session-summary'))
+        timed(recorder, 'GET /results', lambda: client.get('/results'))
+
+        if rng.random() < args.qa_fraction:
+            qa = [{'question': question, 'answer': rng.choice(ANSWERS)} for question in (asked or ['Tell me about yourself.'])[:3]]
+            body = {'questions_answers': qa, 'role': profile['target_role'], 'mode': args.qa_mode}
+            timed(recorder, 'POST /api/qa-feedback', lambda: client.post('/api/qa-feedback', json=body))
+
+        timed(recorder, 'POST /api/end-session', lambda: client.post('/api/end-session'))
+        return True
+
+
+def main():
+    """Run the benchmark and print machine-readable results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--interviews', type=int, default=5, help='interviews per user')
+    parser.add_argument('--questions', type=int, default=5, help='questions per interview')
+    parser.add_argument('--think-time', type=float, default=0.0, help='mean seconds a user spends answering')
+    parser.add_argument('--qa-fraction', type=float, default=0.3, help='share of interviews that request Q&A feedback')
+    parser.add_argument('--qa-mode', choices=['combined', 'parallel'], default='combined')
+    parser.add_argument('--stream', action='store_true', help='use the streaming question and evaluation routes')
+    parser.add_argument('--request-timeout', type=float, default=120.0)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='measure session allocations with tracemalloc (slows the run)')
+    parser.add_argument('--upstream', default=None, help='use an already running stub at this base URL')
+    parser.add_argument('--output', default=None, help='write the JSON report to a file as well')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub_stats = None
+    if args.upstream:
+        base_url = args.upstream
+    else:
+        stub_server, stub_stats = start_stub_server(settings_from_args(args))
+        base_url = f"http://127.0.0.1:{stub_server.server_port}/v1"
+
+    # Point the app at the stub before it builds its clients
+    os.environ['OPENAI_BASE_URL'] = base_url
+    os.environ.setdefault('OPENAI_API_KEY', 'sk-stub')
+
+    # The app reports upstream errors with print(); keep stdout for the JSON report
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+
+    if args.trace_memory:
+        tracemalloc.start()
+    rss_start = current_rss_kb()
+
+    import app as mockmate
+    app = mockmate.create_app()
+    session_manager = mockmate.session_manager
+
+    app_server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=app_server.serve_forever, name='app-server', daemon=True).start()
+    app_url = f"http://127.0.0.1:{app_server.server_port}"
+
+    sessions_start = session_manager.store.count()
+    session_bytes_start = session_memory_bytes()
+    recorder = LatencyRecorder()
+    seeds = random.Random(args.seed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        futures = [
+            executor.submit(run_interview, app_url, recorder, args, random.Random(seeds.random()))
+            for _ in range(args.users * args.interviews)
+        ]
+        completed = sum(1 for future in futures if future.result())
+    elapsed = time.perf_counter() - start
+
+    with httpx.Client(timeout=args.request_timeout) as client:
+        app_stats = client.get(f"{app_url}/api/stats").json()
+        upstream = stub_stats.snapshot() if stub_stats else client.get(f"{base_url}/stats").json()
+    app_server.shutdown()
+
+    samples = recorder.all_samples()
+    sessions_end = session_manager.store.count()
+    session_bytes = session_memory_bytes() - session_bytes_start if args.trace_memory else None
+    report = {
+        'config': {
+            key: getattr(args, key) for key in (
+                'users', 'interviews', 'questions', 'think_time', 'qa_fraction', 'qa_mode', 'stream',
+                'latency_median', 'latency_sigma', 'tokens_per_second', 'error_rate', 'error_status', 'seed'
+            )
+        },
+        'elapsed_s': round(elapsed, 3),
+        'interviews_completed': completed,
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+        'latency': {
+            'overall': {
+                'p50_ms': round(1000 * percentile(samples, 50), 2),
+                'p95_ms': round(1000 * percentile(samples, 95), 2),
+                'p99_ms': round(1000 * percentile(samples, 99), 2)
+            },
+            'routes': recorder.summary()
+        },
+        'memory': {
+            'rss_start_kb': rss_start,
+            'rss_end_kb': current_rss_kb(),
+            'sessions_start': sessions_start,
+            'sessions_end': sessions_end,
+            'session_bytes_growth': session_bytes,
+            'session_bytes_per_session': (
+                round(session_bytes / max(1, sessions_end - sessions_start)) if args.trace_memory else None
+            )
+        },
+        'upstream': upstream,
+        'app_stats': app_stats
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output, file=real_stdout)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
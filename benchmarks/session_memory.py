@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Session Memory Benchmark
+Compares the memory used by the original dict-based session layout with SessionRecord
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.session_records import ResponseRecord, SessionRecord
+
+EVALUATION = {
+    "score": 6,
+    "strengths": ["Attempted to answer the question"],
+    "weaknesses": ["Response could be more detailed"],
+    "feedback": "Your response shows effort, but could benefit from more specific examples and structure.",
+    "improvement_areas": ["Provide specific examples", "Use the STAR method", "Be more concise"],
+    "resources": ["Interview preparation guides", "STAR method resources"]
+}
+
+PROFILE = {
+    'name': 'Candidate',
+    'career_field': 'software_engineering',
+    'experience_level': 'mid',
+    'target_role': 'Backend Engineer',
+    'interview_type': 'behavioral'
+}
+
+
+def fresh(value):
+    """Copy a value the way a JSON request body or API response would produce it."""
+    return json.loads(json.dumps(value))
+
+
+def build_dict_session(index: int, responses: int) -> dict:
+    """Build a session in the original dict layout."""
+    return {
+        'user_profile': fresh(PROFILE),
+        'created_at': datetime.now(),
+        'last_activity': datetime.now(),
+        'questions_asked': responses,
+        'current_question': f"Tell me about a challenge you faced ({index})",
+        'responses': [
+            {
+                'question': f"Question {i} for session {index}",
+                'response': f"My answer to question {i} in session {index} " * 5,
+                'evaluation': fresh(EVALUATION),
+                'timestamp': datetime.now().isoformat()
+            }
+            for i in range(responses)
+        ],
+        'scores': [6] * responses,
+        'categories_covered': {'behavioral', 'technical'},
+        'difficulty_level': 'beginner',
+        'session_complete': False
+    }
+
+
+def build_record_session(index: int, responses: int) -> SessionRecord:
+    """Build the same session as a SessionRecord."""
+    record = SessionRecord.from_dict({
+        'user_profile': fresh(PROFILE),
+        'created_at': datetime.now(),
+        'last_activity': datetime.now(),
+        'questions_asked': responses,
+        'current_question': f"Tell me about a challenge you faced ({index})",
+        'scores': [6] * responses,
+        'categories_covered': {'behavioral', 'technical'},
+        'difficulty_level': 'beginner',
+        'session_complete': False
+    })
+    record['responses'] = [
+        ResponseRecord(
+            f"Question {i} for session {index}",
+            f"My answer to question {i} in session {index} " * 5,
+            fresh(EVALUATION),
+            'behavioral',
+            'beginner',
+            datetime.now().timestamp()
+        )
+        for i in range(responses)
+    ]
+    return record
+
+
+def measure(builder, sessions: int, responses: int) -> int:
+    """Measure the bytes held by a table of sessions built with builder."""
+    gc.collect()
+    tracemalloc.start()
+    table = {str(index): builder(index, responses) for index in range(sessions)}
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return current
+
+
+def main():
+    """Run the benchmark and print machine-readable results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--responses', type=int, default=5, help='responses per session')
+    args = parser.parse_args()
+
+    results = []
+    for sessions in args.sessions:
+        dict_bytes = measure(build_dict_session, sessions, args.responses)
+        record_bytes = measure(build_record_session, sessions, args.responses)
+        results.append({
+            'sessions': sessions,
+            'responses_per_session': args.responses,
+            'dict_bytes': dict_bytes,
+            'record_bytes': record_bytes,
+            'dict_bytes_per_session': dict_bytes // sessions,
+            'record_bytes_per_session': record_bytes // sessions,
+            'reduction': round(1 - record_bytes / dict_bytes, 3)
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
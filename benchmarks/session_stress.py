@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Session Stress Test
+Hammers SessionManager from a thread pool, checks session invariants and reports throughput
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils.session_manager import SessionManager
+
+EVALUATION = {"score": 7, "strengths": [], "weaknesses": [], "feedback": "", "improvement_areas": [], "resources": []}
+
+
+def check_session(manager: SessionManager, session_id: str, expected_responses: int, categories=()) -> list:
+    """Return the invariant violations for one session."""
+    session = manager.get_session(session_id)
+    problems = []
+    counts = {
+        'questions_asked': session['questions_asked'],
+        'responses': len(session['responses']),
+        'scores': len(session['scores']),
+        'stats.count': session['stats']['count']
+    }
+    for name, value in counts.items():
+        if value != expected_responses:
+            problems.append(f"{session_id}: {name}={value}, expected {expected_responses}")
+    missing = set(categories) - session['categories_covered']
+    if missing:
+        problems.append(f"{session_id}: lost categories {sorted(missing)}")
+    return problems
+
+
+def hammer_one_session(threads: int, operations: int) -> dict:
+    """Many threads appending to and updating the same session."""
+    manager = SessionManager()
+    session_id = manager.create_session({'name': 'stress'})
+    categories = Config.INTERVIEW_CATEGORIES
+
+    def worker(index):
+        for i in range(operations):
+            manager.record_question(session_id, f"Q{index}-{i}", categories[(index + i) % len(categories)])
+            manager.add_response(session_id, f"Q{index}-{i}", "answer", EVALUATION, 'behavioral')
+            manager.get_session_summary(session_id)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+
+    used = {categories[(index + i) % len(categories)] for index in range(threads) for i in range(operations)}
+    return {
+        'scenario': 'one_session',
+        'threads': threads,
+        'operations': threads * operations * 3,
+        'seconds': round(elapsed, 3),
+        'ops_per_second': round(threads * operations * 3 / elapsed),
+        'violations': check_session(manager, session_id, threads * operations, used)
+    }
+
+
+def hammer_many_sessions(threads: int, operations: int, sessions: int) -> dict:
+    """Many threads working on random sessions from a shared pool."""
+    manager = SessionManager()
+    session_ids = [manager.create_session({'name': f"user{i}"}) for i in range(sessions)]
+    appended = {session_id: 0 for session_id in session_ids}
+
+    def worker(index):
+        rng = random.Random(index)
+        done = {}
+        for i in range(operations):
+            session_id = rng.choice(session_ids)
+            manager.record_question(session_id, f"Q{index}-{i}", 'technical')
+            manager.add_response(session_id, f"Q{index}-{i}", "answer", EVALUATION, 'technical')
+            manager.get_session_summary(session_id)
+            done[session_id] = done.get(session_id, 0) + 1
+        return done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for done in executor.map(worker, range(threads)):
+            for session_id, count in done.items():
+                appended[session_id] += count
+    elapsed = time.perf_counter() - start
+
+    violations = []
+    for session_id, count in appended.items():
+        violations.extend(check_session(manager, session_id, count, ['technical'] if count else []))
+
+    return {
+        'scenario': 'many_sessions',
+        'threads': threads,
+        'sessions': sessions,
+        'operations': threads * operations * 3,
+        'seconds': round(elapsed, 3),
+        'ops_per_second': round(threads * operations * 3 / elapsed),
+        'violations': violations
+    }
+
+
+def main():
+    """Run the stress scenarios and print machine-readable results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--operations', type=int, default=500, help='iterations per thread')
+    parser.add_argument('--sessions', type=int, default=1000, help='sessions in the many-sessions scenario')
+    args = parser.parse_args()
+
+    results = []
+    for threads in args.threads:
+        results.append(hammer_one_session(threads, args.operations))
+        results.append(hammer_many_sessions(threads, args.operations, args.sessions))
+
+    print(json.dumps(results, indent=2))
+
+    if any(result['violations'] for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Stub OpenAI Server
+Local stand-in for the chat completions API with configurable latency, token rate, error rate and streaming
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SITUATIONS = ['a missed deadline', 'a production outage', 'conflicting priorities', 'an unhappy customer',
+              'a new team member', 'a failed experiment', 'a budget cut', 'an unclear requirement',
+              'a critical code review', 'a vendor delay', 'a disagreement with your manager', 'a legacy system']
+ACTIONS = ['handled', 'recovered from', 'prevented', 'communicated', 'prioritized around', 'learned from']
+ROLES = ['your team', 'stakeholders', 'leadership', 'a client', 'a cross-functional group']
+
+
+class StubStats:
+    """Thread-safe counters for the calls the stub has served."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.errors = 0
+        self.streamed = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, kind: str, stream: bool, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+            self.streamed += stream
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'total_calls': sum(self.calls.values()),
+                'errors': self.errors,
+                'streamed': self.streamed,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens
+            }
+
+
+class StubSettings:
+    """Behaviour knobs for the stub."""
+
+    def __init__(self, latency_median: float = 0.5, latency_sigma: float = 0.5, tokens_per_second: float = 0,
+                 error_rate: float = 0.0, error_status: int = 500, retry_after: float = None, seed: int = None):
+        """
+        Initialize the settings.
+
+        Args:
+            latency_median: Median time to first token in seconds (lognormal distribution)
+            latency_sigma: Spread of the lognormal latency distribution
+            tokens_per_second: Generation speed after the first token, 0 for instant
+            error_rate: Fraction of requests answered with an error
+            error_status: HTTP status used for injected errors
+            retry_after: Retry-After seconds sent with injected errors, None to omit the header
+            seed: Random seed for reproducible runs
+        """
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+    def first_token_delay(self) -> float:
+        if self.latency_median <= 0:
+            return 0.0
+        with self.random_lock:
+            return self.random.lognormvariate(0, self.latency_sigma) * self.latency_median
+
+    def should_fail(self) -> bool:
+        with self.random_lock:
+            return self.random.random() < self.error_rate
+
+
+def classify(prompt: str) -> str:
+    """Guess which AIHelper call a prompt came from."""
+    if 'Evaluate this interview response' in prompt:
+        return 'evaluation'
+    if 'Candidate Answer' in prompt:
+        return 'qa_feedback'
+    if 'numbered list' in prompt:
+        return 'question_batch' if 'Career field' in prompt else 'role_questions'
+    return 'question'
+
+
+def fake_question(rng: random.Random) -> str:
+    return (f"Tell me about a time you {rng.choice(ACTIONS)} {rng.choice(SITUATIONS)} "
+            f"while working with {rng.choice(ROLES)}. What did you do first, and what was the result?")
+
+
+def fake_completion(kind: str, prompt: str, rng: random.Random) -> str:
+    """Build a plausible completion for a call kind."""
+    if kind == 'evaluation':
+        return json.dumps({
+            "s": rng.randint(4, 9),
+            "st": ["Clear structure", "Relevant example"],
+            "w": ["Could quantify the outcome"],
+            "f": "A solid answer that explains the situation and your actions. Add measurable results.",
+            "i": ["Quantify your impact"],
+            "r": ["STAR method resources"]
+        })
+    if kind == 'qa_feedback':
+        numbers = re.findall(r'Question (\d+):', prompt) or ['1']
+        return '\n'.join(
+            f"---\nQuestion {number}: (see above)\n✅ Strengths: Clear example.\n"
+            f"⚠️ Weaknesses: Missing results.\n💡 Suggestion: Quantify the outcome.\n---"
+            for number in dict.fromkeys(numbers)
+        )
+    if kind in ('role_questions', 'question_batch'):
+        match = re.search(r'(?:Generate|Number of questions:) (\d+)', prompt)
+        count = int(match.group(1)) if match else 3
+        return '\n'.join(f"{i}. {fake_question(rng)}" for i in range(1, count + 1))
+    return fake_question(rng)
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count: about four characters per token."""
+    return max(1, len(text) // 4)
+
+
+def make_handler(settings: StubSettings, stats: StubStats):
+    """Build a request handler class bound to the given settings and counters."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/models'):
+                self._send_json(200, {'object': 'list', 'data': [{'id': 'gpt-4', 'object': 'model'}]})
+            elif self.path.rstrip('/').endswith('/stats'):
+                self._send_json(200, stats.snapshot())
+            else:
+                self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+                return
+
+            time.sleep(settings.first_token_delay())
+            if settings.should_fail():
+                stats.record_error()
+                headers = {'Retry-After': str(settings.retry_after)} if settings.retry_after is not None else {}
+                self._send_json(settings.error_status, {
+                    'error': {'message': 'Injected stub error', 'type': 'server_error'}
+                }, headers)
+                return
+
+            prompt = '\n'.join(message.get('content', '') for message in body.get('messages', []))
+            kind = classify(prompt)
+            with settings.random_lock:
+                text = fake_completion(kind, prompt, settings.random)
+
+            max_tokens = body.get('max_tokens')
+            if max_tokens and count_tokens(text) > max_tokens:
+                text = text[:max_tokens * 4]
+
+            stream = bool(body.get('stream'))
+            stats.record(kind, stream, count_tokens(prompt), count_tokens(text))
+
+            if stream:
+                self._stream(body, text)
+            else:
+                self._complete(body, prompt, text)
+
+        def _complete(self, body: dict, prompt: str, text: str):
+            self._generate_delay(count_tokens(text))
+            self._send_json(200, {
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': body.get('model', 'gpt-4'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': text},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {
+                    'prompt_tokens': count_tokens(prompt),
+                    'completion_tokens': count_tokens(text),
+                    'total_tokens': count_tokens(prompt) + count_tokens(text)
+                }
+            })
+
+        def _stream(self, body: dict, text: str):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            pieces = re.findall(r'\S+\s*|\s+', text)
+            for piece in pieces:
+                self._generate_delay(count_tokens(piece))
+                self._write_event({
+                    'id': 'chatcmpl-stub',
+                    'object': 'chat.completion.chunk',
+                    'created': int(time.time()),
+                    'model': body.get('model', 'gpt-4'),
+                    'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]
+                })
+            self._write_chunk(b'data: [DONE]\n\n')
+            self._write_chunk(b'')
+
+        def _write_event(self, payload: dict):
+            self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+
+        def _write_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+            self.wfile.flush()
+
+        def _generate_delay(self, tokens: int):
+            if settings.tokens_per_second > 0:
+                time.sleep(tokens / settings.tokens_per_second)
+
+        def _send_json(self, status: int, payload: dict, headers: dict = None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+    return StubHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # benchmarks open thousands of connections at once
+
+
+def start_stub_server(settings: StubSettings, host: str = '127.0.0.1', port: int = 0):
+    """
+    Start the stub on a background thread.
+
+    Args:
+        settings: Behaviour knobs
+        host: Interface to bind
+        port: Port to bind, 0 for any free port
+
+    Returns:
+        Tuple of (server, stats); the base URL is http://host:server.server_port/v1
+    """
+    stats = StubStats()
+    server = StubServer((host, port), make_handler(settings, stats))
+    threading.Thread(target=server.serve_forever, name='stub-openai', daemon=True).start()
+    return server, stats
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the stub's behaviour options to an argument parser."""
+    parser.add_argument('--latency-median', type=float, default=0.5, help='median seconds to first token')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='lognormal spread of the latency')
+    parser.add_argument('--tokens-per-second', type=float, default=0, help='generation speed, 0 for instant')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail')
+    parser.add_argument('--error-status', type=int, default=500, help='HTTP status for injected errors')
+    parser.add_argument('--retry-after', type=float, default=None, help='Retry-After seconds sent with injected errors')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for reproducible runs')
+
+
+def settings_from_args(args: argparse.Namespace) -> StubSettings:
+    """Build StubSettings from parsed arguments."""
+    return StubSettings(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local stand-in for the OpenAI chat completions API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server, _ = start_stub_server(settings_from_args(args), args.host, args.port)
+    print(f"Stub OpenAI API listening on http://{args.host}:{server.server_port}/v1 (stats at /v1/stats)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
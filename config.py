@@ -16,10 +16,149 @@ class Config:
     OPENAI_MODEL = 'gpt-4'
     OPENAI_MAX_TOKENS = 1000
     OPENAI_TEMPERATURE = 0.7
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')  # None uses the official API
+    
+    # LLM Client Configuration
+    LLM_MAX_CONNECTIONS = int(os.environ.get('LLM_MAX_CONNECTIONS', 100))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('LLM_MAX_KEEPALIVE_CONNECTIONS', 20))
+    LLM_KEEPALIVE_EXPIRY = 60  # seconds an idle pooled connection is kept open
+    LLM_WARM_CONNECTIONS = int(os.environ.get('LLM_WARM_CONNECTIONS', 2))  # opened at startup
+    LLM_CONNECT_TIMEOUT = 5  # seconds
+    LLM_TIMEOUTS = {  # deadline in seconds per call type, retries included
+        'default': 60,
+        'warmup': 10,
+        'question': 20,
+        'question_batch': 30,
+        'evaluation': 45,
+        'role_questions': 30,
+        'qa_feedback': 90,
+        'qa_pair': 30
+    }
+    
+    # LLM Resilience Configuration
+    LLM_MAX_RETRIES = 2
+    LLM_RETRY_BASE_DELAY = 0.5  # seconds; full-jitter exponential backoff unless the server sends Retry-After
+    LLM_RETRY_MAX_DELAY = 8
+    LLM_SLOW_CALL_FRACTION = 0.5  # calls using more of their deadline than this count as slow
+    LLM_BREAKER_WINDOW = 20  # recent calls considered by the circuit breaker
+    LLM_BREAKER_MIN_CALLS = 10
+    LLM_BREAKER_FAILURE_RATE = float(os.environ.get('LLM_BREAKER_FAILURE_RATE', 0.5))
+    LLM_BREAKER_SLOW_RATE = float(os.environ.get('LLM_BREAKER_SLOW_RATE', 0.8))
+    LLM_BREAKER_OPEN_SECONDS = int(os.environ.get('LLM_BREAKER_OPEN_SECONDS', 30))  # fail fast this long before trial calls
+    LLM_BREAKER_HALF_OPEN_CALLS = 2
+    LLM_HEDGING_ENABLED = os.environ.get('LLM_HEDGING_ENABLED', 'False').lower() == 'true'
+    LLM_HEDGE_PERCENTILE = 0.95  # a completion still running at this latency gets a second request
+    LLM_HEDGE_MIN_SAMPLES = 20
+    LLM_HEDGE_WORKERS = 16
+    
+    # LLM Scheduling Configuration
+    LLM_REQUESTS_PER_MINUTE = int(os.environ.get('LLM_REQUESTS_PER_MINUTE', 500))  # 0 for no limit
+    LLM_TOKENS_PER_MINUTE = int(os.environ.get('LLM_TOKENS_PER_MINUTE', 150000))  # prompt plus max_tokens, 0 for no limit
+    LLM_MAX_CONCURRENT = int(os.environ.get('LLM_MAX_CONCURRENT', 64))
+    LLM_QUEUE_MAX = int(os.environ.get('LLM_QUEUE_MAX', 200))  # calls waiting for admission; beyond this requests get a 503
+    LLM_QUEUE_MAX_PER_SESSION = 10  # beyond this a session's requests get a 429
+    LLM_QUEUE_MAX_WAIT = 10  # seconds a call may wait for admission
+    LLM_PRIORITIES = {  # lower is admitted first
+        'question': 0,
+        'evaluation': 0,
+        'role_questions': 1,
+        'qa_feedback': 2,
+        'qa_pair': 2,  # per-pair Q&A feedback is the same bulk work as qa_feedback
+        'question_batch': 3
+    }
+    
+    # Token Budget Configuration
+    LLM_OUTPUT_TOKENS = {  # completion caps sized to each call's expected output
+        'question': 120,
+        'evaluation': 450,
+        'qa_pair': 350
+    }
+    LLM_OUTPUT_TOKENS_PER_ITEM = {  # list-shaped outputs scale with the number of items
+        'question_batch': 80,
+        'role_questions': 80,
+        'qa_feedback': 300
+    }
+    LLM_OUTPUT_TOKENS_OVERHEAD = 50
+    LLM_MAX_OUTPUT_TOKENS = 2000  # hard ceiling for any single completion
+    EVALUATION_RESPONSE_MAX_TOKENS = 800  # longer answers are shortened before evaluation
+    QA_PROMPT_MAX_TOKENS = 6000  # all Q&A pairs in one feedback request
+    QA_QUESTION_MAX_TOKENS = 150
+    QA_ANSWER_MAX_TOKENS = 800
+    
+    # Local Heuristic Evaluator Configuration
+    HEURISTIC_FAST_PATH = os.environ.get('HEURISTIC_FAST_PATH', 'True').lower() == 'true'  # provisional score while the AI evaluates
+    
+    # Q&A Feedback Configuration
+    QA_FEEDBACK_PARALLEL = os.environ.get('QA_FEEDBACK_PARALLEL', 'False').lower() == 'true'
+    QA_FEEDBACK_MAX_WORKERS = int(os.environ.get('QA_FEEDBACK_MAX_WORKERS', 8))
+    
+    # Background Job Configuration
+    JOBS_WORKERS = int(os.environ.get('JOBS_WORKERS', 4))
+    JOBS_MAX_ACTIVE = int(os.environ.get('JOBS_MAX_ACTIVE', 32))  # queued or running; beyond this submissions get a 503
+    JOBS_TTL = 600  # seconds a finished job's result is kept
+    JOBS_SWEEP_INTERVAL = 60  # seconds between drops of expired jobs
+    JOBS_RETRY_AFTER = 5  # seconds clients are told to wait when the job cap is reached
+    JOBS_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments on job streams
+    
+    # Page and Asset Caching Configuration
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', str(not DEBUG)).lower() == 'true'  # off while editing templates
+    ASSET_FINGERPRINTS = os.environ.get('ASSET_FINGERPRINTS', str(not DEBUG)).lower() == 'true'  # use scripts/build_assets.py output
+    ASSET_MAX_AGE = 365 * 24 * 3600  # fingerprinted files never change
+    
+    # ASGI Server Configuration
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 32))  # Flask routes and SQLite session calls under asgi.py
     
     # Application Configuration
     MAX_QUESTIONS_PER_SESSION = 10
     SESSION_TIMEOUT = 3600  # 1 hour in seconds
+    SESSION_MAX_COUNT = int(os.environ.get('SESSION_MAX_COUNT', 50000))  # least recently active evicted beyond this
+    SESSION_REAPER_INTERVAL = 30  # seconds between expiry sweeps
+    SESSION_REAPER_BATCH = 200  # sessions evicted per batch
+    SUMMARY_RECENT_RESPONSES = 3  # responses previewed in the session summary
+    RESPONSES_PAGE_MAX = 50  # largest page served by the response history endpoint
+    SESSION_EVENTS_RECHECK = 20  # seconds an idle session event stream sleeps before re-reading the store
+    SESSION_EVENTS_MAX_AGE = 300  # seconds before a session event stream closes and the browser reconnects
+    SESSION_EVENTS_THREAD_MAX_AGE = 30  # the same for streams served from a worker thread (gunicorn)
+    
+    # Session Storage Configuration
+    SESSION_STORE = os.environ.get('SESSION_STORE', 'memory')  # 'memory' or 'sqlite'
+    SESSION_SHARDS = 16  # independently locked partitions of the memory store
+    SESSION_DB_PATH = os.environ.get('SESSION_DB_PATH', 'instance/sessions.db')
+    
+    # Analytics Export Configuration
+    ANALYTICS_EXPORT_ENABLED = os.environ.get('ANALYTICS_EXPORT_ENABLED', 'True').lower() == 'true'
+    ANALYTICS_EXPORT_DIR = os.environ.get('ANALYTICS_EXPORT_DIR', 'instance/analytics')  # Parquet part files
+    ANALYTICS_EXPORT_BATCH = 5000  # rows per part file
+    ANALYTICS_EXPORT_INTERVAL = 300  # seconds before a partial batch is written
+    
+    # Question Cache Configuration
+    QUESTION_CACHE_ENABLED = os.environ.get('QUESTION_CACHE_ENABLED', 'True').lower() == 'true'
+    QUESTION_CACHE_TTL = int(os.environ.get('QUESTION_CACHE_TTL', 6 * 3600))  # seconds
+    QUESTION_CACHE_MAX_KEYS = 500
+    QUESTION_CACHE_MAX_BYTES = 5 * 1024 * 1024
+    QUESTION_CACHE_POOL_SIZE = 10  # questions kept per profile key
+    QUESTION_CACHE_REFILL_THRESHOLD = 3  # refill when fewer unseen questions remain
+    QUESTION_CACHE_REFILL_BATCH = 5  # questions generated per refill call
+    QUESTION_CACHE_REFILL_WORKERS = 2
+    
+    # Evaluation Cache Configuration
+    EVALUATION_CACHE_ENABLED = os.environ.get('EVALUATION_CACHE_ENABLED', 'True').lower() == 'true'
+    EVALUATION_CACHE_MAX_ENTRIES = 5000  # kept in memory
+    EVALUATION_CACHE_PATH = os.environ.get('EVALUATION_CACHE_PATH')  # optional SQLite file for a persistent tier
+    EVALUATION_CACHE_MAX_BYTES = 50 * 1024 * 1024  # size budget for the persistent tier
+    SUBMISSION_KEYS_PER_SESSION = 20  # idempotency keys the memory store remembers per session
+    
+    # Question Similarity Configuration
+    QUESTION_SIMILARITY_THRESHOLD = float(os.environ.get('QUESTION_SIMILARITY_THRESHOLD', 0.8))  # cosine; above this is a repeat
+    QUESTION_INDEX_MAX_SIZE = 50000  # questions kept in the global similarity index
+    SIMILAR_QUESTIONS_MAX = 20  # largest result set served by the similar questions endpoint
+    
+    # Next-Question Prefetch Configuration
+    PREFETCH_ENABLED = os.environ.get('PREFETCH_ENABLED', 'True').lower() == 'true'
+    PREFETCH_WORKERS = 4
+    PREFETCH_MAX_IN_FLIGHT = 16  # per process
+    PREFETCH_MAX_SLOTS = 1000  # sessions holding a prefetched question
+    PREFETCH_WAIT_TIMEOUT = 15  # seconds to wait on a prefetch that is still running
     
     # Interview Categories
     INTERVIEW_CATEGORIES = [
@@ -0,0 +1,30 @@
+"""
+Gunicorn settings for MockMate AI.
+
+The app is preloaded in the master: the heavy libraries are imported and the vectorizers
+built once, then shared copy-on-write by every worker instead of loaded per worker. Threads
+and connections don't survive the fork, so each worker starts its own in post_fork.
+"""
+
+import os
+
+# Tell wsgi.py not to start threads in the master
+os.environ['MOCKMATE_PRELOAD'] = '1'
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))  # more than one needs SESSION_STORE=sqlite
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))  # event streams hold a thread each
+timeout = 120
+preload_app = True
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before workers fork."""
+    from app import warm_up
+    warm_up()
+
+
+def post_fork(server, worker):
+    from app import start_background_work
+    start_background_work()
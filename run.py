@@ -6,7 +6,8 @@ Simple script to start the Flask application
 
 import os
 import sys
-from app import app
+from app import create_app
+from config import Config
 
 def main():
     """Main function to run the application."""
@@ -30,7 +31,13 @@ def main():
     print()
     
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        if Config.DEBUG:
+            app = create_app()
+            app.run(debug=True, host='0.0.0.0', port=5000)
+        else:
+            # The development server holds a thread per request; serve the async routes instead
+            import uvicorn
+            uvicorn.run('asgi:app', host='0.0.0.0', port=5000)
     except KeyboardInterrupt:
         print("\n👋 Goodbye! Thanks for using AI Interview Coach.")
     except Exception as e:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Cohort Report
+Reads the Parquet response export and prints score aggregates per cohort (career field, category,
+difficulty, ...), optionally broken down by day, week or month to show trends
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config
+from utils.analytics import DIMENSIONS, PERIODS, cohort_report, load_responses
+
+
+def build_report(args: argparse.Namespace):
+    """
+    Load only the columns the report needs and aggregate them.
+
+    Returns:
+        Tuple of (report DataFrame, responses read, seconds spent loading, seconds spent aggregating)
+    """
+    columns = ['session_id', 'score'] + args.by + (['recorded_at'] if args.period else [])
+    start = time.perf_counter()
+    frame = load_responses(args.dir, columns, since=args.since, until=args.until)
+    loaded = time.perf_counter()
+    report = cohort_report(frame, args.by, period=args.period, min_responses=args.min_responses)
+    return report, len(frame), loaded - start, time.perf_counter() - loaded
+
+
+def main():
+    """Print the cohort report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dir', default=os.path.join(ROOT, Config.ANALYTICS_EXPORT_DIR), help='export directory')
+    parser.add_argument('--by', nargs='+', choices=DIMENSIONS, default=['career_field', 'category', 'difficulty'],
+                        help='columns defining a cohort')
+    parser.add_argument('--period', choices=sorted(PERIODS), default=None, help='show each cohort over time')
+    parser.add_argument('--since', type=datetime.fromisoformat, default=None, help='first day included (YYYY-MM-DD)')
+    parser.add_argument('--until', type=datetime.fromisoformat, default=None, help='first day excluded (YYYY-MM-DD)')
+    parser.add_argument('--min-responses', type=int, default=1, help='leave out smaller cohorts')
+    parser.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+    parser.add_argument('--output', default=None, help='write the report to a file instead of stdout')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"No analytics export at {args.dir}", file=sys.stderr)
+        sys.exit(1)
+
+    report, responses, load_seconds, aggregate_seconds = build_report(args)
+    if args.format == 'csv':
+        output = report.to_csv()
+    elif args.format == 'json':
+        output = report.reset_index().to_json(orient='records', date_format='iso', indent=2)
+    else:
+        output = report.to_string()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    print(f"{responses} responses in {len(report)} cohorts; loaded in {load_seconds:.2f}s, "
+          f"aggregated in {aggregate_seconds:.2f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
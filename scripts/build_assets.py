@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Asset Build
+Content-hashes static/css/style.css and static/js/*.js into static/dist, precompresses each
+copy with gzip and brotli, and writes the manifest the app uses for fingerprinted URLs
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC = os.path.join(ROOT, 'static')
+DIST = os.path.join(STATIC, 'dist')
+SOURCES = ['css/style.css', 'js/*.js']
+
+
+def find_sources() -> list:
+    """Source files relative to static/, in a stable order."""
+    found = []
+    for pattern in SOURCES:
+        found.extend(sorted(glob.glob(os.path.join(STATIC, pattern))))
+    return [os.path.relpath(path, STATIC).replace(os.sep, '/') for path in found]
+
+
+def build_asset(source: str, hash_length: int) -> dict:
+    """
+    Write the fingerprinted and precompressed copies of one file.
+
+    Args:
+        source: Path relative to static/
+        hash_length: Hex digits of the content hash kept in the file name
+
+    Returns:
+        Manifest entry with the fingerprinted path, encodings and sizes
+    """
+    with open(os.path.join(STATIC, source), 'rb') as f:
+        content = f.read()
+
+    digest = hashlib.sha256(content).hexdigest()[:hash_length]
+    stem, extension = os.path.splitext(source)
+    path = f"{stem}.{digest}{extension}"
+    target = os.path.join(DIST, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    # encoding -> (file suffix, bytes), best compression first
+    variants = {}
+    if brotli is not None:
+        variants['br'] = ('.br', brotli.compress(content, quality=11))
+    variants['gzip'] = ('.gz', gzip.compress(content, compresslevel=9, mtime=0))
+    variants['identity'] = ('', content)
+
+    for suffix, data in variants.values():
+        with open(target + suffix, 'wb') as f:
+            f.write(data)
+
+    return {
+        'path': path,
+        'encodings': [encoding for encoding in variants if encoding != 'identity'],
+        'sizes': {encoding: len(data) for encoding, (_, data) in variants.items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fingerprint and precompress static assets.')
+    parser.add_argument('--hash-length', type=int, default=12, help='hex digits of the content hash in file names')
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed; writing gzip variants only (pip install Brotli)")
+
+    # Start clean so stale fingerprints don't accumulate
+    shutil.rmtree(DIST, ignore_errors=True)
+    os.makedirs(DIST)
+
+    manifest = {}
+    for source in find_sources():
+        entry = build_asset(source, args.hash_length)
+        sizes = entry.pop('sizes')
+        manifest[source] = entry
+        print(f"{source} -> dist/{entry['path']} " + ' '.join(f"{name}={size}" for name, size in sizes.items()))
+
+    with open(os.path.join(DIST, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Wrote {len(manifest)} assets to {os.path.relpath(DIST, ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Startup Profile
+Imports the WSGI app in a fresh interpreter with -X importtime, reports the slowest imports and
+exits non-zero if startup exceeds the time budget or a lazily loaded library was imported eagerly
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only be imported on first use
+LAZY_MODULES = ['openai', 'httpx', 'sklearn', 'scipy', 'numpy', 'pandas', 'pyarrow']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import wsgi
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+def profile_startup() -> dict:
+    """
+    Import wsgi in a fresh interpreter.
+
+    Returns:
+        Dictionary with the wall time, loaded modules and per-module import times in seconds
+    """
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'sk-profile')
+    env['LLM_WARM_CONNECTIONS'] = '0'
+    env['MOCKMATE_PRELOAD'] = '1'  # no background threads
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        imports.append({
+            'module': name.strip(),
+            'self': int(own) / 1e6,
+            'cumulative': int(cumulative) / 1e6
+        })
+
+    return {'seconds': probe['seconds'], 'modules': probe['modules'], 'imports': imports}
+
+
+def main():
+    """Profile startup and check it against the budget."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget', type=float, default=1.0, help='seconds allowed for importing and building the app')
+    parser.add_argument('--top', type=int, default=15, help='slowest imports to report')
+    parser.add_argument('--allow', nargs='*', default=[], help='lazy libraries allowed to load at startup')
+    args = parser.parse_args()
+
+    profile = profile_startup()
+    loaded = set(profile['modules'])
+    eager = [name for name in LAZY_MODULES if name in loaded and name not in args.allow]
+    packages = [item for item in profile['imports'] if '.' not in item['module'] and item['module'] != 'wsgi']
+
+    report = {
+        'startup_seconds': round(profile['seconds'], 3),
+        'budget_seconds': args.budget,
+        'modules_loaded': len(loaded),
+        'eager_lazy_modules': eager,
+        'slowest_packages': [
+            {'module': item['module'], 'seconds': round(item['cumulative'], 4)}
+            for item in sorted(packages, key=lambda item: item['cumulative'], reverse=True)[:args.top]
+        ],
+        'slowest_self': [
+            {'module': item['module'], 'seconds': round(item['self'], 4)}
+            for item in sorted(profile['imports'], key=lambda item: item['self'], reverse=True)[:args.top]
+        ]
+    }
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if profile['seconds'] > args.budget:
+        failures.append(f"startup took {profile['seconds']:.3f}s, over the {args.budget:.3f}s budget")
+    if eager:
+        failures.append(f"imported at startup instead of on first use: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,10 @@ let currentQuestion = null;
 let currentCategory = 'behavioral';
 let isRecording = false;
 let recognition = null;
+let submission = null; // { key, question, response } reused when the same answer is resubmitted
+let sessionEvents = null; // EventSource open while the page waits for a session change
+let sessionVersion = -1; // last session version shown on the page
+let sessionPoller = null;
 
 // Initialize interview interface
 document.addEventListener('DOMContentLoaded', function() {
@@ -24,8 +28,67 @@ function initializeInterview() {
     document.getElementById('end-session')?.addEventListener('click', endSession);
     document.getElementById('continue-interview')?.addEventListener('click', continueInterview);
     
-    // Update session info periodically
-    setInterval(updateSessionInfo, 30000); // Update every 30 seconds
+    // Show the current session info; after that the page only listens while it expects a change
+    if (window.EventSource) {
+        watchSession();
+    } else {
+        pollSessionInfo();
+    }
+}
+
+function watchSession(awaitedChange) {
+    // Listen until the awaited change (or, without one, the current state) arrives, then
+    // disconnect, so an idle page holds no connection on the server
+    if (!window.EventSource || sessionEvents) {
+        return;
+    }
+    
+    sessionEvents = new EventSource(`/api/session-events?version=${sessionVersion}`);
+    sessionEvents.addEventListener('session', function(event) {
+        const data = JSON.parse(event.data);
+        sessionVersion = data.version;
+        applySessionSummary(data.summary);
+        if (!awaitedChange || data.changes.includes(awaitedChange)) {
+            stopWatchingSession();
+        }
+    });
+    sessionEvents.addEventListener('ended', stopWatchingSession);
+    sessionEvents.onerror = function() {
+        // The browser reconnects on its own unless the stream was refused
+        if (sessionEvents && sessionEvents.readyState === EventSource.CLOSED) {
+            stopWatchingSession();
+            updateSessionInfo();
+        }
+    };
+}
+
+function stopWatchingSession() {
+    if (sessionEvents) {
+        sessionEvents.close();
+        sessionEvents = null;
+    }
+}
+
+function settleSessionWatch() {
+    // The answer has been recorded, so its change is already on the way; a retried answer that
+    // was recorded before makes none, so stop waiting shortly and read the summary instead
+    const watching = sessionEvents;
+    if (!watching) {
+        return;
+    }
+    setTimeout(function() {
+        if (sessionEvents === watching) {
+            stopWatchingSession();
+            updateSessionInfo();
+        }
+    }, 2000);
+}
+
+function pollSessionInfo() {
+    // Unchanged summaries come back as 304s, answered from the browser cache
+    if (!sessionPoller) {
+        sessionPoller = setInterval(updateSessionInfo, 30000); // Update every 30 seconds
+    }
 }
 
 // Speech recognition setup
@@ -133,12 +196,7 @@ async function generateNextQuestion() {
         AIInterviewCoach.showLoading('loading-state');
         AIInterviewCoach.hideLoading('question-content');
         
-        const response = await AIInterviewCoach.apiCall('/api/generate-question', {
-            method: 'POST',
-            body: JSON.stringify({
-                category: currentCategory
-            })
-        });
+        const response = await fetchNextQuestion();
         
         currentQuestion = response.question;
         currentCategory = response.category;
@@ -165,6 +223,42 @@ async function generateNextQuestion() {
     }
 }
 
+async function fetchNextQuestion() {
+    const body = JSON.stringify({
+        category: currentCategory
+    });
+    
+    // Show the question as it streams in, falling back to the blocking endpoint
+    try {
+        let result = null;
+        let streamed = '';
+        
+        await AIInterviewCoach.streamCall('/api/generate-question/stream', { body }, (event, data) => {
+            if (event === 'chunk') {
+                streamed += data.text;
+                if (streamed.trim()) {
+                    document.getElementById('current-question').textContent = streamed;
+                    AIInterviewCoach.hideLoading('loading-state');
+                    AIInterviewCoach.showLoading('question-content');
+                }
+            } else if (event === 'done') {
+                result = data;
+            }
+        });
+        
+        if (result) {
+            return result;
+        }
+    } catch (error) {
+        console.warn('Question streaming unavailable, falling back:', error);
+    }
+    
+    return AIInterviewCoach.apiCall('/api/generate-question', {
+        method: 'POST',
+        body
+    });
+}
+
 async function submitResponse() {
     const responseInput = document.getElementById('response-input');
     const response = responseInput.value.trim();
@@ -182,30 +276,107 @@ async function submitResponse() {
     try {
         AIInterviewCoach.showLoading('loading-state');
         
-        const evaluation = await AIInterviewCoach.apiCall('/api/evaluate-response', {
-            method: 'POST',
-            body: JSON.stringify({
-                response: response,
-                category: currentCategory
-            })
-        });
+        // Recording the answer changes the session; listen for it while the evaluation runs
+        watchSession('response');
+        const evaluation = await fetchEvaluation(JSON.stringify({
+            response: response,
+            category: currentCategory,
+            idempotency_key: submissionKey(currentQuestion, response)
+        }));
         
         displayFeedback(evaluation);
-        updateSessionInfo();
+        if (window.EventSource) {
+            settleSessionWatch();
+        } else {
+            updateSessionInfo();
+        }
         
         AIInterviewCoach.hideLoading('loading-state');
         
     } catch (error) {
         console.error('Error evaluating response:', error);
-        AIInterviewCoach.showAlert('Failed to evaluate response. Please try again.', 'danger');
+        stopWatchingSession();
+        const message = error.retryAfter
+            ? `The coach is busy right now. Please submit again in ${error.retryAfter} seconds.`
+            : 'Failed to evaluate response. Please try again.';
+        AIInterviewCoach.showAlert(message, error.retryAfter ? 'warning' : 'danger');
         AIInterviewCoach.hideLoading('loading-state');
     }
 }
 
-function displayFeedback(evaluation) {
-    const modal = new bootstrap.Modal(document.getElementById('feedbackModal'));
+function submissionKey(question, response) {
+    // Retries of an unchanged answer reuse the key, so the server records it only once
+    if (!submission || submission.question !== question || submission.response !== response) {
+        const key = window.crypto?.randomUUID
+            ? window.crypto.randomUUID()
+            : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+        submission = { key, question, response };
+    }
+    return submission.key;
+}
+
+async function fetchEvaluation(body) {
+    // Render each evaluation field as soon as it arrives, falling back to the blocking endpoint
+    let overloaded = null;
+    try {
+        let result = null;
+        let partial = {};
+        
+        await AIInterviewCoach.streamCall('/api/evaluate-response/stream', { body }, (event, data) => {
+            if (event === 'provisional') {
+                // Instant local estimate, replaced field by field as the full evaluation arrives
+                partial = { ...data, provisional: true };
+                AIInterviewCoach.hideLoading('loading-state');
+                displayFeedback(partial);
+            } else if (event === 'field') {
+                partial[data.key] = data.value;
+                if (data.key === 'score') {
+                    partial.provisional = false;
+                }
+                AIInterviewCoach.hideLoading('loading-state');
+                displayFeedback(partial);
+            } else if (event === 'done') {
+                result = data;
+            } else if (event === 'error') {
+                overloaded = data;
+            }
+        });
+        
+        if (result) {
+            return result;
+        }
+    } catch (error) {
+        console.warn('Evaluation streaming unavailable, falling back:', error);
+    }
+    
+    if (overloaded) {
+        // The coach is busy; the blocking endpoint would be turned away too, so ask the user to retry
+        bootstrap.Modal.getInstance(document.getElementById('feedbackModal'))?.hide();
+        const error = new Error(overloaded.error);
+        error.retryAfter = overloaded.retry_after;
+        throw error;
+    }
+    
+    return AIInterviewCoach.apiCall('/api/evaluate-response', {
+        method: 'POST',
+        body
+    });
+}
+
+function displayFeedback(partialEvaluation) {
+    const modal = bootstrap.Modal.getOrCreateInstance(document.getElementById('feedbackModal'));
     const feedbackContent = document.getElementById('feedback-content');
     
+    // Fields may still be streaming in, so default anything not yet received
+    const evaluation = {
+        score: '…',
+        strengths: [],
+        improvement_areas: [],
+        feedback: '',
+        resources: [],
+        ...partialEvaluation
+    };
+    
     const scoreClass = evaluation.score >= 8 ? 'score-excellent' : 
                       evaluation.score >= 6 ? 'score-good' : 'score-needs-improvement';
     
@@ -215,6 +386,8 @@ function displayFeedback(evaluation) {
                 ${evaluation.score}/10
             </div>
             <h5>Response Evaluation</h5>
+            ${evaluation.provisional ? '<small class="text-muted">Quick estimate, full evaluation in progress…</small>' : ''}
+            ${evaluation.input_truncated ? '<small class="text-muted d-block">Your answer was long, so only part of it was sent for AI evaluation.</small>' : ''}
         </div>
         
         <div class="row">
@@ -294,21 +467,24 @@ function updateQuestionCounter() {
 
 async function updateSessionInfo() {
     try {
-        const summary = await AIInterviewCoach.apiCall('/api/session-summary');
-        
-        // Update session info
-        document.getElementById('questions-asked').textContent = summary.total_questions;
-        document.getElementById('avg-score').textContent = summary.average_score;
-        document.getElementById('current-difficulty').textContent = summary.difficulty_level.toUpperCase();
-        
-        // Update feedback list
-        updateFeedbackList(summary.responses);
+        const summary = await AIInterviewCoach.apiCall('/session-summary');
+        applySessionSummary(summary);
         
     } catch (error) {
         console.error('Error updating session info:', error);
     }
 }
 
+function applySessionSummary(summary) {
+    // Update session info
+    document.getElementById('questions-asked').textContent = summary.total_questions;
+    document.getElementById('avg-score').textContent = summary.average_score;
+    document.getElementById('current-difficulty').textContent = summary.difficulty_level.toUpperCase();
+    
+    // Update feedback list
+    updateFeedbackList(summary.recent_responses);
+}
+
 function updateFeedbackList(responses) {
     const feedbackList = document.getElementById('feedback-list');
     if (!feedbackList) return;
@@ -323,8 +499,8 @@ function updateFeedbackList(responses) {
         <div class="mb-3 pb-3 border-bottom">
             <div class="d-flex justify-content-between align-items-start">
                 <small class="text-muted">Q${response.question.substring(0, 30)}...</small>
-                <span class="badge bg-${response.evaluation.score >= 7 ? 'success' : response.evaluation.score >= 5 ? 'warning' : 'danger'}">
-                    ${response.evaluation.score}/10
+                <span class="badge bg-${response.score >= 7 ? 'success' : response.score >= 5 ? 'warning' : 'danger'}">
+                    ${response.score}/10
                 </span>
             </div>
             <p class="small mb-1">${response.response.substring(0, 50)}...</p>
@@ -125,7 +125,11 @@ async function apiCall(url, options = {}) {
         const response = await fetch(url, finalOptions);
         
         if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+            const error = new Error(`HTTP error! status: ${response.status}`);
+            error.status = response.status;
+            // Set on 429/503 when the server is shedding load
+            error.retryAfter = Number(response.headers.get('Retry-After')) || null;
+            throw error;
         }
         
         return await response.json();
@@ -135,6 +139,58 @@ async function apiCall(url, options = {}) {
     }
 }
 
+// Stream Server-Sent Events from a POST endpoint, calling onEvent(event, data) per message
+async function streamCall(url, options = {}, onEvent = () => {}) {
+    const defaultOptions = {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+        },
+    };
+    
+    const finalOptions = { ...defaultOptions, ...options };
+    const response = await fetch(url, finalOptions);
+    
+    if (!response.ok || !response.body) {
+        const error = new Error(`HTTP error! status: ${response.status}`);
+        error.status = response.status;
+        error.retryAfter = Number(response.headers.get('Retry-After')) || null;
+        throw error;
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            message.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    event = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    data += line.slice(5).trim();
+                }
+            });
+            
+            if (data) {
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+}
+
 // Form validation
 function validateForm(formElement) {
     const inputs = formElement.querySelectorAll('input[required], select[required], textarea[required]');
@@ -200,6 +256,7 @@ window.AIInterviewCoach = {
     hideLoading,
     showAlert,
     apiCall,
+    streamCall,
     validateForm,
     debounce,
     storage,
@@ -0,0 +1,119 @@
+import multiprocessing
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import Config
+from utils.session_manager import SessionManager
+from utils.session_store import MemorySessionStore, SQLiteSessionStore
+
+PROFILE = {'name': 'Test', 'career_field': 'software_engineering', 'target_role': 'Backend Engineer'}
+EVALUATION = {'score': 7, 'feedback': 'Clear answer'}
+
+
+def make_manager(tmp_path, store: str) -> SessionManager:
+    """A session manager over a fresh memory or SQLite store."""
+    backend = MemorySessionStore() if store == 'memory' else SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+    return SessionManager(backend)
+
+
+def assert_consistent(manager: SessionManager, session_id: str, expected_responses: int, categories=()) -> None:
+    """Every per-response count in a session agrees, and no covered category was lost."""
+    session = manager.get_session(session_id)
+    assert session['questions_asked'] == expected_responses
+    assert len(session['responses']) == expected_responses
+    assert len(session['scores']) == expected_responses
+    assert session['stats']['count'] == expected_responses
+    assert set(categories) <= set(session['categories_covered'])
+
+
+def submit(path: str, session_id: str, barrier, answer: str) -> None:
+    """Record one answer under a shared idempotency key, starting together with the other submitters."""
+    manager = SessionManager(SQLiteSessionStore(path))
+    barrier.wait()
+    assert manager.add_response(session_id, 'Tell me about yourself', answer, EVALUATION, 'behavioral', 'retry-1')
+
+
+def test_concurrent_duplicate_submission_is_recorded_once(tmp_path):
+    """Two processes submitting the same key at once append a single response."""
+    path = str(tmp_path / 'sessions.db')
+    manager = SessionManager(SQLiteSessionStore(path))
+    session_id = manager.create_session(PROFILE)
+
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(2)
+    workers = [context.Process(target=submit, args=(path, session_id, barrier, f"answer {n}")) for n in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+
+    session = manager.get_session(session_id)
+    assert session['questions_asked'] == 1
+    assert len(session['responses']) == 1
+    assert session['version'] == 1
+    assert manager.get_submission(session_id, 'retry-1') == session['responses'][0]
+
+
+@pytest.mark.parametrize('store', ['memory', 'sqlite'])
+def test_submission_replays_by_key(tmp_path, store):
+    """A replayed key returns its own response, not the one at its question number."""
+    manager = make_manager(tmp_path, store)
+    session_id = manager.create_session(PROFILE)
+
+    manager.add_response(session_id, 'First question', 'first answer', EVALUATION, 'behavioral')
+    manager.add_response(session_id, 'Second question', 'second answer', EVALUATION, 'behavioral', 'key-2')
+    assert manager.add_response(session_id, 'Second question', 'retried answer', EVALUATION, 'behavioral', 'key-2')
+
+    assert manager.get_session(session_id)['questions_asked'] == 2
+    assert manager.get_submission(session_id, 'key-2')['response'] == 'second answer'
+    assert manager.get_submission(session_id, 'unknown') is None
+
+
+@pytest.mark.parametrize('store', ['memory', 'sqlite'])
+def test_concurrent_updates_to_one_session(tmp_path, store):
+    """Threads recording questions and answers on the same session lose none of them."""
+    manager = make_manager(tmp_path, store)
+    session_id = manager.create_session(PROFILE)
+    categories = Config.INTERVIEW_CATEGORIES
+    threads, operations = 4, 10
+
+    def worker(index):
+        for i in range(operations):
+            manager.record_question(session_id, f"Q{index}-{i}", categories[(index + i) % len(categories)])
+            manager.add_response(session_id, f"Q{index}-{i}", 'answer', EVALUATION, 'behavioral')
+            manager.get_session_summary(session_id)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+
+    used = {categories[(index + i) % len(categories)] for index in range(threads) for i in range(operations)}
+    assert_consistent(manager, session_id, threads * operations, used)
+
+
+@pytest.mark.parametrize('store', ['memory', 'sqlite'])
+def test_concurrent_updates_to_many_sessions(tmp_path, store):
+    """Threads working on random sessions from a shared pool keep every session consistent."""
+    manager = make_manager(tmp_path, store)
+    session_ids = [manager.create_session(PROFILE) for _ in range(8)]
+    threads, operations = 4, 10
+
+    def worker(index):
+        rng = random.Random(index)
+        done = []
+        for i in range(operations):
+            session_id = rng.choice(session_ids)
+            manager.record_question(session_id, f"Q{index}-{i}", 'technical')
+            manager.add_response(session_id, f"Q{index}-{i}", 'answer', EVALUATION, 'technical')
+            manager.get_session_summary(session_id)
+            done.append(session_id)
+        return done
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        appended = [session_id for done in executor.map(worker, range(threads)) for session_id in done]
+
+    for session_id in session_ids:
+        count = appended.count(session_id)
+        assert_consistent(manager, session_id, count, ['technical'] if count else [])
@@ -0,0 +1,20 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILER = os.path.join(ROOT, 'scripts', 'profile_imports.py')
+
+
+def test_startup_within_budget():
+    """Importing the WSGI app stays within the profiler's time budget and leaves heavy libraries lazy."""
+    result = subprocess.run(
+        [sys.executable, PROFILER, '--top', '0'],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    report = json.loads(result.stdout)
+
+    assert result.returncode == 0, result.stderr
+    assert report['startup_seconds'] <= report['budget_seconds']
+    assert report['eager_lazy_modules'] == []
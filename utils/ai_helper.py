@@ -1,19 +1,83 @@
-import openai
+import asyncio
+import contextvars
 import json
-from typing import Dict, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Tuple
 from config import Config
+from utils.evaluation_cache import EvaluationCache
+from utils.heuristic_evaluator import HeuristicEvaluator
+from utils.json_stream import JSONFieldStreamParser
+from utils.llm_client import LLMClient
+from utils.llm_scheduler import LLMOverloaded
+from utils.metrics import FALLBACKS
+from utils.question_cache import QuestionCache
+from utils.question_index import QuestionIndex
+from utils.single_flight import SingleFlight
+from utils.token_budget import EVALUATION_KEYS, compact_whitespace, expand_evaluation, fit_tokens, output_budget
+
+# Call types whose concurrent identical requests share one upstream call
+_COALESCED_CALLS = {'question', 'evaluation', 'role_questions'}
 
 class AIHelper:
     """Helper class for OpenAI API interactions."""
     
     def __init__(self):
         """Initialize the AI helper with OpenAI configuration."""
-        openai.api_key = Config.OPENAI_API_KEY
+        self.llm = LLMClient()
         self.model = Config.OPENAI_MODEL
-        self.max_tokens = Config.OPENAI_MAX_TOKENS
         self.temperature = Config.OPENAI_TEMPERATURE
+        
+        # Local scorer for instant provisional scores and for when the API is unavailable
+        self.heuristic_evaluator = HeuristicEvaluator()
+        
+        # AI evaluations keyed by their inputs, so resubmitted answers aren't evaluated twice
+        self.evaluation_cache = None
+        if Config.EVALUATION_CACHE_ENABLED:
+            self.evaluation_cache = EvaluationCache(
+                max_entries=Config.EVALUATION_CACHE_MAX_ENTRIES,
+                path=Config.EVALUATION_CACHE_PATH,
+                max_bytes=Config.EVALUATION_CACHE_MAX_BYTES
+            )
+        
+        # Pool of generated questions shared by users with the same profile
+        self.question_cache = None
+        if Config.QUESTION_CACHE_ENABLED:
+            self.question_cache = QuestionCache(
+                ttl=Config.QUESTION_CACHE_TTL,
+                max_keys=Config.QUESTION_CACHE_MAX_KEYS,
+                max_bytes=Config.QUESTION_CACHE_MAX_BYTES,
+                pool_size=Config.QUESTION_CACHE_POOL_SIZE
+            )
+        self._refill_executor = ThreadPoolExecutor(
+            max_workers=Config.QUESTION_CACHE_REFILL_WORKERS,
+            thread_name_prefix='question-refill'
+        )
+        self._refilling = set()
+        self._refill_lock = threading.Lock()
+        
+        # Similarity index over generated questions, for repeat detection and lookups
+        self.question_index = QuestionIndex(max_size=Config.QUESTION_INDEX_MAX_SIZE)
+        
+        # Identical requests in flight at the same time share one upstream call
+        self.single_flight = SingleFlight()
+        
+        # Bounded pool for evaluating Q&A pairs concurrently
+        self._qa_executor = ThreadPoolExecutor(
+            max_workers=Config.QA_FEEDBACK_MAX_WORKERS,
+            thread_name_prefix='qa-feedback'
+        )
     
-    def generate_question(self, user_profile: Dict, category: str, difficulty: str) -> str:
+    def warm_up(self) -> None:
+        """Load the libraries the first request would otherwise wait for, without any network calls."""
+        # Scoring an empty answer loads numpy and scikit-learn and builds the vectorizer
+        self.heuristic_evaluator.evaluate('', '', 'general')
+        self.question_index.vectorizer.transform([''])
+        # Building the client imports the OpenAI SDK and httpx; it doesn't connect
+        self.llm.client
+    
+    def generate_question(self, user_profile: Dict, category: str, difficulty: str,
+                          asked_questions: Iterable[str] = ()) -> str:
         """
         Generate an interview question based on user profile and parameters.
         
@@ -21,26 +85,17 @@ class AIHelper:
             user_profile: Dictionary containing user information
             category: Question category (behavioral, technical, etc.)
             difficulty: Difficulty level (beginner, intermediate, advanced)
+            asked_questions: Questions already asked in the session; near-duplicates are never served
             
         Returns:
             Generated interview question
         """
-        prompt = self._build_question_prompt(user_profile, category, difficulty)
-        
-        try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert interview coach. Generate relevant, challenging interview questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Error generating question: {e}")
-            return self._get_fallback_question(category, difficulty)
+        return self._run(self._question_flow(user_profile, category, difficulty, asked_questions))
+    
+    async def agenerate_question(self, user_profile: Dict, category: str, difficulty: str,
+                                 asked_questions: Iterable[str] = ()) -> str:
+        """Async version of generate_question."""
+        return await self._arun(self._question_flow(user_profile, category, difficulty, asked_questions))
     
     def evaluate_response(self, question: str, user_response: str, category: str) -> Dict:
         """
@@ -54,54 +109,465 @@ class AIHelper:
         Returns:
             Dictionary containing evaluation results
         """
-        prompt = self._build_evaluation_prompt(question, user_response, category)
+        return self._run(self._evaluation_flow(question, user_response, category))
+    
+    async def aevaluate_response(self, question: str, user_response: str, category: str) -> Dict:
+        """Async version of evaluate_response."""
+        return await self._arun(self._evaluation_flow(question, user_response, category))
+    
+    def stream_question(self, user_profile: Dict, category: str, difficulty: str,
+                        asked_questions: Iterable[str] = ()) -> Iterator[str]:
+        """
+        Stream an interview question as it is generated.
         
+        Args:
+            user_profile: Dictionary containing user information
+            category: Question category (behavioral, technical, etc.)
+            difficulty: Difficulty level (beginner, intermediate, advanced)
+            asked_questions: Questions already asked in the session; cached near-duplicates are never served
+            
+        Yields:
+            Chunks of the question text
+        """
+        asked_questions = list(asked_questions)
+        cached = self._get_cached_question(user_profile, category, difficulty, asked_questions)
+        if cached:
+            yield cached
+            return
+        
+        parts = []
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert interview evaluator. Provide constructive feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=0.3
-            )
+            for content in self.llm.stream(**self._question_call(user_profile, category, difficulty)):
+                parts.append(content)
+                yield content
+        except Exception as e:
+            print(f"Error streaming question: {e}")
+        
+        fallback = self._question_streamed(parts, user_profile, category, difficulty, asked_questions)
+        if fallback:
+            yield fallback
+    
+    async def astream_question(self, user_profile: Dict, category: str, difficulty: str,
+                               asked_questions: Iterable[str] = ()) -> AsyncIterator[str]:
+        """Async version of stream_question."""
+        asked_questions = list(asked_questions)
+        cached = self._get_cached_question(user_profile, category, difficulty, asked_questions)
+        if cached:
+            yield cached
+            return
+        
+        parts = []
+        try:
+            async for content in self.llm.astream(**self._question_call(user_profile, category, difficulty)):
+                parts.append(content)
+                yield content
+        except Exception as e:
+            print(f"Error streaming question: {e}")
+        
+        fallback = self._question_streamed(parts, user_profile, category, difficulty, asked_questions)
+        if fallback:
+            yield fallback
+    
+    def stream_evaluation(self, question: str, user_response: str, category: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream the evaluation of a user's response, field by field.
+        
+        Args:
+            question: The interview question
+            user_response: User's response
+            category: Question category
             
-            evaluation_text = response.choices[0].message.content.strip()
-            return self._parse_evaluation(evaluation_text)
+        Yields:
+            ('provisional', evaluation) with an instant local evaluation when
+            Config.HEURISTIC_FAST_PATH is enabled, then ('field', {'key': ..., 'value': ...})
+            as each evaluation field completes, then ('done', evaluation) with the full
+            evaluation dictionary; 'input_truncated' is set when only part of a long answer was evaluated.
+            A cached evaluation is sent as a single 'done'. When the LLM scheduler turns the call away,
+            ('error', {'error': ..., 'retry_after': ...}) is sent instead of 'done'.
+        """
+        stream = _EvaluationStream(self, question, user_response, category)
+        yield from stream.start()
+        if stream.call is None:
+            return
+        
+        try:
+            for content in self.llm.stream(**stream.call):
+                yield from stream.feed(content)
+        except Exception as e:
+            yield from stream.fail(e)
+        else:
+            yield from stream.finish()
+    
+    async def astream_evaluation(self, question: str, user_response: str,
+                                 category: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Async version of stream_evaluation."""
+        stream = _EvaluationStream(self, question, user_response, category)
+        for event in stream.start():
+            yield event
+        if stream.call is None:
+            return
+        
+        try:
+            async for content in self.llm.astream(**stream.call):
+                for event in stream.feed(content):
+                    yield event
+        except Exception as e:
+            for event in stream.fail(e):
+                yield event
+        else:
+            for event in stream.finish():
+                yield event
+    
+    def _run(self, flow: Iterator[Dict]) -> Any:
+        """
+        Drive a flow, making the completion calls it asks for synchronously.
+        
+        A flow is a generator that yields the keyword arguments of each completion call it needs,
+        receives the completion text (or has the call's exception thrown into it) and returns its
+        result, so prompt building, parsing, caching and fallbacks are written once for both the
+        sync and async entry points.
+        """
+        try:
+            call = next(flow)
+            while True:
+                try:
+                    if call['call_type'] in _COALESCED_CALLS:
+                        text = self.single_flight.do(_flight_key(**call), self.llm.complete, **call)
+                    else:
+                        text = self.llm.complete(**call)
+                except Exception as e:
+                    call = flow.throw(e)
+                else:
+                    call = flow.send(text)
+        except StopIteration as done:
+            return done.value
+    
+    async def _arun(self, flow: Iterator[Dict]) -> Any:
+        """Async version of _run."""
+        try:
+            call = next(flow)
+            while True:
+                try:
+                    if call['call_type'] in _COALESCED_CALLS:
+                        text = await self.single_flight.ado(_flight_key(**call), self.llm.acomplete, **call)
+                    else:
+                        text = await self.llm.acomplete(**call)
+                except Exception as e:
+                    call = flow.throw(e)
+                else:
+                    call = flow.send(text)
+        except StopIteration as done:
+            return done.value
+    
+    def _question_flow(self, user_profile: Dict, category: str, difficulty: str,
+                       asked_questions: Iterable[str]) -> Iterator[Dict]:
+        """Flow for generate_question."""
+        asked_questions = list(asked_questions)
+        cached = self._get_cached_question(user_profile, category, difficulty, asked_questions)
+        if cached:
+            return cached
+        
+        try:
+            question = yield self._question_call(user_profile, category, difficulty)
+            self._cache_questions(user_profile, category, difficulty, [question])
+            if self._is_repeat(question, asked_questions):
+                return self._replace_repeat(question, user_profile, category, difficulty, asked_questions)
+            return question
+        except LLMOverloaded:
+            # Shed load with a 429/503 rather than answering from a fallback
+            raise
+        except Exception as e:
+            print(f"Error generating question: {e}")
+            return self._get_fallback_question(category, difficulty, asked_questions)
+    
+    def _question_call(self, user_profile: Dict, category: str, difficulty: str) -> Dict:
+        """Completion call generating one question."""
+        prompt = self._build_question_prompt(user_profile, category, difficulty)
+        return {
+            'call_type': 'question',
+            'messages': self._question_messages(prompt),
+            'max_tokens': output_budget('question'),
+            'temperature': self.temperature
+        }
+    
+    def _question_streamed(self, parts: List[str], user_profile: Dict, category: str, difficulty: str,
+                           asked_questions: List[str]) -> str:
+        """Cache a streamed question, or get the fallback to send when nothing was streamed."""
+        if parts:
+            self._cache_questions(user_profile, category, difficulty, [''.join(parts)])
+            return ''
+        return self._get_fallback_question(category, difficulty, asked_questions)
+    
+    def _evaluation_flow(self, question: str, user_response: str, category: str) -> Iterator[Dict]:
+        """Flow for evaluate_response."""
+        cache_key = EvaluationCache.make_key(question, user_response, category)
+        cached = self._cached_evaluation(cache_key)
+        if cached is not None:
+            return cached
+        
+        call, truncated = self._evaluation_call(question, user_response, category)
+        try:
+            evaluation_text = yield call
+            return self._evaluated(evaluation_text, cache_key, truncated, question, user_response, category)
+        except LLMOverloaded:
+            raise
         except Exception as e:
             print(f"Error evaluating response: {e}")
-            return self._get_fallback_evaluation()
+            return self._get_fallback_evaluation(question, user_response, category)
+    
+    def _evaluation_call(self, question: str, user_response: str, category: str) -> Tuple[Dict, bool]:
+        """Completion call evaluating a response, and whether the response had to be truncated to fit."""
+        excerpt, truncated = fit_tokens(user_response, Config.EVALUATION_RESPONSE_MAX_TOKENS)
+        prompt = self._build_evaluation_prompt(question, excerpt, category)
+        call = {
+            'call_type': 'evaluation',
+            'messages': self._evaluation_messages(prompt),
+            'max_tokens': output_budget('evaluation'),
+            'temperature': 0.3
+        }
+        return call, truncated
+    
+    def _evaluated(self, evaluation_text: str, cache_key: str, truncated: bool, question: str,
+                   user_response: str, category: str) -> Dict:
+        """Parse and cache an evaluation returned by the AI."""
+        evaluation = self._parse_evaluation(evaluation_text.strip(), question, user_response, category)
+        if truncated:
+            evaluation['input_truncated'] = True
+        self._cache_evaluation(cache_key, evaluation)
+        return evaluation
+    
+    def _cached_evaluation(self, cache_key: str) -> Dict:
+        """Get a cached evaluation, or None."""
+        return self.evaluation_cache.get(cache_key) if self.evaluation_cache is not None else None
+    
+    def _cache_evaluation(self, cache_key: str, evaluation: Dict) -> None:
+        """Cache an AI evaluation; local heuristic results are cheap and the AI may succeed next time."""
+        if self.evaluation_cache is not None and evaluation.get('source') != 'heuristic':
+            self.evaluation_cache.put(cache_key, evaluation)
     
-    def generate_qa_feedback(self, questions_answers: List[Tuple[str, str]], role: str = "General") -> str:
+    def _get_cached_question(self, user_profile: Dict, category: str, difficulty: str,
+                             asked_questions: List[str]) -> str:
+        """Serve an unseen question from the cache, topping up the pool in the background."""
+        if self.question_cache is None:
+            return ''
+        
+        key = QuestionCache.make_key(user_profile, category, difficulty)
+        is_new = lambda candidate: not self._is_repeat(candidate, asked_questions)
+        question, remaining = self.question_cache.serve(key, exclude=asked_questions, accept=is_new)
+        if remaining < Config.QUESTION_CACHE_REFILL_THRESHOLD:
+            self._schedule_refill(key, user_profile, category, difficulty)
+        
+        return question or ''
+    
+    def _cache_questions(self, user_profile: Dict, category: str, difficulty: str, questions: List[str]) -> None:
+        """Add generated questions to the similarity index and the cache pool for their profile key."""
+        for question in questions:
+            self.question_index.add(question)
+        
+        if self.question_cache is not None:
+            key = QuestionCache.make_key(user_profile, category, difficulty)
+            self.question_cache.add(key, questions)
+    
+    def _is_repeat(self, question: str, asked_questions: List[str]) -> bool:
+        """Check whether a question is a near-duplicate of one already asked in the session."""
+        if not asked_questions:
+            return False
+        similarity = self.question_index.max_similarity(question, asked_questions)
+        return similarity >= Config.QUESTION_SIMILARITY_THRESHOLD
+    
+    def _replace_repeat(self, question: str, user_profile: Dict, category: str, difficulty: str,
+                        asked_questions: List[str]) -> str:
+        """Swap a repeated question for an unseen one from the cache pool or the fallbacks."""
+        replacement = self._get_cached_question(user_profile, category, difficulty, asked_questions)
+        if replacement:
+            return replacement
+        
+        replacement = self._get_fallback_question(category, difficulty, asked_questions)
+        if not self._is_repeat(replacement, asked_questions):
+            return replacement
+        
+        # Everything left is a repeat; the generated question is still the most relevant
+        return question
+    
+    def find_similar_questions(self, text: str, limit: int = 5) -> List[Dict]:
+        """
+        Find previously generated questions similar to a text.
+        
+        Args:
+            text: Question or topic to look up
+            limit: Maximum number of results
+            
+        Returns:
+            List of dictionaries with the question and its similarity, most similar first
+        """
+        return [
+            {'question': question, 'similarity': similarity}
+            for question, similarity in self.question_index.most_similar(text, k=limit)
+        ]
+    
+    def _schedule_refill(self, key: Tuple[str, ...], user_profile: Dict, category: str, difficulty: str) -> None:
+        """Start a background refill for a cache key unless one is already running."""
+        with self._refill_lock:
+            if key in self._refilling:
+                return
+            self._refilling.add(key)
+        
+        profile = dict(user_profile)
+        try:
+            self._refill_executor.submit(self._refill_question_pool, key, profile, category, difficulty)
+        except RuntimeError:
+            # Executor is shutting down
+            with self._refill_lock:
+                self._refilling.discard(key)
+    
+    def _refill_question_pool(self, key: Tuple[str, ...], user_profile: Dict, category: str, difficulty: str) -> None:
+        """Generate a batch of questions for a cache key."""
+        prompt = self._build_question_batch_prompt(
+            user_profile, category, difficulty, Config.QUESTION_CACHE_REFILL_BATCH
+        )
+        
+        try:
+            response_text = self.llm.complete(
+                'question_batch',
+                messages=self._question_messages(prompt),
+                max_tokens=output_budget('question_batch', Config.QUESTION_CACHE_REFILL_BATCH),
+                temperature=self.temperature
+            )
+            
+            questions = self._extract_numbered_questions(response_text)
+            self._cache_questions(user_profile, category, difficulty, questions)
+        except Exception as e:
+            print(f"Error refilling question cache: {e}")
+        finally:
+            with self._refill_lock:
+                self._refilling.discard(key)
+    
+    def generate_qa_feedback(self, questions_answers: List[Tuple[str, str]], role: str = "General",
+                             parallel: bool = False) -> str:
         """
         Generate structured feedback for a list of Q&A pairs.
         
         Args:
             questions_answers: List of tuples containing (question, answer) pairs
             role: The role/position being interviewed for
+            parallel: Evaluate each pair in its own concurrent call instead of one combined prompt
             
         Returns:
             Formatted feedback string with the requested structure
         """
+        if parallel:
+            return self.merge_qa_feedback(self.iter_qa_feedback(questions_answers, role))
+        return self._run(self._qa_feedback_flow(questions_answers, role))
+    
+    async def agenerate_qa_feedback(self, questions_answers: List[Tuple[str, str]], role: str = "General",
+                                    parallel: bool = False) -> str:
+        """Async version of generate_qa_feedback."""
+        if parallel:
+            return self.merge_qa_feedback([item async for item in self.aiter_qa_feedback(questions_answers, role)])
+        return await self._arun(self._qa_feedback_flow(questions_answers, role))
+    
+    def iter_qa_feedback(self, questions_answers: List[Tuple[str, str]], role: str = "General") -> Iterator[Dict]:
+        """
+        Evaluate each Q&A pair in its own concurrent call.
+        
+        Args:
+            questions_answers: List of tuples containing (question, answer) pairs
+            role: The role/position being interviewed for
+            
+        Yields:
+            Dictionaries with 'index', 'question', 'answer' and 'feedback', in completion order
+        """
+        # Each call runs in a copy of this context so the scheduler counts it against the caller's session
+        futures = [
+            self._qa_executor.submit(
+                contextvars.copy_context().run, self._run, self._qa_pair_flow(index, question, answer, role)
+            )
+            for index, (question, answer) in enumerate(questions_answers, 1)
+        ]
+        
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Don't leave queued work behind if the consumer stops early
+            for future in futures:
+                future.cancel()
+    
+    async def aiter_qa_feedback(self, questions_answers: List[Tuple[str, str]],
+                                role: str = "General") -> AsyncIterator[Dict]:
+        """Async version of iter_qa_feedback."""
+        # As many pairs run at once as the thread pool would allow, all queued under the caller
+        slots = asyncio.Semaphore(Config.QA_FEEDBACK_MAX_WORKERS)
+        
+        async def generate(index, question, answer):
+            async with slots:
+                return await self._arun(self._qa_pair_flow(index, question, answer, role))
+        
+        tasks = [
+            asyncio.ensure_future(generate(index, question, answer))
+            for index, (question, answer) in enumerate(questions_answers, 1)
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave calls running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+    
+    def merge_qa_feedback(self, items: Iterable[Dict]) -> str:
+        """Merge per-pair feedback into the combined ✅/⚠️/💡 feedback format."""
+        blocks = []
+        for item in sorted(items, key=lambda item: item['index']):
+            block = item['feedback'].strip()
+            block = block[3:] if block.startswith('---') else block
+            block = block[:-3] if block.endswith('---') else block
+            blocks.append(block.strip())
+        
+        return '---\n' + '\n---\n'.join(blocks) + '\n---\n'
+    
+    def _qa_feedback_flow(self, questions_answers: List[Tuple[str, str]], role: str) -> Iterator[Dict]:
+        """Flow for generate_qa_feedback with one combined prompt."""
         prompt = self._build_qa_feedback_prompt(questions_answers, role)
         
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert interview coach providing detailed, constructive feedback. Use the exact format requested with ✅, ⚠️, and 💡 symbols."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content.strip()
+            return (yield {
+                'call_type': 'qa_feedback',
+                'messages': self._qa_feedback_messages(prompt),
+                'max_tokens': output_budget('qa_feedback', len(questions_answers)),
+                'temperature': 0.3
+            })
+        except LLMOverloaded:
+            raise
         except Exception as e:
             print(f"Error generating Q&A feedback: {e}")
             return self._get_fallback_qa_feedback(questions_answers)
     
+    def _qa_pair_flow(self, index: int, question: str, answer: str, role: str) -> Iterator[Dict]:
+        """Flow generating feedback for a single Q&A pair."""
+        prompt = self._build_qa_feedback_prompt([(question, answer)], role, start=index)
+        
+        try:
+            feedback = yield {
+                'call_type': 'qa_pair',
+                'messages': self._qa_feedback_messages(prompt),
+                'max_tokens': output_budget('qa_pair'),
+                'temperature': 0.3
+            }
+        except LLMOverloaded:
+            raise
+        except Exception as e:
+            print(f"Error generating Q&A feedback for question {index}: {e}")
+            feedback = self._get_fallback_qa_feedback([(question, answer)], start=index)
+        
+        return {
+            'index': index,
+            'question': question,
+            'answer': answer,
+            'feedback': feedback
+        }
+    
     def generate_role_questions(self, role: str, num_questions: int = 3) -> List[str]:
         """
         Generate interview questions based on a specific role.
@@ -113,61 +579,71 @@ class AIHelper:
         Returns:
             List of generated questions
         """
+        return self._run(self._role_questions_flow(role, num_questions))
+    
+    async def agenerate_role_questions(self, role: str, num_questions: int = 3) -> List[str]:
+        """Async version of generate_role_questions."""
+        return await self._arun(self._role_questions_flow(role, num_questions))
+    
+    def _role_questions_flow(self, role: str, num_questions: int) -> Iterator[Dict]:
+        """Flow for generate_role_questions."""
         prompt = self._build_role_questions_prompt(role, num_questions)
         
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert interview coach. Generate relevant, challenging interview questions for the specified role."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-            
-            questions_text = response.choices[0].message.content.strip()
+            questions_text = yield {
+                'call_type': 'role_questions',
+                'messages': self._role_questions_messages(prompt),
+                'max_tokens': output_budget('role_questions', num_questions),
+                'temperature': self.temperature
+            }
             return self._parse_questions_list(questions_text)
+        except LLMOverloaded:
+            raise
         except Exception as e:
             print(f"Error generating role questions: {e}")
             return self._get_fallback_role_questions(role, num_questions)
     
-    def _build_qa_feedback_prompt(self, questions_answers: List[Tuple[str, str]], role: str) -> str:
+    def _build_qa_feedback_prompt(self, questions_answers: List[Tuple[str, str]], role: str, start: int = 1) -> str:
         """Build prompt for Q&A feedback generation."""
-        prompt = f"""You will receive a list of interview questions and candidate answers for a {role} position. For each one, give:
+        prompt = f"""You will receive interview questions and candidate answers for the position below. For each one, give:
 - Positive feedback (what the answer did well)
 - Areas to improve
 - One specific tip to make the answer better
 
-Format like this:
+Format like this, keeping each question's number:
 ---
-Question 1: <question>
+Question <n>: <question>
 Candidate Answer: <answer>
 ✅ Strengths:
 ⚠️ Weaknesses:
 💡 Suggestion:
 ---
 
+Position: {fit_tokens(role, 30)[0]}
+
 Here is the Q&A list:"""
         
-        for i, (q, a) in enumerate(questions_answers, 1):
-            prompt += f"\nQuestion {i}: {q}\nCandidate Answer: {a}\n"
+        for i, (q, a) in enumerate(questions_answers, start):
+            prompt += f"\nQuestion {i}: {compact_whitespace(q)}\nCandidate Answer: {compact_whitespace(a)}\n"
         
         return prompt
     
     def _build_role_questions_prompt(self, role: str, num_questions: int) -> str:
         """Build prompt for role-specific question generation."""
-        return f"""Generate {num_questions} interview questions for a {role} position. 
-Include a mix of:
-- Behavioral questions (about past experiences)
-- Technical questions (role-specific skills)
-- Situational questions (how they would handle scenarios)
+        return compact_whitespace(f"""
+Generate interview questions for the position below. Include a mix of behavioral questions (past experiences), technical questions (role-specific skills) and situational questions (how they would handle scenarios). Make each one specific to the role, challenging but appropriate for the position level, and return them as a numbered list.
 
-Make the questions specific to the {role} role and return them as a numbered list.
-Each question should be challenging but appropriate for the position level."""
+Position: {fit_tokens(role, 30)[0]}
+Number of questions: {num_questions}
+""")
     
     def _parse_questions_list(self, questions_text: str) -> List[str]:
         """Parse questions from AI response."""
+        questions = self._extract_numbered_questions(questions_text)
+        return questions if questions else self._get_fallback_role_questions("General", 3)
+    
+    def _extract_numbered_questions(self, questions_text: str) -> List[str]:
+        """Extract the questions from a numbered list."""
         questions = []
         lines = questions_text.strip().split('\n')
         
@@ -182,12 +658,13 @@ Each question should be challenging but appropriate for the position level."""
                     question = line.split(': ', 1)[1]
                 questions.append(question)
         
-        return questions if questions else self._get_fallback_role_questions("General", 3)
+        return questions
     
-    def _get_fallback_qa_feedback(self, questions_answers: List[Tuple[str, str]]) -> str:
+    def _get_fallback_qa_feedback(self, questions_answers: List[Tuple[str, str]], start: int = 1) -> str:
         """Get fallback feedback when AI generation fails."""
+        FALLBACKS.inc(kind='qa_feedback')
         feedback = ""
-        for i, (question, answer) in enumerate(questions_answers, 1):
+        for i, (question, answer) in enumerate(questions_answers, start):
             feedback += f"""---
 Question {i}: {question}
 Candidate Answer: {answer}
@@ -211,6 +688,7 @@ Candidate Answer: {answer}
     
     def _get_fallback_role_questions(self, role: str, num_questions: int) -> List[str]:
         """Get fallback questions when AI generation fails."""
+        FALLBACKS.inc(kind='role_questions')
         fallback_questions = {
             "software_engineer": [
                 "Tell me about a challenging technical problem you solved recently.",
@@ -235,45 +713,76 @@ Candidate Answer: {answer}
             "Where do you see yourself in 5 years?"
         ])[:num_questions]
     
+    @staticmethod
+    def _question_messages(prompt: str) -> List[Dict]:
+        """Chat messages for a question generation prompt."""
+        return [
+            {"role": "system", "content": "You are an expert interview coach. Generate relevant, challenging interview questions."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    def _qa_feedback_messages(prompt: str) -> List[Dict]:
+        """Chat messages for a Q&A feedback prompt."""
+        return [
+            {"role": "system", "content": "You are an expert interview coach providing detailed, constructive feedback. Use the exact format requested with ✅, ⚠️, and 💡 symbols."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    def _role_questions_messages(prompt: str) -> List[Dict]:
+        """Chat messages for a role questions prompt."""
+        return [
+            {"role": "system", "content": "You are an expert interview coach. Generate relevant, challenging interview questions for the specified role."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    @staticmethod
+    def _evaluation_messages(prompt: str) -> List[Dict]:
+        """Chat messages for an evaluation prompt."""
+        return [
+            {"role": "system", "content": "You are an expert interview evaluator. Provide constructive feedback."},
+            {"role": "user", "content": prompt}
+        ]
+    
     def _build_question_prompt(self, user_profile: Dict, category: str, difficulty: str) -> str:
         """Build prompt for question generation."""
-        return f"""
-        Generate an interview question for a {difficulty} level {category} interview.
-        
-        User Profile:
-        - Career Field: {user_profile.get('career_field', 'General')}
-        - Experience Level: {user_profile.get('experience_level', 'Entry Level')}
-        - Target Role: {user_profile.get('target_role', 'General Position')}
-        
-        Requirements:
-        - Category: {category}
-        - Difficulty: {difficulty}
-        - Make it specific to their career field
-        - Ensure it's appropriate for their experience level
-        - Return only the question, no additional text
-        """
+        return compact_whitespace(f"""
+Generate one interview question for the candidate below. Make it specific to their career field and appropriate for their experience level. Return only the question, no additional text.
+
+{self._describe_candidate(user_profile, category, difficulty)}
+""")
+    
+    def _build_question_batch_prompt(self, user_profile: Dict, category: str, difficulty: str, count: int) -> str:
+        """Build prompt for generating several questions for the same profile."""
+        return compact_whitespace(f"""
+Generate {count} different interview questions for the candidate below. Make them specific to their career field and appropriate for their experience level. Return only the questions as a numbered list, no additional text.
+
+{self._describe_candidate(user_profile, category, difficulty)}
+""")
+    
+    def _describe_candidate(self, user_profile: Dict, category: str, difficulty: str) -> str:
+        """Variable part of the question prompts, kept after the fixed instructions."""
+        return f"""Category: {category}
+Difficulty: {difficulty}
+Career field: {user_profile.get('career_field', 'General')}
+Experience level: {user_profile.get('experience_level', 'Entry Level')}
+Target role: {fit_tokens(user_profile.get('target_role', 'General Position'), 30)[0]}"""
     
     def _build_evaluation_prompt(self, question: str, user_response: str, category: str) -> str:
-        """Build prompt for response evaluation."""
-        return f"""
-        Evaluate this interview response and provide structured feedback.
-        
-        Question: {question}
-        Category: {category}
-        Response: {user_response}
-        
-        Please provide evaluation in the following JSON format:
-        {{
-            "score": 1-10,
-            "strengths": ["strength1", "strength2"],
-            "weaknesses": ["weakness1", "weakness2"],
-            "feedback": "detailed feedback text",
-            "improvement_areas": ["area1", "area2"],
-            "resources": ["resource1", "resource2"]
-        }}
-        """
+        """Build prompt for response evaluation, asking for the compact evaluation schema."""
+        return compact_whitespace(f"""
+Evaluate this interview response. Reply with only a JSON object with these keys:
+{{"s": score 1-10, "st": [strengths], "w": [weaknesses], "f": "feedback, at most 80 words", "i": [improvement areas], "r": [resources]}}
+Give at most 3 short items per list.
+
+Category: {category}
+Question: {question}
+Response: {user_response}
+""")
     
-    def _parse_evaluation(self, evaluation_text: str) -> Dict:
+    def _parse_evaluation(self, evaluation_text: str, question: str = '', user_response: str = '',
+                          category: str = '') -> Dict:
         """Parse evaluation response from AI."""
         try:
             # Try to extract JSON from the response
@@ -281,22 +790,19 @@ Candidate Answer: {answer}
                 start = evaluation_text.find('{')
                 end = evaluation_text.rfind('}') + 1
                 json_str = evaluation_text[start:end]
-                return json.loads(json_str)
+                return expand_evaluation(json.loads(json_str))
         except:
             pass
         
-        # Fallback parsing
-        return {
-            "score": 7,
-            "strengths": ["Good attempt at answering the question"],
-            "weaknesses": ["Could provide more specific examples"],
-            "feedback": evaluation_text,
-            "improvement_areas": ["Provide more concrete examples", "Structure your response better"],
-            "resources": ["Interview preparation guides", "STAR method resources"]
-        }
+        # Fallback parsing: keep the AI's prose but score the answer locally
+        FALLBACKS.inc(kind='evaluation_parse')
+        evaluation = self.heuristic_evaluator.evaluate(question, user_response, category)
+        evaluation['feedback'] = evaluation_text
+        return evaluation
     
-    def _get_fallback_question(self, category: str, difficulty: str) -> str:
-        """Get fallback questions when AI generation fails."""
+    def _get_fallback_question(self, category: str, difficulty: str, asked_questions: Iterable[str] = ()) -> str:
+        """Get fallback questions when AI generation fails, avoiding ones already asked."""
+        FALLBACKS.inc(kind='question')
         fallback_questions = {
             'behavioral': {
                 'beginner': 'Tell me about a time when you had to work with a difficult team member.',
@@ -310,15 +816,89 @@ Candidate Answer: {answer}
             }
         }
         
-        return fallback_questions.get(category, {}).get(difficulty, 'Tell me about yourself.')
+        general_questions = [
+            'Tell me about yourself.',
+            'What accomplishment are you most proud of, and why?',
+            'Why are you interested in this role?',
+            'Where do you see your career in five years?',
+            'What would your previous manager say is your greatest strength?'
+        ]
+        
+        preferred = fallback_questions.get(category, {}).get(difficulty, 'Tell me about yourself.')
+        asked_questions = list(asked_questions)
+        candidates = [preferred] + list(fallback_questions.get(category, {}).values()) + general_questions
+        for candidate in candidates:
+            if not self._is_repeat(candidate, asked_questions):
+                return candidate
+        
+        return preferred
     
-    def _get_fallback_evaluation(self) -> Dict:
+    def _get_fallback_evaluation(self, question: str, user_response: str, category: str) -> Dict:
         """Get fallback evaluation when AI evaluation fails."""
-        return {
-            "score": 6,
-            "strengths": ["Attempted to answer the question"],
-            "weaknesses": ["Response could be more detailed"],
-            "feedback": "Your response shows effort, but could benefit from more specific examples and structure.",
-            "improvement_areas": ["Provide specific examples", "Use the STAR method", "Be more concise"],
-            "resources": ["Interview preparation guides", "STAR method resources"]
-        } 
\ No newline at end of file
+        FALLBACKS.inc(kind='evaluation')
+        return self.heuristic_evaluator.evaluate(question, user_response, category) 
+
+
+def _flight_key(call_type: str, messages: List[Dict], max_tokens: int, temperature: float) -> Tuple:
+    """Identity of a completion request, ignoring case and whitespace differences in the prompt."""
+    normalized = tuple(
+        (message['role'], ' '.join(message['content'].lower().split()))
+        for message in messages
+    )
+    return (call_type, normalized, max_tokens, temperature)
+
+
+class _EvaluationStream:
+    """Shared state and events of a streamed evaluation, fed by the sync or async stream of chunks."""
+    
+    def __init__(self, helper: AIHelper, question: str, user_response: str, category: str):
+        """Look up the cache and prepare the completion call; call stays None on a cache hit."""
+        self.helper = helper
+        self.question = question
+        self.user_response = user_response
+        self.category = category
+        self.cache_key = EvaluationCache.make_key(question, user_response, category)
+        self.cached = helper._cached_evaluation(self.cache_key)
+        self.call = None
+        self.truncated = False
+        if self.cached is None:
+            self.call, self.truncated = helper._evaluation_call(question, user_response, category)
+        self.parser = JSONFieldStreamParser()
+        self.parts = []
+    
+    def start(self) -> List[Tuple[str, Any]]:
+        """Events sent before the AI responds."""
+        if self.cached is not None:
+            return [('done', self.cached)]
+        if Config.HEURISTIC_FAST_PATH:
+            return [('provisional', self.helper.heuristic_evaluator.evaluate(
+                self.question, self.user_response, self.category
+            ))]
+        return []
+    
+    def feed(self, content: str) -> List[Tuple[str, Any]]:
+        """Events for the fields completed by a chunk of the AI's response."""
+        self.parts.append(content)
+        return [
+            ('field', {'key': EVALUATION_KEYS.get(key, key), 'value': value})
+            for key, value in self.parser.feed(content)
+        ]
+    
+    def finish(self) -> List[Tuple[str, Any]]:
+        """The final event once the AI's response is complete."""
+        try:
+            evaluation = self.helper._evaluated(
+                ''.join(self.parts), self.cache_key, self.truncated,
+                self.question, self.user_response, self.category
+            )
+        except Exception as e:
+            return self.fail(e)
+        return [('done', evaluation)]
+    
+    def fail(self, error: Exception) -> List[Tuple[str, Any]]:
+        """The final event when the AI call failed."""
+        if isinstance(error, LLMOverloaded):
+            # Shed load and tell the client when to retry, as the non-streaming route does
+            return [('error', {'error': str(error), 'retry_after': error.retry_after})]
+        print(f"Error streaming evaluation: {error}")
+        return [('done', self.helper._get_fallback_evaluation(self.question, self.user_response, self.category))]
@@ -0,0 +1,225 @@
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Cohort columns; few distinct values, so they are dictionary-encoded and load as categoricals
+DIMENSIONS = ['career_field', 'experience_level', 'interview_type', 'category', 'difficulty']
+
+# Trend buckets accepted by cohort_report, as pandas period codes
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'M'}
+
+_schema = None
+
+
+def export_schema():
+    """Arrow schema of the exported response rows."""
+    global _schema
+    if _schema is None:
+        import pyarrow as pa
+        dimension = pa.dictionary(pa.int32(), pa.string())
+        _schema = pa.schema(
+            [
+                ('session_id', pa.string()),
+                ('recorded_at', pa.timestamp('ms')),
+                ('question_number', pa.int16()),
+                ('score', pa.float32()),
+                ('response_words', pa.int32()),
+                ('target_role', pa.string())
+            ] + [(name, dimension) for name in DIMENSIONS]
+        )
+    return _schema
+
+
+class AnalyticsExporter:
+    """
+    Append-only Parquet export of recorded responses, for cohort reports.
+
+    Rows are buffered in memory and written as a new part file whenever a batch fills up or
+    the flush interval passes; files are renamed into place once complete and never
+    rewritten, so a report can read the directory at any time. Sessions expire, the export
+    doesn't. Only the profile fields, categories and scores are exported, not the text of
+    questions or answers.
+    """
+
+    def __init__(self, directory: str, batch_rows: int = 5000, flush_interval: float = 300):
+        """
+        Initialize the exporter.
+
+        Args:
+            directory: Directory the part files are written to
+            batch_rows: Rows per part file
+            flush_interval: Seconds before a partial batch is written anyway
+        """
+        self.directory = directory
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+
+        self._rows = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._sequence = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flusher = None
+
+        self.rows_written = 0
+        self.files_written = 0
+        self.rows_dropped = 0
+
+    def record(self, row: Dict) -> None:
+        """
+        Queue one response row for export.
+
+        Args:
+            row: Values for the columns in export_schema
+        """
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.batch_rows
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write the buffered rows as one part file.
+
+        Returns:
+            Number of rows written
+        """
+        with self._write_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                self._write(rows)
+            except Exception as e:
+                print(f"Error exporting analytics: {e}")
+                self.rows_dropped += len(rows)
+                return 0
+            self.rows_written += len(rows)
+            self.files_written += 1
+            return len(rows)
+
+    def start(self) -> None:
+        """Start the background flusher; threads don't survive a fork, so run this per worker."""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._run, name='analytics-export', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def stats(self) -> Dict:
+        """Get the buffered, written and dropped row counts."""
+        with self._lock:
+            buffered = len(self._rows)
+
+        return {
+            'rows_buffered': buffered,
+            'rows_written': self.rows_written,
+            'files_written': self.files_written,
+            'rows_dropped': self.rows_dropped
+        }
+
+    def _run(self) -> None:
+        """Flusher loop: write a batch when one fills up or the interval passes."""
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, rows: List[Dict]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        name = f"responses-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self._sequence:06d}.parquet"
+        path = os.path.join(self.directory, name)
+        # Dot-prefixed files are skipped by readers, so a partial file is never picked up
+        partial = os.path.join(self.directory, f".{name}.tmp")
+
+        table = pa.Table.from_pylist(rows, schema=export_schema())
+        pq.write_table(table, partial, compression='zstd')
+        os.replace(partial, path)
+
+
+def load_responses(directory: str, columns: List[str], since: Optional[datetime] = None,
+                   until: Optional[datetime] = None):
+    """
+    Load exported responses into a DataFrame, reading only the given columns.
+
+    Args:
+        directory: Export directory
+        columns: Columns to read
+        since: Only responses recorded at or after this time
+        until: Only responses recorded before this time
+
+    Returns:
+        pandas DataFrame; dimension columns are categoricals
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    condition = None
+    recorded_at = ds.field('recorded_at')
+    for bound, keep in ((since, lambda value: recorded_at >= value), (until, lambda value: recorded_at < value)):
+        if bound is not None:
+            clause = keep(pa.scalar(bound, type=pa.timestamp('ms')))
+            condition = clause if condition is None else condition & clause
+
+    dataset = ds.dataset(directory, format='parquet', schema=export_schema())
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+def cohort_report(frame, by: List[str], period: Optional[str] = None, min_responses: int = 1):
+    """
+    Aggregate scores per cohort with vectorized group-bys.
+
+    Args:
+        frame: Responses from load_responses, with the score, session_id and by columns
+            (and recorded_at when a period is given)
+        by: Dimension columns defining a cohort
+        period: 'day', 'week' or 'month' to break each cohort down over time
+        min_responses: Cohorts with fewer responses are left out
+
+    Returns:
+        pandas DataFrame indexed by the period and cohort columns, with response and session
+        counts, mean, median and spread of the score, the share of weak (4 or less) and
+        strong (8 or more) answers and, per period, the change in mean score since the
+        cohort's previous period
+    """
+    keys = [frame[column] for column in by]
+    if period:
+        keys.insert(0, frame['recorded_at'].dt.to_period(PERIODS[period]).dt.start_time.rename('period'))
+
+    scores = frame.assign(weak=frame['score'] <= 4, strong=frame['score'] >= 8)
+    report = scores.groupby(keys, observed=True, sort=True).agg(
+        responses=('score', 'size'),
+        sessions=('session_id', 'nunique'),
+        mean_score=('score', 'mean'),
+        median_score=('score', 'median'),
+        std_score=('score', 'std'),
+        weak_share=('weak', 'mean'),
+        strong_share=('strong', 'mean')
+    )
+    report = report[report['responses'] >= min_responses]
+
+    if period:
+        # Rows are sorted by period first, so this compares each cohort with its previous period
+        report['mean_change'] = report.groupby(level=by, observed=True)['mean_score'].diff()
+    return report.round(3)
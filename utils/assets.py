@@ -0,0 +1,48 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+
+class AssetManifest:
+    """
+    Lookup of the fingerprinted static files written by scripts/build_assets.py.
+
+    The manifest maps each source file (e.g. 'css/style.css') to its content-hashed
+    copy under static/dist and the precompressed encodings built for it. Without a
+    manifest, or when disabled, templates fall back to the plain static URLs.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, dist_folder: str, enabled: bool = True):
+        """
+        Initialize the manifest.
+
+        Args:
+            dist_folder: Folder the build script writes to
+            enabled: Whether fingerprinted URLs should be used at all
+        """
+        self.dist_folder = dist_folder
+        self._assets: Dict[str, Dict] = {}
+        self._encodings: Dict[str, List[str]] = {}  # fingerprinted path -> encodings
+
+        path = os.path.join(dist_folder, self.MANIFEST)
+        if enabled and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._assets = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading asset manifest: {e}")
+            self._encodings = {asset['path']: asset.get('encodings', []) for asset in self._assets.values()}
+
+    def fingerprinted(self, filename: str) -> Optional[str]:
+        """Get the fingerprinted path for a source file, relative to the dist folder."""
+        asset = self._assets.get(filename)
+        return asset['path'] if asset else None
+
+    def encodings(self, path: str) -> Optional[List[str]]:
+        """Get the precompressed encodings of a fingerprinted file, or None if it isn't in the manifest."""
+        return self._encodings.get(path)
+
+    def __len__(self) -> int:
+        return len(self._assets)
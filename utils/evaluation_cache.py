@@ -0,0 +1,184 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class EvaluationCache:
+    """
+    Content-addressed cache of AI evaluations.
+
+    Entries are keyed by a hash of the normalized question, response and category, so the
+    same answer to the same question is only evaluated upstream once. A bounded in-memory
+    LRU sits in front of an optional SQLite file that is kept under a byte budget by
+    evicting the least recently used rows.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS evaluations (
+            key TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            accessed REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_evaluations_accessed ON evaluations (accessed);
+    """
+
+    def __init__(self, max_entries: int, path: Optional[str] = None, max_bytes: int = 0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of evaluations kept in memory
+            path: Optional SQLite file for a persistent tier shared across restarts and workers
+            max_bytes: Size budget for the persistent tier
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> evaluation
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+        self._disk_bytes = 0
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            connection = self._connection()
+            connection.executescript(self.SCHEMA)
+            self._disk_bytes = connection.execute('SELECT COALESCE(SUM(size), 0) FROM evaluations').fetchone()[0]
+
+    @staticmethod
+    def make_key(question: str, user_response: str, category: str) -> str:
+        """Hash the normalized evaluation inputs."""
+        normalized = '\x1f'.join(' '.join(str(value).lower().split()) for value in (question, user_response, category))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a cached evaluation.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            A copy of the evaluation, or None on a miss
+        """
+        with self._lock:
+            evaluation = self._entries.get(key)
+            if evaluation is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(evaluation)
+
+        evaluation = self._get_from_disk(key) if self.path else None
+        with self._lock:
+            if evaluation is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, evaluation)
+        return copy.deepcopy(evaluation)
+
+    def put(self, key: str, evaluation: Dict) -> None:
+        """Cache an evaluation."""
+        evaluation = copy.deepcopy(evaluation)
+        with self._lock:
+            self._remember(key, evaluation)
+
+        if self.path:
+            try:
+                self._put_on_disk(key, evaluation)
+            except sqlite3.Error as e:
+                print(f"Error persisting evaluation: {e}")
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0,
+                'disk_bytes': self._disk_bytes if self.path else None,
+                'disk_evictions': self.disk_evictions
+            }
+
+    def _remember(self, key: str, evaluation: Dict) -> None:
+        """Add to the in-memory LRU. Caller holds the lock."""
+        self._entries[key] = evaluation
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_from_disk(self, key: str) -> Optional[Dict]:
+        try:
+            connection = self._connection()
+            row = connection.execute('SELECT data FROM evaluations WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute('UPDATE evaluations SET accessed = ? WHERE key = ?', (time.time(), key))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error reading cached evaluation: {e}")
+            return None
+
+    def _put_on_disk(self, key: str, evaluation: Dict) -> None:
+        data = json.dumps(evaluation)
+        size = len(key) + len(data)
+        connection = self._connection()
+        previous = connection.execute('SELECT size FROM evaluations WHERE key = ?', (key,)).fetchone()
+        connection.execute(
+            'INSERT OR REPLACE INTO evaluations (key, data, size, accessed) VALUES (?, ?, ?, ?)',
+            (key, data, size, time.time())
+        )
+
+        with self._lock:
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            over_budget = self.max_bytes and self._disk_bytes > self.max_bytes
+        if over_budget:
+            self._evict_from_disk(connection)
+
+    def _evict_from_disk(self, connection: sqlite3.Connection) -> None:
+        """Delete the least recently used rows until the file is back under 90% of its budget."""
+        # Other workers may share the file, so re-read the real total before evicting
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM evaluations').fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+
+        doomed = []
+        if total > target:
+            for key, size in connection.execute('SELECT key, size FROM evaluations ORDER BY accessed'):
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+        evicted = len(doomed)
+
+        if doomed:
+            connection.executemany('DELETE FROM evaluations WHERE key = ?', doomed)
+        with self._lock:
+            self._disk_bytes = total
+            self.disk_evictions += evicted
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use and again after a fork."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
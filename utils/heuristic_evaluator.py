@@ -0,0 +1,209 @@
+import re
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Cue phrases for each part of a STAR (Situation, Task, Action, Result) answer
+STAR_PATTERNS = [
+    re.compile(r"\b(when i was|at my (last|previous|current)|in my (role|job|position)|the situation|we were|our team|there was)\b", re.I),
+    re.compile(r"\b(my (task|goal|responsibility|job) was|i was (asked|responsible|tasked)|needed to|had to|the challenge)\b", re.I),
+    re.compile(r"\b(i (decided|built|created|led|organized|implemented|designed|wrote|analyzed|proposed|reached out|worked|started|set up|introduced)|so i|i then)\b", re.I),
+    re.compile(r"\b(as a result|resulted in|in the end|ultimately|outcome|which (led|meant)|we (achieved|delivered|reduced|increased|improved)|i learned)\b", re.I)
+]
+QUANTITY_PATTERN = re.compile(r"(\d+(\.\d+)?\s*(%|percent|x\b|k\b|m\b|hours?|days?|weeks?|months?|years?|people|users|customers)|[$€£]\s*\d+|\b\d{2,}\b)", re.I)
+FIRST_PERSON_PATTERN = re.compile(r"\b(i|my|me)\b", re.I)
+FILLER_PATTERN = re.compile(r"\b(um+|uh+|like|basically|actually|kind of|sort of|you know)\b", re.I)
+WORD_PATTERN = re.compile(r"\b\w+\b")
+SENTENCE_PATTERN = re.compile(r"[.!?]+")
+
+CATEGORY_RESOURCES = {
+    'behavioral': ["STAR method resources", "Behavioral interview question banks"],
+    'technical': ["System design primers", "Practice problems for your field"],
+    'situational': ["Case interview frameworks", "Interview preparation guides"],
+    'leadership': ["Leadership interview guides", "STAR method resources"],
+    'teamwork': ["Collaboration and conflict resolution guides", "STAR method resources"],
+    'problem_solving': ["Structured problem-solving frameworks", "Practice problems for your field"]
+}
+DEFAULT_RESOURCES = ["Interview preparation guides", "STAR method resources"]
+
+
+class HeuristicEvaluator:
+    """Scores interview answers locally from text features, using the same schema as the AI evaluation."""
+
+    def __init__(self):
+        """Initialize the evaluator."""
+        self._vectorizer = None
+
+    @property
+    def vectorizer(self):
+        """Term vectorizer, built on first use so scikit-learn isn't loaded at startup."""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+
+            # Stateless hashing keeps batches independent and needs no fitting; two threads
+            # racing here build identical vectorizers, so no lock is needed
+            self._vectorizer = HashingVectorizer(
+                n_features=2 ** 16,
+                stop_words='english',
+                binary=True,
+                norm=None,
+                alternate_sign=False
+            )
+        return self._vectorizer
+
+    def evaluate(self, question: str, user_response: str, category: str) -> Dict:
+        """
+        Evaluate a single response.
+
+        Args:
+            question: The interview question
+            user_response: User's response
+            category: Question category
+
+        Returns:
+            Dictionary containing evaluation results
+        """
+        return self.evaluate_batch([(question, user_response, category)])[0]
+
+    def evaluate_batch(self, items: Sequence[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Evaluate many responses at once.
+
+        Args:
+            items: Sequence of (question, user_response, category) tuples
+
+        Returns:
+            List of evaluation dictionaries, in input order
+        """
+        if not items:
+            return []
+
+        questions = [question or '' for question, _, _ in items]
+        responses = [user_response or '' for _, user_response, _ in items]
+        features = self._extract_features(questions, responses)
+        scores = self._score(features)
+
+        return [
+            self._build_evaluation(scores[i], {name: values[i] for name, values in features.items()}, items[i][2])
+            for i in range(len(items))
+        ]
+
+    def _extract_features(self, questions: List[str], responses: List[str]) -> Dict[str, 'np.ndarray']:
+        """Compute the feature columns for a batch."""
+        import numpy as np
+
+        words = np.array([len(WORD_PATTERN.findall(text)) for text in responses], dtype=float)
+        sentences = np.array([max(1, len(SENTENCE_PATTERN.findall(text))) for text in responses], dtype=float)
+        star = np.array([[bool(pattern.search(text)) for pattern in STAR_PATTERNS] for text in responses], dtype=float)
+        quantities = np.array([len(QUANTITY_PATTERN.findall(text)) for text in responses], dtype=float)
+        first_person = np.array([len(FIRST_PERSON_PATTERN.findall(text)) for text in responses], dtype=float)
+        fillers = np.array([len(FILLER_PATTERN.findall(text)) for text in responses], dtype=float)
+
+        # Share of the question's content words that the answer addresses
+        question_terms = self.vectorizer.transform(questions)
+        response_terms = self.vectorizer.transform(responses)
+        shared = np.asarray(question_terms.multiply(response_terms).sum(axis=1)).ravel()
+        asked = np.asarray(question_terms.sum(axis=1)).ravel()
+        overlap = np.divide(shared, asked, out=np.zeros_like(shared, dtype=float), where=asked > 0)
+
+        safe_words = np.maximum(words, 1)
+        return {
+            'words': words,
+            'words_per_sentence': words / sentences,
+            'star': star,
+            'star_parts': star.sum(axis=1),
+            'quantities': quantities,
+            'first_person_rate': first_person / safe_words,
+            'filler_rate': fillers / safe_words,
+            'overlap': overlap
+        }
+
+    def _score(self, features: Dict[str, 'np.ndarray']) -> 'np.ndarray':
+        """Combine features into 1-10 scores."""
+        import numpy as np
+
+        words = features['words']
+
+        # Length: ramps up to ~120 words, flat to ~350, then gently penalizes rambling
+        length = np.clip(words / 120, 0, 1) - np.clip((words - 350) / 700, 0, 0.4)
+        structure = features['star_parts'] / 4
+        results = np.clip(features['quantities'] / 2, 0, 1)
+        ownership = np.clip(features['first_person_rate'] / 0.04, 0, 1)
+        relevance = np.clip(features['overlap'] / 0.4, 0, 1)
+        readability = 1 - np.clip((features['words_per_sentence'] - 30) / 30, 0, 1)
+        fillers = np.clip(features['filler_rate'] / 0.05, 0, 1)
+
+        raw = (
+            0.25 * length
+            + 0.25 * structure
+            + 0.15 * results
+            + 0.10 * ownership
+            + 0.15 * relevance
+            + 0.10 * readability
+            - 0.15 * fillers
+        )
+        scores = np.rint(1 + 9 * np.clip(raw, 0, 1)).astype(int)
+
+        # Answers too short to judge never score well
+        return np.where(words < 15, np.minimum(scores, 3), scores)
+
+    def _build_evaluation(self, score: int, features: Dict, category: str) -> Dict:
+        """Turn one row of features into the evaluation schema."""
+        strengths = []
+        weaknesses = []
+        improvement_areas = []
+
+        if features['star_parts'] >= 3:
+            strengths.append("Well-structured answer covering situation, actions and results")
+        else:
+            missing = [part for part, present in zip(['situation', 'task', 'action', 'result'], features['star']) if not present]
+            weaknesses.append(f"Structure is missing the {', '.join(missing)}")
+            improvement_areas.append("Use the STAR method")
+
+        if features['quantities'] >= 1:
+            strengths.append("Backs up the answer with concrete numbers")
+        else:
+            weaknesses.append("No measurable results")
+            improvement_areas.append("Quantify your impact")
+
+        if features['overlap'] >= 0.3:
+            strengths.append("Stays focused on the question asked")
+        else:
+            weaknesses.append("Doesn't clearly address the question")
+            improvement_areas.append("Answer the question directly before adding context")
+
+        if features['words'] < 60:
+            weaknesses.append("Response is too brief")
+            improvement_areas.append("Provide specific examples")
+        elif features['words'] > 400:
+            weaknesses.append("Response is long and may lose the interviewer")
+            improvement_areas.append("Be more concise")
+        else:
+            strengths.append("Appropriate length")
+
+        if features['first_person_rate'] >= 0.02:
+            strengths.append("Makes your own contribution clear")
+        if features['filler_rate'] >= 0.03:
+            weaknesses.append("Frequent filler words")
+            improvement_areas.append("Reduce filler words")
+
+        if not strengths:
+            strengths.append("Attempted to answer the question")
+
+        feedback = (
+            f"Quick assessment: {int(features['words'])} words, {int(features['star_parts'])} of 4 STAR elements, "
+            f"{int(features['quantities'])} quantified detail(s). "
+            + (f"Focus next on: {improvement_areas[0][0].lower()}{improvement_areas[0][1:]}." if improvement_areas else "Keep practicing answers at this level.")
+        )
+
+        return {
+            "score": int(score),
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "feedback": feedback,
+            "improvement_areas": improvement_areas,
+            # A copy, so callers editing the evaluation can't change the shared lists
+            "resources": list(CATEGORY_RESOURCES.get(category, DEFAULT_RESOURCES)),
+            "source": "heuristic"
+        }
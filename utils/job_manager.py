@@ -0,0 +1,287 @@
+import asyncio
+import contextvars
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.llm_scheduler import LLMOverloaded
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobLimitReached(Exception):
+    """Raised when a job is submitted while the maximum number of jobs are active."""
+
+
+class Job:
+    """
+    One background job: its status, the partial results published so far and the final result.
+
+    Every change bumps the version and wakes anyone waiting in wait_for_change, which is
+    what the streaming endpoint uses to push updates.
+    """
+
+    def __init__(self, job_id: str, kind: str):
+        self.id = job_id
+        self.kind = kind
+        self.status = QUEUED
+        self.items = []
+        self.result = None
+        self.error = None
+        self.retry_after = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.version = 0
+        self._changed = threading.Condition()
+        self._wakers = set()  # callbacks waking async waiters, which don't wait on the condition
+
+    def add_item(self, item: Any) -> None:
+        """Publish a partial result."""
+        with self._changed:
+            self.items.append(item)
+            self._bump()
+
+    def to_dict(self, since: int = 0) -> Dict:
+        """
+        Get the job state.
+
+        Args:
+            since: Number of partial results the client already has; only later ones are included
+
+        Returns:
+            Dictionary with the status, new partial results and, once finished, the result or error
+        """
+        with self._changed:
+            data = {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'items': self.items[since:],
+                'item_count': len(self.items),
+                'created_at': self.created_at,
+                'finished_at': self.finished_at
+            }
+            if self.status == DONE:
+                data['result'] = self.result
+            elif self.status == FAILED:
+                data['error'] = self.error
+                data['retry_after'] = self.retry_after
+            return data
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Block until the job changes past a version or the timeout passes.
+
+        Args:
+            version: Version the caller has seen
+            timeout: Seconds to wait
+
+        Returns:
+            The current version
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    async def await_change(self, version: int, timeout: float) -> int:
+        """Async version of wait_for_change; the wait is a future on the event loop, so it holds no thread."""
+        loop = asyncio.get_running_loop()
+        changed = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(lambda: changed.done() or changed.set_result(None))
+            except RuntimeError:
+                # The loop has closed; nobody is waiting any more
+                pass
+
+        with self._changed:
+            if self.version != version:
+                return self.version
+            self._wakers.add(wake)
+        try:
+            await asyncio.wait_for(changed, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._changed:
+                self._wakers.discard(wake)
+        return self.version
+
+    def _set_status(self, status: str, result: Any = None, error: Optional[str] = None,
+                    retry_after: Optional[int] = None) -> None:
+        with self._changed:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.retry_after = retry_after
+            if status in (DONE, FAILED):
+                self.finished_at = time.time()
+            self._bump()
+
+    def _bump(self) -> None:
+        """Caller holds the condition."""
+        self.version += 1
+        self._changed.notify_all()
+        for wake in list(self._wakers):
+            wake()
+
+
+class JobManager:
+    """
+    Runs long generations on a background executor so they don't hold a request worker.
+
+    Jobs live in this process; finished jobs are kept for a TTL so clients can collect the
+    result and are then dropped. Submissions are refused once the active cap is reached.
+    """
+
+    def __init__(self, workers: int, max_active: int, ttl: float):
+        """
+        Initialize the manager.
+
+        Args:
+            workers: Number of background worker threads
+            max_active: Maximum number of queued or running jobs
+            ttl: Seconds a finished job is kept
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._max_active = max_active
+        self._ttl = ttl
+
+        self._jobs = OrderedDict()  # job_id -> Job, in submission order
+        self._active = 0
+        self._lock = threading.Lock()
+
+        self._sweeper = None
+        self._sweeper_stop = threading.Event()
+
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def submit(self, kind: str, work: Callable[[Job], Any]) -> Job:
+        """
+        Start a job.
+
+        Args:
+            kind: Short job type, reported back to clients
+            work: Function run in the background; it receives the Job, may publish partial
+                results with job.add_item and returns the final result
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobLimitReached: If the maximum number of jobs are already queued or running
+        """
+        self.cleanup()
+        job = Job(uuid.uuid4().hex, kind)
+        with self._lock:
+            if self._active >= self._max_active:
+                self.rejected += 1
+                raise JobLimitReached('Too many jobs in progress')
+            self._active += 1
+            self._jobs[job.id] = job
+            self.submitted += 1
+
+        # The work runs in a copy of the caller's context, so LLM calls keep its session
+        context = contextvars.copy_context()
+        try:
+            self._executor.submit(context.run, self._run, job, work)
+        except RuntimeError:
+            # Executor is shutting down
+            self._finish(job, FAILED, error='Job could not be started')
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or self._expired(job, time.time()):
+            return None
+        return job
+
+    def cleanup(self) -> int:
+        """
+        Drop finished jobs older than the TTL.
+
+        Returns:
+            Number of jobs dropped
+        """
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if self._expired(job, now)]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def start_sweeper(self, interval: float) -> None:
+        """
+        Start a background thread that drops expired jobs, so a finished job's result is freed
+        even when nothing new is submitted.
+
+        Args:
+            interval: Seconds between sweeps
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        self._sweeper_stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep, args=(interval,), name='job-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper thread."""
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
+
+    def stats(self) -> Dict:
+        """Get job counts."""
+        self.cleanup()
+        with self._lock:
+            return {
+                'active': self._active,
+                'held': len(self._jobs),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'failed': self.failed
+            }
+
+    def _sweep(self, interval: float) -> None:
+        while not self._sweeper_stop.wait(interval):
+            self.cleanup()
+
+    def _run(self, job: Job, work: Callable[[Job], Any]) -> None:
+        job._set_status(RUNNING)
+        try:
+            result = work(job)
+        except LLMOverloaded as e:
+            self._finish(job, FAILED, error='The AI coach is busy, please try again shortly', retry_after=e.retry_after)
+        except Exception as e:
+            print(f"Error running {job.kind} job: {e}")
+            self._finish(job, FAILED, error='Job failed')
+        else:
+            self._finish(job, DONE, result=result)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None,
+                retry_after: Optional[int] = None) -> None:
+        job._set_status(status, result=result, error=error, retry_after=retry_after)
+        with self._lock:
+            self._active -= 1
+            if status == FAILED:
+                self.failed += 1
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished and now - job.finished_at > self._ttl
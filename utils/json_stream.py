@@ -0,0 +1,102 @@
+import json
+from typing import Any, List, Tuple
+
+
+class JSONFieldStreamParser:
+    """Incrementally parses a streamed JSON object and reports top-level fields as they complete."""
+
+    def __init__(self):
+        """Initialize the parser state."""
+        self.buffer = ''
+        self.position = 0
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.current_key = None
+        self.value_start = None
+        self.key_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Feed the next chunk of streamed text.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            List of (key, value) pairs for top-level fields completed by this chunk
+        """
+        completed = []
+        if self.finished or not chunk:
+            return completed
+
+        self.buffer += chunk
+
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+
+            if not self.started:
+                # Skip any preamble the model emits before the object
+                if char == '{':
+                    self.started = True
+                    self.depth = 1
+                self.position += 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.current_key is None and self.key_start is not None:
+                        self.current_key = self._decode(self.buffer[self.key_start:self.position + 1])
+                        self.key_start = None
+                self.position += 1
+                continue
+
+            if char == '"':
+                self.in_string = True
+                if self.depth == 1 and self.current_key is None:
+                    self.key_start = self.position
+            elif char == ':' and self.depth == 1 and self.current_key is not None and self.value_start is None:
+                self.value_start = self.position + 1
+            elif char in '{[':
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    self._complete_field(completed)
+                    self.finished = True
+                    self.position += 1
+                    break
+            elif char == ',' and self.depth == 1:
+                self._complete_field(completed)
+
+            self.position += 1
+
+        return completed
+
+    def _complete_field(self, completed: List[Tuple[str, Any]]) -> None:
+        """Decode the value of the field that just ended."""
+        if self.current_key is not None and self.value_start is not None:
+            raw_value = self.buffer[self.value_start:self.position].strip()
+            try:
+                completed.append((self.current_key, json.loads(raw_value)))
+            except ValueError:
+                # Leave malformed values to the final full-text parse
+                pass
+
+        self.current_key = None
+        self.value_start = None
+        self.key_start = None
+
+    def _decode(self, raw: str) -> str:
+        """Decode a JSON string literal."""
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw.strip('"')
@@ -0,0 +1,550 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from config import Config
+from utils.metrics import LLM_FIRST_TOKEN, LLM_HEDGES, LLM_REQUEST_DURATION, LLM_RETRIES, LLM_TOKENS
+from utils.llm_scheduler import LLMOverloaded, LLMScheduler
+from utils.resilience import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, LatencyTracker, is_retryable, retry_delay
+)
+from utils.token_budget import estimate_tokens
+
+if TYPE_CHECKING:
+    import httpx
+    import openai
+
+
+class LLMClient:
+    """
+    Shared OpenAI chat client with a pooled keep-alive connection layer and sync/async APIs.
+
+    Every call is first admitted by the LLMScheduler, which enforces rate limits, priorities
+    and per-session fairness. It then runs against an overall deadline for its call type,
+    queueing and retries included, and goes through a circuit breaker that fails fast with
+    CircuitOpenError while the upstream is unhealthy. Retries use jittered exponential
+    backoff and honour Retry-After. With hedging enabled, a completion that is still running
+    at the call type's p95 latency gets a second identical request, and whichever finishes
+    first is used.
+
+    The OpenAI SDK and httpx are imported when the first client is built, not at import time,
+    so processes that never call the upstream don't pay for loading them.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None):
+        """
+        Initialize the client and its connection pool.
+
+        Args:
+            api_key: OpenAI API key, defaults to Config.OPENAI_API_KEY
+            base_url: Override for the API base URL, defaults to Config.OPENAI_BASE_URL
+            model: Chat model name, defaults to Config.OPENAI_MODEL
+        """
+        self.api_key = api_key or Config.OPENAI_API_KEY
+        self.base_url = base_url or Config.OPENAI_BASE_URL
+        self.model = model or Config.OPENAI_MODEL
+
+        # Both clients are built on first use
+        self._http = None
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        self.breaker = CircuitBreaker(
+            window=Config.LLM_BREAKER_WINDOW,
+            min_calls=Config.LLM_BREAKER_MIN_CALLS,
+            failure_rate=Config.LLM_BREAKER_FAILURE_RATE,
+            slow_rate=Config.LLM_BREAKER_SLOW_RATE,
+            open_seconds=Config.LLM_BREAKER_OPEN_SECONDS,
+            half_open_calls=Config.LLM_BREAKER_HALF_OPEN_CALLS
+        )
+        self.latencies = LatencyTracker()
+        self.scheduler = LLMScheduler(
+            requests_per_minute=Config.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=Config.LLM_TOKENS_PER_MINUTE,
+            max_concurrent=Config.LLM_MAX_CONCURRENT,
+            max_queue=Config.LLM_QUEUE_MAX,
+            max_queue_per_session=Config.LLM_QUEUE_MAX_PER_SESSION,
+            max_wait=Config.LLM_QUEUE_MAX_WAIT,
+            priorities=Config.LLM_PRIORITIES
+        )
+
+        # Hedged calls run on their own threads; the semaphore keeps them from queueing
+        self._hedge_executor = None
+        self._hedge_slots = threading.BoundedSemaphore(max(1, Config.LLM_HEDGE_WORKERS))
+        if Config.LLM_HEDGING_ENABLED:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=max(1, Config.LLM_HEDGE_WORKERS), thread_name_prefix='llm-hedge'
+            )
+
+        # The async client also binds to the event loop it is first used on
+        self._async_client = None
+        self._async_lock = threading.Lock()
+
+    @property
+    def client(self) -> 'openai.OpenAI':
+        """OpenAI client over the pooled keep-alive connections."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+                    import openai
+
+                    self._http = httpx.Client(limits=self._limits(), timeout=self.timeout_for('default'))
+                    self._client = openai.OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        http_client=self._http,
+                        max_retries=0  # retries are made here, within the call's deadline
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> 'openai.AsyncOpenAI':
+        """Async OpenAI client sharing the same pool settings."""
+        if self._async_client is None:
+            with self._async_lock:
+                if self._async_client is None:
+                    import httpx
+                    import openai
+
+                    self._async_client = openai.AsyncOpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        http_client=httpx.AsyncClient(limits=self._limits(), timeout=self.timeout_for('default')),
+                        max_retries=0
+                    )
+        return self._async_client
+
+    def deadline_for(self, call_type: str) -> float:
+        """Get the overall seconds allowed for a call type, retries included."""
+        return Config.LLM_TIMEOUTS.get(call_type, Config.LLM_TIMEOUTS['default'])
+
+    def timeout_for(self, call_type: str, remaining: Optional[float] = None) -> 'httpx.Timeout':
+        """Get the request timeout for a call type, capped by the time left before its deadline."""
+        import httpx
+
+        total = self.deadline_for(call_type)
+        if remaining is not None:
+            total = max(0.001, min(total, remaining))
+        return httpx.Timeout(total, connect=min(total, Config.LLM_CONNECT_TIMEOUT))
+
+    @staticmethod
+    def _limits() -> 'httpx.Limits':
+        import httpx
+
+        return httpx.Limits(
+            max_connections=Config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY
+        )
+
+    def stats(self) -> Dict:
+        """Get the circuit breaker state and the hedge delays currently in use."""
+        hedge_delays = {}
+        for call_type in Config.LLM_TIMEOUTS:
+            delay = self._hedge_delay(call_type)
+            if delay is not None:
+                hedge_delays[call_type] = round(delay, 3)
+        return {
+            'breaker': self.breaker.stats(),
+            'scheduler': self.scheduler.stats(),
+            'hedging': self._hedge_executor is not None,
+            'hedge_delays': hedge_delays
+        }
+
+    def complete(self, call_type: str, messages: List[Dict], max_tokens: int, temperature: float) -> str:
+        """
+        Request a chat completion.
+
+        Args:
+            call_type: Kind of call, used to pick the timeout
+            messages: Chat messages
+            max_tokens: Completion token limit
+            temperature: Sampling temperature
+
+        Returns:
+            Stripped completion text
+
+        Raises:
+            LLMOverloaded: If the scheduler can't admit the call
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceeded: If the call type's deadline passes before a response
+        """
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.deadline_for(call_type)
+
+        def request(timeout):
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            )
+
+        tokens = _request_tokens(messages, max_tokens)
+        try:
+            ticket = self.scheduler.acquire(call_type, tokens, deadline - time.monotonic())
+            loser = None
+            try:
+                response, loser = self._hedged(call_type, deadline, tokens, request)
+            finally:
+                # A losing hedge can't be interrupted, so it keeps the slot until it finishes
+                if loser is None:
+                    self.scheduler.release(ticket)
+                else:
+                    loser.add_done_callback(lambda _: self.scheduler.release(ticket))
+        except Exception as e:
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - start, call_type=call_type, outcome=_outcome(e))
+            raise
+
+        LLM_REQUEST_DURATION.observe(time.perf_counter() - start, call_type=call_type, outcome='success')
+        _record_usage(call_type, response)
+        return (response.choices[0].message.content or '').strip()
+
+    def stream(self, call_type: str, messages: List[Dict], max_tokens: int, temperature: float) -> Iterator[str]:
+        """Request a streamed chat completion and yield its content deltas."""
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.deadline_for(call_type)
+        tokens = _request_tokens(messages, max_tokens)
+        ticket = None
+        opened = None
+        error = None
+        chunks = 0
+        outcome = 'error'
+        try:
+            ticket = self.scheduler.acquire(call_type, tokens, deadline - time.monotonic())
+            started = time.monotonic()
+            response = self._with_retries(call_type, deadline, tokens, lambda timeout: self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout,
+                stream=True
+            ), streaming=True)
+            opened = started
+
+            for chunk in response:
+                if time.monotonic() > deadline:
+                    response.response.close()
+                    raise DeadlineExceeded(f"{call_type} stream passed its deadline")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if not chunks:
+                        LLM_FIRST_TOKEN.observe(time.perf_counter() - start, call_type=call_type)
+                    chunks += 1
+                    yield chunk.choices[0].delta.content
+            outcome = 'success'
+        except Exception as e:
+            error = e
+            outcome = _outcome(e)
+            raise
+        finally:
+            if opened is not None:
+                self._end_stream(call_type, opened, error)
+            if ticket is not None:
+                self.scheduler.release(ticket)
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - start, call_type=call_type, outcome=outcome)
+            _record_streamed_tokens(call_type, chunks)
+
+    async def acomplete(self, call_type: str, messages: List[Dict], max_tokens: int, temperature: float) -> str:
+        """Async version of complete."""
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.deadline_for(call_type)
+
+        def request(timeout):
+            return self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            )
+
+        tokens = _request_tokens(messages, max_tokens)
+        try:
+            ticket = await self.scheduler.aacquire(call_type, tokens, deadline - time.monotonic())
+            try:
+                response = await self._ahedged(call_type, deadline, tokens, request)
+            finally:
+                self.scheduler.release(ticket)
+        except Exception as e:
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - start, call_type=call_type, outcome=_outcome(e))
+            raise
+
+        LLM_REQUEST_DURATION.observe(time.perf_counter() - start, call_type=call_type, outcome='success')
+        _record_usage(call_type, response)
+        return (response.choices[0].message.content or '').strip()
+
+    async def astream(self, call_type: str, messages: List[Dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        """Async version of stream."""
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.deadline_for(call_type)
+        tokens = _request_tokens(messages, max_tokens)
+        ticket = None
+        opened = None
+        error = None
+        chunks = 0
+        outcome = 'error'
+        try:
+            ticket = await self.scheduler.aacquire(call_type, tokens, deadline - time.monotonic())
+            started = time.monotonic()
+            response = await self._awith_retries(call_type, deadline, tokens, lambda timeout: self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout,
+                stream=True
+            ), streaming=True)
+            opened = started
+
+            async for chunk in response:
+                if time.monotonic() > deadline:
+                    await response.response.aclose()
+                    raise DeadlineExceeded(f"{call_type} stream passed its deadline")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if not chunks:
+                        LLM_FIRST_TOKEN.observe(time.perf_counter() - start, call_type=call_type)
+                    chunks += 1
+                    yield chunk.choices[0].delta.content
+            outcome = 'success'
+        except Exception as e:
+            error = e
+            outcome = _outcome(e)
+            raise
+        finally:
+            if opened is not None:
+                self._end_stream(call_type, opened, error)
+            if ticket is not None:
+                self.scheduler.release(ticket)
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - start, call_type=call_type, outcome=outcome)
+            _record_streamed_tokens(call_type, chunks)
+
+    def _with_retries(self, call_type: str, deadline: float, tokens: int, request: Callable,
+                      streaming: bool = False):
+        """
+        Make a request through the circuit breaker, retrying transient errors until the deadline.
+
+        Args:
+            call_type: Kind of call
+            deadline: time.monotonic() value by which the call must finish
+            tokens: Tokens charged to the scheduler for each retry
+            request: Function taking an httpx.Timeout and making one attempt
+            streaming: The request opens a stream; the caller records its outcome with _end_stream
+
+        Returns:
+            The request's result
+        """
+        attempt = 0
+        while True:
+            started = self._begin_attempt(call_type, deadline)
+            attempt += 1
+            try:
+                response = request(self.timeout_for(call_type, deadline - started))
+            except Exception as e:
+                delay = self._retry_after_failure(call_type, deadline, tokens, attempt, e)
+                time.sleep(delay)
+                continue
+            self._end_attempt(call_type, started, streaming)
+            return response
+
+    async def _awith_retries(self, call_type: str, deadline: float, tokens: int, request: Callable,
+                             streaming: bool = False):
+        """Async version of _with_retries; request returns an awaitable."""
+        attempt = 0
+        while True:
+            started = self._begin_attempt(call_type, deadline)
+            attempt += 1
+            try:
+                response = await request(self.timeout_for(call_type, deadline - started))
+            except Exception as e:
+                delay = self._retry_after_failure(call_type, deadline, tokens, attempt, e)
+                await asyncio.sleep(delay)
+                continue
+            self._end_attempt(call_type, started, streaming)
+            return response
+
+    def _begin_attempt(self, call_type: str, deadline: float) -> float:
+        """Check the breaker and the deadline before an attempt, returning its start time."""
+        self.breaker.allow()
+        now = time.monotonic()
+        if now >= deadline:
+            raise DeadlineExceeded(f"{call_type} call passed its deadline")
+        return now
+
+    def _end_attempt(self, call_type: str, started: float, streaming: bool = False) -> None:
+        """Record a successful attempt; calls using most of their deadline count as slow."""
+        elapsed = time.monotonic() - started
+        if not streaming:
+            self.breaker.record(failed=False, slow=self._is_slow(call_type, elapsed))
+        self.latencies.observe(call_type, elapsed)
+
+    def _end_stream(self, call_type: str, started: float, error: Optional[Exception]) -> None:
+        """Record an opened stream with the breaker once it ends, so failures after the first chunk count."""
+        if error is None:
+            # Read to the end, or closed early by the consumer
+            self.breaker.record(failed=False, slow=self._is_slow(call_type, time.monotonic() - started))
+        elif isinstance(error, DeadlineExceeded):
+            self.breaker.record(failed=False, slow=True)
+        else:
+            import httpx
+
+            # The SDK doesn't wrap errors raised while iterating, so a dropped connection is raw httpx
+            self.breaker.record(failed=is_retryable(error) or isinstance(error, httpx.TransportError))
+
+    def _is_slow(self, call_type: str, elapsed: float) -> bool:
+        return elapsed > self.deadline_for(call_type) * Config.LLM_SLOW_CALL_FRACTION
+
+    def _retry_after_failure(self, call_type: str, deadline: float, tokens: int, attempt: int,
+                             error: Exception) -> float:
+        """Record a failed attempt and return the delay before retrying, or re-raise if it shouldn't be retried."""
+        retryable = is_retryable(error)
+        self.breaker.record(failed=retryable)
+        if not retryable or attempt > Config.LLM_MAX_RETRIES:
+            raise error
+        delay = retry_delay(attempt, error, Config.LLM_RETRY_BASE_DELAY, Config.LLM_RETRY_MAX_DELAY)
+        if time.monotonic() + delay >= deadline:
+            raise error
+        LLM_RETRIES.inc(call_type=call_type)
+        self.scheduler.charge(tokens)
+        return delay
+
+    def _hedge_delay(self, call_type: str) -> Optional[float]:
+        """Seconds after which a call gets a hedge, or None if it shouldn't be hedged."""
+        if self._hedge_executor is None:
+            return None
+        return self.latencies.percentile(call_type, Config.LLM_HEDGE_PERCENTILE, Config.LLM_HEDGE_MIN_SAMPLES)
+
+    def _hedged(self, call_type: str, deadline: float, tokens: int, request: Callable):
+        """
+        Make a request, sending a second copy if the first is slower than usual; the first to finish wins.
+
+        Returns:
+            Tuple of (response, the losing request's future if it is still running, or None)
+        """
+        delay = self._hedge_delay(call_type)
+        if delay is None or delay >= deadline - time.monotonic() or not self._hedge_slots.acquire(blocking=False):
+            return self._with_retries(call_type, deadline, tokens, request), None
+
+        primary = self._submit_hedge(call_type, deadline, tokens, request)
+        done, _ = wait([primary], timeout=delay)
+        # A struggling upstream shouldn't be sent extra load
+        if done or self.breaker.state != CircuitBreaker.CLOSED or not self._hedge_slots.acquire(blocking=False):
+            return primary.result(), None
+
+        LLM_HEDGES.inc(call_type=call_type, result='sent')
+        self.scheduler.charge(tokens)
+        hedge = self._submit_hedge(call_type, deadline, tokens, request)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The other request can't be interrupted; it finishes in the background
+                    if future is hedge:
+                        LLM_HEDGES.inc(call_type=call_type, result='won')
+                    return future.result(), next(iter(pending), None)
+        return primary.result(), None
+
+    def _submit_hedge(self, call_type: str, deadline: float, tokens: int, request: Callable):
+        """Run one copy of a hedged request on the hedge pool; the caller holds a slot for it."""
+        future = self._hedge_executor.submit(self._with_retries, call_type, deadline, tokens, request)
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        return future
+
+    async def _ahedged(self, call_type: str, deadline: float, tokens: int, request: Callable):
+        """Async version of _hedged; the slower request is cancelled."""
+        delay = self._hedge_delay(call_type)
+        if delay is None or delay >= deadline - time.monotonic():
+            return await self._awith_retries(call_type, deadline, tokens, request)
+
+        primary = asyncio.ensure_future(self._awith_retries(call_type, deadline, tokens, request))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or self.breaker.state != CircuitBreaker.CLOSED:
+            return await primary
+
+        LLM_HEDGES.inc(call_type=call_type, result='sent')
+        self.scheduler.charge(tokens)
+        hedge = asyncio.ensure_future(self._awith_retries(call_type, deadline, tokens, request))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            LLM_HEDGES.inc(call_type=call_type, result='won')
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def warm(self, connections: int = 1) -> int:
+        """
+        Open pooled connections ahead of the first real request.
+
+        Args:
+            connections: Number of connections to establish concurrently
+
+        Returns:
+            Number of connections warmed successfully
+        """
+        def open_connection(_):
+            try:
+                # Any cheap authenticated request completes the TLS handshake
+                self.client.with_options(timeout=self.timeout_for('warmup')).models.list()
+                return True
+            except Exception as e:
+                print(f"Error warming LLM connection: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, connections)) as executor:
+            return sum(executor.map(open_connection, range(connections)))
+
+    def warm_in_background(self, connections: int = 1) -> None:
+        """Warm connections on a daemon thread so startup isn't blocked."""
+        threading.Thread(target=self.warm, args=(connections,), name='llm-warmup', daemon=True).start()
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self._http is not None:
+            self._http.close()
+
+
+def _outcome(error: Exception) -> str:
+    """Outcome label for a failed call."""
+    if isinstance(error, CircuitOpenError):
+        return 'rejected'
+    if isinstance(error, LLMOverloaded):
+        return 'overloaded'
+    import openai
+
+    if isinstance(error, (DeadlineExceeded, openai.APITimeoutError)):
+        return 'timeout'
+    return 'error'
+
+
+def _request_tokens(messages: List[Dict], max_tokens: int) -> int:
+    """Tokens a request counts against the rate limit: its prompt plus the completion cap."""
+    return sum(estimate_tokens(message.get('content', '')) for message in messages) + max_tokens
+
+
+def _record_usage(call_type: str, response) -> None:
+    """Count the tokens reported in a completion's usage field."""
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc(usage.prompt_tokens or 0, call_type=call_type, kind='prompt')
+    LLM_TOKENS.inc(usage.completion_tokens or 0, call_type=call_type, kind='completion')
+
+
+def _record_streamed_tokens(call_type: str, chunks: int) -> None:
+    """Count streamed completion tokens; streams carry no usage field, but each delta is about one token."""
+    if chunks:
+        LLM_TOKENS.inc(chunks, call_type=call_type, kind='completion')
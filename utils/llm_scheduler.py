@@ -0,0 +1,357 @@
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from utils.metrics import LLM_ADMISSION_REJECTED, LLM_QUEUE_WAIT
+
+# Calls made with no request behind them: cache refills and prefetches, which run on pool
+# threads that never had a session bound. They are bounded by their own pools, so they aren't
+# held to the per-session queue limit. Work done for a request (Q&A fan-out, jobs) runs in a
+# copy of the request's context and counts against its session instead.
+BACKGROUND = '_background'
+
+_current_session = ContextVar('llm_session', default=None)
+
+
+def set_current_session(session_id: Optional[str]) -> None:
+    """Attribute LLM calls made from the current context to a session, for fair queuing."""
+    _current_session.set(session_id)
+
+
+def client_key(address: Optional[str]) -> str:
+    """Queue key for a request with no interview session, so anonymous clients are scheduled apart."""
+    return f"client:{address or 'unknown'}"
+
+
+class LLMOverloaded(Exception):
+    """Raised when an LLM call can't be admitted; carries the HTTP status and Retry-After to send."""
+
+    def __init__(self, message: str, status: int, retry_after: int):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Per-minute allowance refilled continuously. Not thread-safe; the scheduler holds its lock."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until the bucket holds amount, after a refill."""
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class _Ticket:
+    __slots__ = ('call_type', 'priority', 'session_id', 'tokens', 'granted', 'waker')
+
+    def __init__(self, call_type: str, priority: int, session_id: str, tokens: int):
+        self.call_type = call_type
+        self.priority = priority
+        self.session_id = session_id
+        self.tokens = tokens
+        self.granted = False
+        self.waker = None  # called on grant for async waiters, which don't wait on the condition
+
+
+class LLMScheduler:
+    """
+    Admission control for upstream LLM calls.
+
+    Calls wait in a bounded queue until a concurrency slot is free and the requests- and
+    tokens-per-minute buckets can pay for them. Lower priority numbers go first; within a
+    priority, sessions take turns, so one session with many queued calls can't delay
+    everyone else. A call that can't be queued, or waits too long, is refused with
+    LLMOverloaded instead of tying up a worker thread.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_concurrent: int,
+                 max_queue: int, max_queue_per_session: int, max_wait: float, priorities: Dict[str, int]):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request rate limit, 0 for none
+            tokens_per_minute: Token rate limit (prompt plus max_tokens, as the API counts it), 0 for none
+            max_concurrent: Calls allowed upstream at once
+            max_queue: Calls allowed to wait in total
+            max_queue_per_session: Calls one session or anonymous client may have waiting
+            max_wait: Longest a call waits for admission, in seconds
+            priorities: Priority per call type, lower first; unknown types get the lowest priority
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_per_session = max_queue_per_session
+        self.max_wait = max_wait
+        self.priorities = priorities
+        self.default_priority = max(priorities.values(), default=0)
+
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self._cond = threading.Condition()
+        self._queues = {}  # priority -> OrderedDict of session_id -> deque of tickets, in turn order
+        self._waiting = 0
+        self._waiting_by_session = {}
+        self._in_flight = 0
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def acquire(self, call_type: str, tokens: int, timeout: Optional[float] = None,
+                session_id: Optional[str] = None) -> _Ticket:
+        """
+        Wait for admission.
+
+        Args:
+            call_type: Kind of call, which sets its priority
+            tokens: Tokens the call may use
+            timeout: Longest wait, capped at max_wait
+            session_id: Session to queue under, defaults to the current context's session
+
+        Returns:
+            Ticket to pass to release
+
+        Raises:
+            LLMOverloaded: If the queue is full or the wait times out
+        """
+        ticket = self._new_ticket(call_type, tokens, session_id)
+        start = time.monotonic()
+        deadline = start + (self.max_wait if timeout is None else min(timeout, self.max_wait))
+
+        with self._cond:
+            self._enqueue(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._time_out(ticket)
+                self._cond.wait(min(remaining, self._refill_wait()))
+                if not ticket.granted:
+                    self._dispatch()
+
+        LLM_QUEUE_WAIT.observe(time.monotonic() - start, call_type=call_type)
+        return ticket
+
+    async def aacquire(self, call_type: str, tokens: int, timeout: Optional[float] = None) -> _Ticket:
+        """Async version of acquire; the wait is a future on the event loop, so it holds no thread."""
+        ticket = self._new_ticket(call_type, tokens, None)
+        start = time.monotonic()
+        deadline = start + (self.max_wait if timeout is None else min(timeout, self.max_wait))
+
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+            except RuntimeError:
+                # The loop has closed; nobody is waiting any more
+                pass
+
+        ticket.waker = wake
+        try:
+            with self._cond:
+                self._enqueue(ticket)
+                self._dispatch()
+            while not ticket.granted:
+                with self._cond:
+                    if ticket.granted:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._time_out(ticket)
+                    wait = min(remaining, self._refill_wait())
+                try:
+                    await asyncio.wait_for(asyncio.shield(granted), wait)
+                except asyncio.TimeoutError:
+                    with self._cond:
+                        if not ticket.granted:
+                            self._dispatch()
+        except asyncio.CancelledError:
+            with self._cond:
+                if ticket.granted:
+                    # Granted as the caller gave up; hand the slot on
+                    self._in_flight -= 1
+                    self._dispatch()
+                else:
+                    self._remove(ticket, rotate=False)
+            raise
+
+        LLM_QUEUE_WAIT.observe(time.monotonic() - start, call_type=call_type)
+        return ticket
+
+    def release(self, ticket: _Ticket) -> None:
+        """Free a granted ticket's concurrency slot."""
+        with self._cond:
+            self._in_flight -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, call_type: str, tokens: int, timeout: Optional[float] = None):
+        """Hold admission for the duration of a with block."""
+        ticket = self.acquire(call_type, tokens, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def charge(self, tokens: int) -> None:
+        """Pay for an extra attempt (a retry or hedge) of an admitted call, without waiting."""
+        with self._cond:
+            now = time.monotonic()
+            if self._requests is not None:
+                self._requests.refill(now)
+                self._requests.level -= 1
+            if self._tokens is not None:
+                self._tokens.refill(now)
+                self._tokens.level -= tokens
+
+    def stats(self) -> Dict:
+        """Get queue depth by priority, concurrency and admission counters."""
+        with self._cond:
+            return {
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'waiting_by_priority': {
+                    priority: sum(len(tickets) for tickets in sessions.values())
+                    for priority, sessions in sorted(self._queues.items())
+                },
+                'waiting_sessions': len(self._waiting_by_session),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out
+            }
+
+    def _new_ticket(self, call_type: str, tokens: int, session_id: Optional[str]) -> _Ticket:
+        if self._tokens is not None:
+            tokens = min(tokens, int(self._tokens.capacity))
+        return _Ticket(
+            call_type,
+            self.priorities.get(call_type, self.default_priority),
+            session_id or _current_session.get() or BACKGROUND,
+            tokens
+        )
+
+    def _time_out(self, ticket: _Ticket) -> None:
+        """Give up on a queued ticket. Caller holds the lock."""
+        self._remove(ticket, rotate=False)
+        self.timed_out += 1
+        LLM_ADMISSION_REJECTED.inc(call_type=ticket.call_type, reason='timeout')
+        raise LLMOverloaded('Timed out waiting for LLM capacity', 503, self._retry_after())
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        """Queue a ticket or refuse it. Caller holds the lock."""
+        reason = None
+        if self._waiting >= self.max_queue:
+            reason, status = 'queue_full', 503
+        elif (ticket.session_id != BACKGROUND
+              and self._waiting_by_session.get(ticket.session_id, 0) >= self.max_queue_per_session):
+            reason, status = 'session_limit', 429
+        if reason:
+            self.rejected += 1
+            LLM_ADMISSION_REJECTED.inc(call_type=ticket.call_type, reason=reason)
+            raise LLMOverloaded('Too many LLM requests queued', status, self._retry_after())
+
+        sessions = self._queues.setdefault(ticket.priority, OrderedDict())
+        tickets = sessions.get(ticket.session_id)
+        if tickets is None:
+            tickets = sessions[ticket.session_id] = deque()
+        tickets.append(ticket)
+        self._waiting += 1
+        self._waiting_by_session[ticket.session_id] = self._waiting_by_session.get(ticket.session_id, 0) + 1
+
+    def _dispatch(self) -> None:
+        """Grant queued tickets in order while capacity lasts. Caller holds the lock."""
+        granted = []
+        now = time.monotonic()
+        for bucket in (self._requests, self._tokens):
+            if bucket is not None:
+                bucket.refill(now)
+
+        while self._in_flight < self.max_concurrent:
+            ticket = self._head()
+            if ticket is None or not self._affordable(ticket):
+                break
+            self._remove(ticket)
+            if self._requests is not None:
+                self._requests.level -= 1
+            if self._tokens is not None:
+                self._tokens.level -= ticket.tokens
+            self._in_flight += 1
+            self.admitted += 1
+            ticket.granted = True
+            granted.append(ticket)
+
+        if granted:
+            self._cond.notify_all()
+            for ticket in granted:
+                if ticket.waker is not None:
+                    ticket.waker()
+
+    def _head(self) -> Optional[_Ticket]:
+        """Next ticket: the highest priority, from the session whose turn it is."""
+        for priority in sorted(self._queues):
+            sessions = self._queues[priority]
+            if sessions:
+                return next(iter(sessions.values()))[0]
+        return None
+
+    def _affordable(self, ticket: _Ticket) -> bool:
+        if self._requests is not None and self._requests.level < 1:
+            return False
+        return self._tokens is None or self._tokens.level >= ticket.tokens
+
+    def _remove(self, ticket: _Ticket, rotate: bool = True) -> None:
+        """Take a ticket out of the queue; after a grant its session goes to the back of the turn order."""
+        sessions = self._queues[ticket.priority]
+        tickets = sessions[ticket.session_id]
+        tickets.remove(ticket)
+        if tickets:
+            if rotate:
+                sessions.move_to_end(ticket.session_id)
+        else:
+            del sessions[ticket.session_id]
+            if not sessions:
+                del self._queues[ticket.priority]
+
+        self._waiting -= 1
+        remaining = self._waiting_by_session[ticket.session_id] - 1
+        if remaining:
+            self._waiting_by_session[ticket.session_id] = remaining
+        else:
+            del self._waiting_by_session[ticket.session_id]
+
+    def _refill_wait(self) -> float:
+        """How long until the head ticket could be paid for; waiters re-check after this."""
+        ticket = self._head()
+        if ticket is None:
+            return 1.0
+        wait = 0.0
+        if self._requests is not None:
+            wait = self._requests.wait_time(1)
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.wait_time(ticket.tokens))
+        if wait <= 0:
+            # Only concurrency is short, and a release dispatches and wakes the waiters
+            return 1.0
+        return min(1.0, max(0.01, wait))
+
+    def _retry_after(self) -> int:
+        """Rough seconds until the queue drains, for the Retry-After header."""
+        per_second = self._requests.rate if self._requests is not None else self.max_concurrent
+        return max(1, min(60, math.ceil((self._waiting + 1) / per_second)))
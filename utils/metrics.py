@@ -0,0 +1,314 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Seconds; covers fast local routes through slow upstream completions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Fold the cells of finished threads into the totals once this many are registered
+MAX_LIVE_CELLS = 64
+
+
+class _Metric:
+    """
+    Base for metrics whose hot path never takes a lock.
+
+    Each thread writes to its own cell (a dict keyed by label values), so updates are plain
+    dict operations on thread-private data. Readers sum the cells; cells of threads that
+    have finished are folded into a shared total so per-request threads don't pile up.
+    """
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Prometheus metric name
+            documentation: HELP text
+            labelnames: Names of the labels, in order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._local = threading.local()
+        self._cells = []  # (thread, cell)
+        self._retired = {}
+        self._lock = threading.Lock()  # only taken when a thread registers and when reading
+
+    def _cell(self) -> Dict:
+        """This thread's private cell, registered on first use."""
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = self._local.cell = {}
+            with self._lock:
+                self._cells.append((threading.current_thread(), cell))
+                if len(self._cells) > MAX_LIVE_CELLS:
+                    self._fold_finished()
+        return cell
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _snapshot(self) -> Dict:
+        """Merge every cell into one dict of label values -> value."""
+        with self._lock:
+            self._fold_finished()
+            merged = {key: self._copy(value) for key, value in self._retired.items()}
+            cells = [dict(cell) for _, cell in self._cells]
+
+        for cell in cells:
+            for key, value in cell.items():
+                if key in merged:
+                    merged[key] = self._merge(merged[key], value)
+                else:
+                    merged[key] = self._copy(value)
+        return merged
+
+    def _fold_finished(self) -> None:
+        """Move the cells of finished threads into the retired totals. Caller holds the lock."""
+        live = []
+        for thread, cell in self._cells:
+            if thread.is_alive():
+                live.append((thread, cell))
+                continue
+            for key, value in cell.items():
+                if key in self._retired:
+                    self._retired[key] = self._merge(self._retired[key], value)
+                else:
+                    self._retired[key] = self._copy(value)
+        self._cells = live
+
+    def _copy(self, value):
+        return value
+
+    def _merge(self, total, value):
+        return total + value
+
+    def render(self) -> List[str]:
+        """Prometheus text lines for this metric."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the count for a label set."""
+        cell = self._cell()
+        key = self._key(labels)
+        cell[key] = cell.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current total for a label set."""
+        return self._snapshot().get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._snapshot().items())
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Prometheus metric name
+            documentation: HELP text
+            labelnames: Names of the labels, in order
+            buckets: Upper bounds of the buckets, ascending; +Inf is implicit
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation for a label set."""
+        cell = self._cell()
+        key = self._key(labels)
+        state = cell.get(key)
+        if state is None:
+            # Per-bucket counts, then the +Inf bucket, the sum and the count
+            state = cell[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def _copy(self, value):
+        return list(value)
+
+    def _merge(self, total, value):
+        return [a + b for a, b in zip(total, value)]
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, state in sorted(self._snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ('le',), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose values are read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Dict], labelnames: Iterable[str] = (),
+                 kind: str = 'gauge'):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Prometheus metric name
+            documentation: HELP text
+            callback: Returns a number, or a dict of label-value tuples -> number
+            labelnames: Names of the labels, in order
+            kind: Prometheus type, 'gauge' or 'counter'
+        """
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+            if value is not None
+        ]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, callback: Callable[[], Dict],
+                 labelnames: Iterable[str] = (), kind: str = 'gauge') -> CallbackMetric:
+        """Register a metric read from a callback, replacing any earlier one with the same name."""
+        return self._register(CallbackMetric(name, documentation, callback, labelnames, kind), replace=True)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            try:
+                samples = metric.render()
+            except Exception as e:
+                print(f"Error collecting metric {metric.name}: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric, replace: bool = False):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and not replace:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    'mockmate_http_request_duration_seconds',
+    'Time to build the response for each route, by method and status',
+    ['route', 'method', 'status']
+)
+LLM_REQUEST_DURATION = registry.histogram(
+    'mockmate_llm_request_duration_seconds',
+    'Upstream chat completion latency by call type and outcome',
+    ['call_type', 'outcome']
+)
+LLM_FIRST_TOKEN = registry.histogram(
+    'mockmate_llm_time_to_first_token_seconds',
+    'Time until the first streamed token by call type',
+    ['call_type']
+)
+LLM_TOKENS = registry.counter(
+    'mockmate_llm_tokens_total',
+    'Tokens used upstream by call type and kind (prompt or completion)',
+    ['call_type', 'kind']
+)
+FALLBACKS = registry.counter(
+    'mockmate_fallbacks_total',
+    'Responses served from a fallback path instead of the AI',
+    ['kind']
+)
+LLM_RETRIES = registry.counter(
+    'mockmate_llm_retries_total',
+    'Upstream attempts retried after a transient error, by call type',
+    ['call_type']
+)
+LLM_HEDGES = registry.counter(
+    'mockmate_llm_hedged_requests_total',
+    'Hedge requests sent for slow completions, and how many finished first',
+    ['call_type', 'result']
+)
+LLM_QUEUE_WAIT = registry.histogram(
+    'mockmate_llm_queue_wait_seconds',
+    'Time LLM calls waited for admission by the scheduler, by call type',
+    ['call_type']
+)
+LLM_ADMISSION_REJECTED = registry.counter(
+    'mockmate_llm_admission_rejected_total',
+    'LLM calls refused by the scheduler, by call type and reason',
+    ['call_type', 'reason']
+)
@@ -0,0 +1,49 @@
+import gzip
+import hashlib
+import threading
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; pages are then served gzipped only
+    brotli = None
+
+
+class CachedPage:
+    """A rendered page with its precompressed variants and strong ETag."""
+
+    __slots__ = ('body', 'encoded', 'etag')
+
+    def __init__(self, html: str):
+        self.body = html.encode('utf-8')
+        self.encoded = {'gzip': gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(self.body, quality=11)
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+
+class PageCache:
+    """
+    Rendered pages that depend on no per-user state, keyed by name.
+
+    Each page is rendered and compressed once, so serving it again is a dictionary
+    lookup. Pages never change while the app runs; restart (or disable the cache
+    in development) to pick up template edits.
+    """
+
+    def __init__(self):
+        self._pages: Dict[str, CachedPage] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        return self._pages.get(key)
+
+    def put(self, key: str, html: str) -> CachedPage:
+        """Cache a rendered page, returning the cached entry."""
+        page = CachedPage(html)
+        with self._lock:
+            # Keep the first copy if another thread rendered the page at the same time
+            return self._pages.setdefault(key, page)
+
+    def __len__(self) -> int:
+        return len(self._pages)
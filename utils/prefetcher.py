@@ -0,0 +1,169 @@
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class QuestionPrefetcher:
+    """Generates each session's likely next question in the background."""
+
+    def __init__(self, generate: Callable[..., str], workers: int, max_in_flight: int,
+                 max_slots: int, wait_timeout: float):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            generate: Question generator with the AIHelper.generate_question signature
+            workers: Number of background worker threads
+            max_in_flight: Per-process cap on queued or running prefetches
+            max_slots: Maximum number of sessions holding a prefetch slot
+            wait_timeout: Seconds to wait for a prefetch that is still running
+        """
+        self._generate = generate
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='question-prefetch')
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._max_slots = max_slots
+        self._wait_timeout = wait_timeout
+
+        self._slots = {}  # session_id -> {(category, difficulty): Future}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def prefetch(self, session_id: str, user_profile: Dict, categories: Iterable[str],
+                 difficulty: str, asked_questions: List[str]) -> None:
+        """
+        Start generating the next question for a session.
+
+        Args:
+            session_id: Session identifier
+            user_profile: User profile information
+            categories: Categories the next question is likely to be requested in
+            difficulty: Difficulty the next question will be asked at
+            asked_questions: Questions already asked in the session
+        """
+        futures = {}
+        profile = dict(user_profile)
+        asked = list(asked_questions)
+
+        for category in categories:
+            if not self._in_flight.acquire(blocking=False):
+                self.skipped += 1
+                break
+
+            try:
+                future = self._executor.submit(self._generate, profile, category, difficulty, asked)
+            except RuntimeError:
+                # Executor is shutting down
+                self._in_flight.release()
+                break
+
+            future.add_done_callback(self._release)
+            futures[(category, difficulty)] = future
+
+        if not futures:
+            return
+
+        with self._lock:
+            stale = self._slots.pop(session_id, {})
+            self._slots[session_id] = futures
+
+            # Drop the oldest slots, e.g. from sessions that were abandoned
+            while len(self._slots) > self._max_slots:
+                oldest = next(iter(self._slots))
+                stale.update(self._slots.pop(oldest))
+
+        self._cancel_futures(stale.values())
+
+    def take(self, session_id: str, category: str, difficulty: str, asked_questions: List[str]) -> Optional[str]:
+        """
+        Claim the prefetched question for a session, if one matches.
+
+        Args:
+            session_id: Session identifier
+            category: Requested question category
+            difficulty: Current session difficulty
+            asked_questions: Questions already asked in the session
+
+        Returns:
+            The prefetched question, or None if there is no usable prefetch
+        """
+        return self._accept(self._result(self._claim(session_id, category, difficulty)), asked_questions)
+
+    async def atake(self, session_id: str, category: str, difficulty: str, asked_questions: List[str]) -> Optional[str]:
+        """Async version of take; waiting for a running prefetch doesn't hold a thread."""
+        future = self._claim(session_id, category, difficulty)
+        question = None
+        if future is not None:
+            try:
+                question = await asyncio.wait_for(asyncio.wrap_future(future), self._wait_timeout)
+            except asyncio.TimeoutError:
+                question = None
+            except asyncio.CancelledError:
+                # A cancelled prefetch is a miss; cancellation of this request propagates
+                if not future.cancelled():
+                    raise
+            except Exception as e:
+                print(f"Error prefetching question: {e}")
+        return self._accept(question, asked_questions)
+
+    def cancel(self, session_id: str) -> None:
+        """Cancel any prefetch work for a session that has ended."""
+        with self._lock:
+            futures = self._slots.pop(session_id, {})
+
+        self._cancel_futures(futures.values())
+
+    def stats(self) -> Dict:
+        """Get prefetch hit/miss counters and the number of sessions holding a slot."""
+        with self._lock:
+            slots = len(self._slots)
+
+        return {
+            'slots': slots,
+            'hits': self.hits,
+            'misses': self.misses,
+            'skipped': self.skipped
+        }
+
+    def _claim(self, session_id: str, category: str, difficulty: str) -> Optional[Future]:
+        """Take the session's prefetch for a category and difficulty, cancelling its others."""
+        with self._lock:
+            futures = self._slots.pop(session_id, {})
+
+        future = futures.pop((category, difficulty), None)
+        self._cancel_futures(futures.values())
+        return future
+
+    def _accept(self, question: Optional[str], asked_questions: List[str]) -> Optional[str]:
+        """Count a claimed prefetch as a hit or a miss, returning it if it is usable."""
+        if not question or question in asked_questions:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return question
+
+    def _result(self, future: Optional[Future]) -> Optional[str]:
+        """Wait for a prefetch to finish and return its question."""
+        if future is None:
+            return None
+
+        try:
+            return future.result(timeout=self._wait_timeout)
+        except (CancelledError, TimeoutError):
+            return None
+        except Exception as e:
+            print(f"Error prefetching question: {e}")
+            return None
+
+    def _cancel_futures(self, futures: Iterable[Future]) -> None:
+        """Cancel prefetches that have not started; running ones finish and are discarded."""
+        for future in futures:
+            future.cancel()
+
+    def _release(self, future: Future) -> None:
+        """Free an in-flight slot once a prefetch completes or is cancelled."""
+        self._in_flight.release()
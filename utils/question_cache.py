@@ -0,0 +1,174 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class QuestionCache:
+    """Bounded pool of generated questions keyed by the normalized question profile."""
+
+    def __init__(self, ttl: int, max_keys: int, max_bytes: int, pool_size: int):
+        """
+        Initialize the question cache.
+
+        Args:
+            ttl: Seconds a cached question stays servable
+            max_keys: Maximum number of profile keys kept
+            max_bytes: Approximate memory cap for all cached questions
+            pool_size: Maximum number of questions kept per key
+        """
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.max_bytes = max_bytes
+        self.pool_size = pool_size
+
+        self._pools = OrderedDict()  # key -> list of (question, created_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(user_profile: Dict, category: str, difficulty: str) -> Tuple[str, ...]:
+        """Build the cache key for a question prompt from the fields it depends on."""
+        fields = (
+            user_profile.get('career_field', 'General'),
+            user_profile.get('experience_level', 'Entry Level'),
+            user_profile.get('target_role', 'General Position'),
+            category,
+            difficulty
+        )
+        return tuple(_normalize(field) for field in fields)
+
+    def get(self, key: Tuple[str, ...], exclude: Iterable[str] = (),
+            accept: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Get a cached question that has not been asked yet.
+
+        Args:
+            key: Cache key from make_key
+            exclude: Questions already asked in the session
+            accept: Optional check a question must also pass, e.g. not being too similar to one already asked;
+                it runs outside the cache lock
+
+        Returns:
+            A cached question, or None on a miss
+        """
+        question = next(
+            (question for question in self._candidates(key, exclude) if accept is None or accept(question)),
+            None
+        )
+        self._record(question is not None)
+        return question
+
+    def serve(self, key: Tuple[str, ...], exclude: Iterable[str] = (),
+              accept: Optional[Callable[[str], bool]] = None) -> Tuple[Optional[str], int]:
+        """
+        Get a cached question that has not been asked yet, and count the others still servable.
+
+        Args:
+            key: Cache key from make_key
+            exclude: Questions already asked in the session
+            accept: Optional check a question must also pass; it runs outside the cache lock, once per question
+
+        Returns:
+            (a cached question or None on a miss, number of other cached questions the session could be served)
+        """
+        accepted = [question for question in self._candidates(key, exclude) if accept is None or accept(question)]
+        self._record(bool(accepted))
+        return (accepted[0] if accepted else None), max(len(accepted) - 1, 0)
+
+    def add(self, key: Tuple[str, ...], questions: List[str]) -> None:
+        """
+        Add freshly generated questions to the pool for a key.
+
+        Args:
+            key: Cache key from make_key
+            questions: Questions to cache
+        """
+        now = time.time()
+
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            self._pools.move_to_end(key)
+            known = {_normalize(question) for question, _ in pool}
+
+            for question in questions:
+                question = question.strip()
+                if not question or _normalize(question) in known:
+                    continue
+                known.add(_normalize(question))
+                pool.append((question, now))
+                self._bytes += sys.getsizeof(question)
+
+            # Keep only the newest questions for this key
+            while len(pool) > self.pool_size:
+                old_question, _ = pool.pop(0)
+                self._bytes -= sys.getsizeof(old_question)
+
+            self._evict()
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'keys': len(self._pools),
+                'questions': sum(len(pool) for pool in self._pools.values()),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+                'evictions': self.evictions
+            }
+
+    def _candidates(self, key: Tuple[str, ...], exclude: Iterable[str]) -> List[str]:
+        """Copy the live questions for a key that are not excluded, marking the key recently used."""
+        excluded = {_normalize(question) for question in exclude}
+
+        with self._lock:
+            pool = self._live_pool(key)
+            if pool is None:
+                return []
+            self._pools.move_to_end(key)
+            return [question for question, _ in pool if _normalize(question) not in excluded]
+
+    def _record(self, hit: bool) -> None:
+        """Count a lookup as a hit or a miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _live_pool(self, key: Tuple[str, ...]) -> Optional[List[Tuple[str, float]]]:
+        """Get the pool for a key with expired questions dropped. Caller holds the lock."""
+        pool = self._pools.get(key)
+        if pool is None:
+            return None
+
+        cutoff = time.time() - self.ttl
+        while pool and pool[0][1] < cutoff:
+            old_question, _ = pool.pop(0)
+            self._bytes -= sys.getsizeof(old_question)
+
+        if not pool:
+            del self._pools[key]
+            return None
+
+        return pool
+
+    def _evict(self) -> None:
+        """Evict least recently used keys until within limits. Caller holds the lock."""
+        while self._pools and (len(self._pools) > self.max_keys or self._bytes > self.max_bytes):
+            _, pool = self._pools.popitem(last=False)
+            self._bytes -= sum(sys.getsizeof(question) for question, _ in pool)
+            self.evictions += 1
+
+
+def _normalize(value) -> str:
+    """Normalize a key field or question for comparison."""
+    return ' '.join(str(value).lower().split())
@@ -0,0 +1,182 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+
+class QuestionIndex:
+    """
+    Incremental TF-IDF index over interview questions with sparse cosine similarity.
+
+    Terms are hashed, so the index never needs refitting; document frequencies are updated
+    as questions are added and removed. Lookups only score questions that share one of the
+    query's rarest terms, found through an inverted index, instead of scanning every question.
+    """
+
+    def __init__(self, max_size: int, n_features: int = 2 ** 18, max_query_terms: int = 8):
+        """
+        Initialize the index.
+
+        Args:
+            max_size: Maximum number of questions kept; the oldest are dropped first
+            n_features: Size of the hashed term space
+            max_query_terms: Number of rarest query terms used to find candidates
+        """
+        self.max_size = max_size
+        self.max_query_terms = max_query_terms
+        self.n_features = n_features
+        self._vectorizer = None
+
+        self._docs = OrderedDict()  # doc id -> (question, {term: count})
+        self._by_text = {}  # normalized question -> doc id
+        self._postings = {}  # term -> set of doc ids
+        self._doc_freq = {}  # term -> number of docs containing it
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def add(self, question: str) -> None:
+        """Add a question to the index, ignoring exact duplicates."""
+        normalized = _normalize(question)
+        if not normalized:
+            return
+
+        terms = self._terms([question])[0]
+        with self._lock:
+            if normalized in self._by_text:
+                return
+
+            doc_id = self._next_id
+            self._next_id += 1
+            self._docs[doc_id] = (question, terms)
+            self._by_text[normalized] = doc_id
+            for term in terms:
+                self._postings.setdefault(term, set()).add(doc_id)
+                self._doc_freq[term] = self._doc_freq.get(term, 0) + 1
+
+            while len(self._docs) > self.max_size:
+                self._remove(next(iter(self._docs)))
+
+    def most_similar(self, text: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """
+        Find the indexed questions most similar to a text.
+
+        Args:
+            text: Text to look up
+            k: Maximum number of results
+            min_score: Minimum cosine similarity to include
+
+        Returns:
+            List of (question, similarity) pairs, most similar first
+        """
+        query = self._terms([text])[0]
+
+        with self._lock:
+            query_vector = self._weigh(query)
+            if not query_vector:
+                return []
+
+            # Candidates share at least one of the query's most distinctive terms
+            rare_terms = sorted(query_vector, key=query_vector.get, reverse=True)[:self.max_query_terms]
+            candidates = set()
+            for term in rare_terms:
+                candidates.update(self._postings.get(term, ()))
+
+            results = []
+            for doc_id in candidates:
+                question, terms = self._docs[doc_id]
+                score = _cosine(query_vector, self._weigh(terms))
+                if score >= min_score:
+                    results.append((question, score))
+
+        results.sort(key=lambda item: item[1], reverse=True)
+        return [(question, round(score, 4)) for question, score in results[:k]]
+
+    def max_similarity(self, text: str, others: Iterable[str]) -> float:
+        """
+        Highest cosine similarity between a text and a small set of other texts.
+
+        Used for per-session checks; the global document frequencies supply the IDF weights.
+
+        Args:
+            text: Candidate text
+            others: Texts to compare against, e.g. the session's asked questions
+
+        Returns:
+            Highest similarity, or 0 if there is nothing to compare
+        """
+        others = [other for other in others if other]
+        if not others or not text:
+            return 0.0
+        if _normalize(text) in {_normalize(other) for other in others}:
+            return 1.0
+
+        all_terms = self._terms([text] + others)
+        with self._lock:
+            query_vector = self._weigh(all_terms[0])
+            if not query_vector:
+                return 0.0
+            return max(_cosine(query_vector, self._weigh(terms)) for terms in all_terms[1:])
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def vectorizer(self):
+        """Term vectorizer, built on first use so scikit-learn isn't loaded at startup."""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                stop_words='english',
+                alternate_sign=False,
+                norm=None
+            )
+        return self._vectorizer
+
+    def _terms(self, texts: List[str]) -> List[Dict[int, float]]:
+        """Hash texts into sparse term-count dictionaries."""
+        matrix = self.vectorizer.transform(texts).tocsr()
+        return [
+            dict(zip(matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]],
+                     matrix.data[matrix.indptr[row]:matrix.indptr[row + 1]]))
+            for row in range(matrix.shape[0])
+        ]
+
+    def _weigh(self, terms: Dict[int, float]) -> Dict[int, float]:
+        """Apply sublinear TF and smoothed IDF weights. Caller holds the lock."""
+        total = len(self._docs)
+        return {
+            term: (1 + math.log(count)) * (math.log((1 + total) / (1 + self._doc_freq.get(term, 0))) + 1)
+            for term, count in terms.items()
+        }
+
+    def _remove(self, doc_id: int) -> None:
+        """Drop a question from the index. Caller holds the lock."""
+        question, terms = self._docs.pop(doc_id)
+        self._by_text.pop(_normalize(question), None)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[term]
+            self._doc_freq[term] -= 1
+            if self._doc_freq[term] <= 0:
+                del self._doc_freq[term]
+
+
+def _cosine(left: Dict[int, float], right: Dict[int, float]) -> float:
+    """Cosine similarity of two sparse vectors."""
+    if len(left) > len(right):
+        left, right = right, left
+    dot = sum(weight * right.get(term, 0.0) for term, weight in left.items())
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(w * w for w in left.values())) * math.sqrt(sum(w * w for w in right.values()))
+    return dot / norm if norm else 0.0
+
+
+def _normalize(text: str) -> str:
+    """Normalize a question for exact-duplicate detection."""
+    return ' '.join(str(text).lower().split())
@@ -0,0 +1,232 @@
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call runs past its overall deadline."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a sliding window of recent calls.
+
+    The circuit opens when too many of the last calls failed or were slow, so callers fail
+    fast to their fallbacks instead of queueing behind a struggling upstream. After a
+    cooldown a few trial calls are let through (half-open); if they succeed the circuit
+    closes again, otherwise it reopens.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, window: int, min_calls: int, failure_rate: float, slow_rate: float,
+                 open_seconds: float, half_open_calls: int):
+        """
+        Initialize the breaker.
+
+        Args:
+            window: Number of recent calls considered
+            min_calls: Calls needed in the window before the breaker can open
+            failure_rate: Fraction of failed calls that opens the circuit
+            slow_rate: Fraction of slow calls that opens the circuit
+            open_seconds: Cooldown before trial calls are allowed
+            half_open_calls: Trial calls allowed while half-open
+        """
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._calls = deque(maxlen=window)  # (failed, slow) per call
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cooldown has passed."""
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> None:
+        """
+        Admit a call or fail fast.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all trial calls taken
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return
+            self.rejected += 1
+        raise CircuitOpenError('LLM circuit breaker is open')
+
+    def record(self, failed: bool, slow: bool = False) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            failed: Whether the call failed in a way that points at the upstream
+            slow: Whether the call succeeded but took too long
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                return
+            if state == self.OPEN:
+                return
+
+            self._calls.append((failed, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failures = sum(1 for call_failed, _ in self._calls if call_failed)
+            slow_calls = sum(1 for _, call_slow in self._calls if call_slow)
+            if failures >= self.failure_rate * len(self._calls) or slow_calls >= self.slow_rate * len(self._calls):
+                self._open()
+
+    def stats(self) -> Dict:
+        """Get the breaker state and window counts."""
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'window_calls': len(self._calls),
+                'window_failures': sum(1 for failed, _ in self._calls if failed),
+                'window_slow': sum(1 for _, slow in self._calls if slow),
+                'opened': self.opened,
+                'rejected': self.rejected
+            }
+
+    def _current_state(self) -> str:
+        """Caller holds the lock."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+        return self._state
+
+    def _open(self) -> None:
+        """Caller holds the lock."""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self.opened += 1
+
+
+class LatencyTracker:
+    """Recent successful call latencies per call type, for picking hedge delays."""
+
+    def __init__(self, window: int = 200):
+        self._window = window
+        self._samples = {}  # call_type -> deque of seconds
+        self._lock = threading.Lock()
+
+    def observe(self, call_type: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(call_type)
+            if samples is None:
+                samples = self._samples[call_type] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def percentile(self, call_type: str, fraction: float, min_samples: int) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            call_type: Kind of call
+            fraction: Percentile as a fraction, e.g. 0.95
+            min_samples: Samples needed before an estimate is returned
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(call_type, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an upstream error is transient and worth retrying; these also count against the breaker."""
+    import openai
+
+    if isinstance(error, (openai.APIConnectionError, DeadlineExceeded)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUSES
+    return False
+
+
+def retry_delay(attempt: int, error: Exception, base: float, cap: float) -> float:
+    """
+    Delay before the next attempt: the server's Retry-After if it sent one, else full-jitter backoff.
+
+    Args:
+        attempt: Number of attempts made so far, starting at 1
+        error: Error from the last attempt
+        base: Backoff base in seconds
+        cap: Largest backoff in seconds
+
+    Returns:
+        Seconds to wait
+    """
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Parse Retry-After (seconds or an HTTP date) or retry-after-ms from an error response."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    milliseconds = headers.get('retry-after-ms')
+    if milliseconds:
+        try:
+            return max(0.0, float(milliseconds) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Change names published with each new session version
+QUESTION = 'question'
+RESPONSE = 'response'
+DIFFICULTY = 'difficulty'
+ENDED = 'ended'
+
+
+class _Channel:
+    __slots__ = ('version', 'changes', 'closed', 'subscribers', 'changed', 'wakers')
+
+    def __init__(self, history: int):
+        self.version = None  # unknown until the first publish
+        self.changes = deque(maxlen=history)  # (version, [change names])
+        self.closed = False
+        self.subscribers = 0
+        self.changed = threading.Condition()
+        self.wakers = set()  # callbacks waking async waiters, which don't wait on the condition
+
+    def newer_than(self, version: int) -> bool:
+        """Whether a waiter that has seen the given version should wake. Caller holds changed."""
+        return self.closed or (self.version is not None and self.version > version)
+
+    def wake(self) -> None:
+        """Wake every waiter. Caller holds changed."""
+        self.changed.notify_all()
+        for wake in list(self.wakers):
+            wake()
+
+
+class SessionEvents:
+    """
+    In-process notifications of session changes, for the session event stream.
+
+    Channels exist only while someone is subscribed, so publishing a change to a session
+    nobody is watching costs one dictionary lookup. A subscriber that misses changes (for
+    example ones made by another worker process) is expected to re-read the session version
+    from the store after each wait; the wait just lets it sleep until something happens.
+    """
+
+    def __init__(self, history: int = 16):
+        """
+        Initialize the notifier.
+
+        Args:
+            history: Recent changes remembered per watched session
+        """
+        self._history = history
+        self._channels = {}  # session_id -> _Channel
+        self._lock = threading.Lock()
+
+    def publish(self, session_id: str, version: int, changes: List[str]) -> None:
+        """
+        Announce a new session version.
+
+        Args:
+            session_id: Session identifier
+            version: The session's version after the change
+            changes: Names of what changed
+        """
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return
+        with channel.changed:
+            channel.version = version
+            channel.changes.append((version, list(changes)))
+            channel.wake()
+
+    def close(self, session_id: str) -> None:
+        """Announce that a session was deleted, waking its subscribers."""
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return
+        with channel.changed:
+            channel.closed = True
+            channel.wake()
+
+    def subscribe(self, session_id: str) -> None:
+        """Start watching a session; pair with unsubscribe."""
+        with self._lock:
+            channel = self._channels.get(session_id)
+            if channel is None:
+                channel = self._channels[session_id] = _Channel(self._history)
+            channel.subscribers += 1
+
+    def unsubscribe(self, session_id: str) -> None:
+        with self._lock:
+            channel = self._channels.get(session_id)
+            if channel is None:
+                return
+            channel.subscribers -= 1
+            if channel.subscribers <= 0:
+                del self._channels[session_id]
+
+    def wait(self, session_id: str, version: int, timeout: float) -> Optional[int]:
+        """
+        Block until a version newer than the given one is published, the session is closed
+        or the timeout passes.
+
+        Args:
+            session_id: A subscribed session
+            version: Version the caller has seen
+            timeout: Seconds to wait
+
+        Returns:
+            The newest published version, or None if nothing has been published yet
+        """
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return None
+        with channel.changed:
+            channel.changed.wait_for(lambda: channel.newer_than(version), timeout)
+            return channel.version
+
+    async def await_change(self, session_id: str, version: int, timeout: float) -> Optional[int]:
+        """Async version of wait; the wait is a future on the event loop, so it holds no thread."""
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        changed = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(lambda: changed.done() or changed.set_result(None))
+            except RuntimeError:
+                # The loop has closed; nobody is waiting any more
+                pass
+
+        with channel.changed:
+            if channel.newer_than(version):
+                return channel.version
+            channel.wakers.add(wake)
+        try:
+            await asyncio.wait_for(changed, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with channel.changed:
+                channel.wakers.discard(wake)
+        return channel.version
+
+    def changes_since(self, session_id: str, version: int) -> List[str]:
+        """
+        Get what changed after a version, as far as the recent history goes.
+
+        Args:
+            session_id: A subscribed session
+            version: Version the caller has seen
+
+        Returns:
+            Change names in the order they first happened; empty if none are known
+        """
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return []
+        names = []
+        with channel.changed:
+            for seen, changed in channel.changes:
+                if seen <= version:
+                    continue
+                for name in changed:
+                    if name not in names:
+                        names.append(name)
+        return names
+
+    def stats(self) -> Dict:
+        """Get the number of watched sessions and open subscriptions."""
+        with self._lock:
+            return {
+                'watched_sessions': len(self._channels),
+                'subscribers': sum(channel.subscribers for channel in self._channels.values())
+            }
@@ -1,15 +1,37 @@
 import time
 import json
+import threading
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+from config import Config
+from utils.session_events import DIFFICULTY, ENDED, QUESTION, RESPONSE, SessionEvents
+from utils.session_store import SessionStore, create_session_store
 
 class SessionManager:
     """Manages user sessions and interview progress."""
     
-    def __init__(self):
-        """Initialize the session manager."""
-        self.sessions = {}
-        self.session_timeout = 3600  # 1 hour
+    # Change published when a session field is updated directly
+    FIELD_CHANGES = {'session_complete': ENDED, 'difficulty_level': DIFFICULTY, 'current_question': QUESTION}
+    
+    def __init__(self, store: Optional[SessionStore] = None):
+        """
+        Initialize the session manager.
+        
+        Args:
+            store: Storage backend, defaults to the one selected by Config.SESSION_STORE
+        """
+        self.store = store or create_session_store()
+        self.events = SessionEvents()
+        self.exporter = None  # optional AnalyticsExporter receiving every recorded response
+        self.session_timeout = Config.SESSION_TIMEOUT
+        self.max_sessions = Config.SESSION_MAX_COUNT
+        
+        self.expired_evictions = 0
+        self.pressure_evictions = 0
+        
+        self._reaper = None
+        self._reaper_stop = threading.Event()
+        self._stats_lock = threading.Lock()
     
     def create_session(self, user_profile: Dict) -> str:
         """
@@ -24,7 +46,14 @@ class SessionManager:
         import uuid
         session_id = str(uuid.uuid4())
         
-        self.sessions[session_id] = {
+        # Make room by evicting the least recently active sessions
+        overflow = self.store.count() - self.max_sessions + 1
+        if overflow > 0:
+            evicted = len(self.store.evict_oldest(overflow))
+            with self._stats_lock:
+                self.pressure_evictions += evicted
+        
+        self.store.put(session_id, {
             'user_profile': user_profile,
             'created_at': datetime.now(),
             'last_activity': datetime.now(),
@@ -34,8 +63,10 @@ class SessionManager:
             'scores': [],
             'categories_covered': set(),
             'difficulty_level': 'beginner',
-            'session_complete': False
-        }
+            'session_complete': False,
+            'stats': self._new_stats(),
+            'version': 0
+        })
         
         return session_id
     
@@ -49,19 +80,7 @@ class SessionManager:
         Returns:
             Session data or None if not found/expired
         """
-        if session_id not in self.sessions:
-            return None
-        
-        session = self.sessions[session_id]
-        
-        # Check if session has expired
-        if self._is_session_expired(session):
-            self.delete_session(session_id)
-            return None
-        
-        # Update last activity
-        session['last_activity'] = datetime.now()
-        return session
+        return self._get_active_session(session_id)
     
     def update_session(self, session_id: str, updates: Dict) -> bool:
         """
@@ -74,19 +93,53 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        if session_id not in self.sessions:
+        written = {}
+        
+        def change(session):
+            fields = {key: value for key, value in updates.items() if key in session and key != 'version'}
+            changes = [self.FIELD_CHANGES.get(key, key) for key in fields if session[key] != fields[key]]
+            if changes:
+                fields['version'] = session.get('version', 0) + 1
+            fields['last_activity'] = datetime.now()
+            written.update(version=fields.get('version'), changes=changes)
+            return fields, None
+        
+        if not self.store.mutate(session_id, change):
             return False
+        if written['changes']:
+            self.events.publish(session_id, written['version'], written['changes'])
+        return True
+    
+    def record_question(self, session_id: str, question: str, category: str) -> bool:
+        """
+        Set the current question and mark its category as covered.
         
-        session = self.sessions[session_id]
+        Args:
+            session_id: Session identifier
+            question: The question being asked
+            category: Question category
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        written = {}
         
-        for key, value in updates.items():
-            if key in session:
-                session[key] = value
+        def change(session):
+            written['version'] = session.get('version', 0) + 1
+            return {
+                'current_question': question,
+                'categories_covered': session['categories_covered'].union([category]),
+                'last_activity': datetime.now(),
+                'version': written['version']
+            }, None
         
-        session['last_activity'] = datetime.now()
+        if not self.store.mutate(session_id, change):
+            return False
+        self.events.publish(session_id, written['version'], [QUESTION])
         return True
     
-    def add_response(self, session_id: str, question: str, response: str, evaluation: Dict) -> bool:
+    def add_response(self, session_id: str, question: str, response: str, evaluation: Dict,
+                     category: Optional[str] = None, idempotency_key: Optional[str] = None) -> bool:
         """
         Add a response to the session.
         
@@ -95,32 +148,83 @@ class SessionManager:
             question: The question that was asked
             response: User's response
             evaluation: AI evaluation of the response
+            category: Question category, used for per-category statistics
+            idempotency_key: Client key for this submission; a retry with the same key is not recorded twice
             
         Returns:
             True if successful, False otherwise
         """
-        if session_id not in self.sessions:
-            return False
+        written = {}
         
-        session = self.sessions[session_id]
-        
-        response_data = {
-            'question': question,
-            'response': response,
-            'evaluation': evaluation,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        session['responses'].append(response_data)
-        session['scores'].append(evaluation.get('score', 5))
-        session['questions_asked'] += 1
-        session['last_activity'] = datetime.now()
-        
-        # Update difficulty based on performance
-        self._adjust_difficulty(session)
+        def change(session):
+            score = self._as_score(evaluation.get('score', 5))
+            difficulty = session['difficulty_level']
+            
+            response_data = {
+                'question': question,
+                'response': response,
+                'evaluation': evaluation,
+                'category': category or 'general',
+                'difficulty': difficulty,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            session['scores'].append(score)
+            session['questions_asked'] += 1
+            session['last_activity'] = datetime.now()
+            
+            # Maintain running aggregates so summaries never rescan the history
+            stats = session.setdefault('stats', self._new_stats())
+            self._record_score(stats, response_data['category'], difficulty, score)
+            
+            # Update difficulty based on performance
+            self._adjust_difficulty(session)
+            changes = [RESPONSE]
+            if session['difficulty_level'] != difficulty:
+                changes.append(DIFFICULTY)
+            
+            # Only the new response and the changed counters are written back
+            fields = {
+                'scores': list(session['scores']),
+                'questions_asked': session['questions_asked'],
+                'difficulty_level': session['difficulty_level'],
+                'last_activity': session['last_activity'],
+                'stats': stats,
+                'version': session.get('version', 0) + 1
+            }
+            written.update(profile=session.get('user_profile'), fields=fields, response_data=response_data,
+                           score=score, changes=changes)
+            return fields, response_data
         
+        # The store skips the change if the key was already recorded, even by another process
+        if not self.store.mutate(session_id, change, idempotency_key):
+            return False
+        if not written:
+            # A retry of a submission that was already recorded
+            return True
+        fields = written['fields']
+        self.events.publish(session_id, fields['version'], written['changes'])
+        if self.exporter is not None:
+            self._export_response(session_id, written['profile'], fields, written['response_data'], written['score'])
         return True
     
+    def get_submission(self, session_id: str, idempotency_key: str) -> Optional[Dict]:
+        """
+        Get the response recorded for an earlier submission.
+        
+        Args:
+            session_id: Session identifier
+            idempotency_key: Client key sent with the submission
+            
+        Returns:
+            The stored response data, or None if the key has not been seen
+        """
+        if not idempotency_key:
+            return None
+        if not self._get_active_session(session_id, include_responses=False):
+            return None
+        return self.store.get_submission(session_id, idempotency_key)
+    
     def get_session_summary(self, session_id: str) -> Optional[Dict]:
         """
         Get a summary of the session.
@@ -131,20 +235,98 @@ class SessionManager:
         Returns:
             Session summary or None if not found
         """
-        session = self.get_session(session_id)
+        session = self._get_active_session(session_id, include_responses=False)
         if not session:
             return None
         
-        scores = session['scores']
-        avg_score = sum(scores) / len(scores) if scores else 0
+        stats = session.get('stats') or self._new_stats()
+        recent = self.store.get_responses(
+            session_id,
+            max(0, session['questions_asked'] - Config.SUMMARY_RECENT_RESPONSES),
+            Config.SUMMARY_RECENT_RESPONSES
+        )
         
         return {
             'total_questions': session['questions_asked'],
-            'average_score': round(avg_score, 2),
+            'average_score': self._average(stats),
+            'min_score': stats['min'],
+            'max_score': stats['max'],
+            'category_scores': {key: self._describe(value) for key, value in stats['by_category'].items()},
+            'difficulty_scores': {key: self._describe(value) for key, value in stats['by_difficulty'].items()},
             'categories_covered': list(session['categories_covered']),
             'difficulty_level': session['difficulty_level'],
             'session_duration': self._get_session_duration(session),
-            'responses': session['responses']
+            'recent_responses': [
+                {
+                    'question': item['question'][:100],
+                    'response': item['response'][:100],
+                    'score': item['evaluation'].get('score')
+                }
+                for item in recent
+            ]
+        }
+    
+    def get_session_version(self, session_id: str) -> Optional[int]:
+        """
+        Get the session's change counter without counting the lookup as activity.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Version that increases with every change, or None if not found/expired/complete
+        """
+        session = self.store.get(session_id, include_responses=False)
+        if session is None or session['session_complete'] or self._is_session_expired(session):
+            return None
+        return session.get('version', 0)
+    
+    def get_summary_etag(self, session_id: str) -> Optional[str]:
+        """
+        Get a validator for the session summary, which changes whenever the summary would.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            ETag value, or None if not found
+        """
+        # A read only: revalidating an unchanged summary mustn't cost a write on SQLite
+        session = self.store.get(session_id, include_responses=False)
+        if session is None or self._is_session_expired(session):
+            return None
+        # The duration is part of the summary, so a new minute is a new representation
+        return f"{session.get('version', 0)}-{self._get_session_duration(session)}"
+    
+    def get_responses(self, session_id: str, cursor: Optional[str] = None, limit: int = 20) -> Optional[Dict]:
+        """
+        Get one page of a session's response history.
+        
+        Args:
+            session_id: Session identifier
+            cursor: Opaque cursor from a previous page, or None for the first page
+            limit: Maximum number of responses to return
+            
+        Returns:
+            Dictionary with 'responses', 'next_cursor' and 'total', or None if not found
+        """
+        session = self._get_active_session(session_id, include_responses=False)
+        if not session:
+            return None
+        
+        try:
+            offset = max(0, int(cursor)) if cursor else 0
+        except ValueError:
+            offset = 0
+        limit = max(1, min(limit, Config.RESPONSES_PAGE_MAX))
+        
+        responses = self.store.get_responses(session_id, offset, limit)
+        next_offset = offset + len(responses)
+        
+        return {
+            'responses': responses,
+            'next_cursor': str(next_offset) if next_offset < session['questions_asked'] else None,
+            'total': session['questions_asked']
         }
     
     def delete_session(self, session_id: str) -> bool:
@@ -157,10 +339,9 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        deleted = self.store.delete(session_id)
+        self.events.close(session_id)
+        return deleted
     
     def cleanup_expired_sessions(self) -> int:
         """
@@ -169,16 +350,145 @@ class SessionManager:
         Returns:
             Number of sessions cleaned up
         """
-        expired_sessions = []
+        cleaned = 0
+        while True:
+            evicted = self.evict_expired_batch(Config.SESSION_REAPER_BATCH)
+            cleaned += evicted
+            if evicted < Config.SESSION_REAPER_BATCH:
+                return cleaned
+    
+    def evict_expired_batch(self, limit: int) -> int:
+        """
+        Evict up to limit expired sessions, oldest first.
+        
+        Args:
+            limit: Maximum number of sessions to evict
+            
+        Returns:
+            Number of sessions evicted
+        """
+        cutoff = datetime.now() - timedelta(seconds=self.session_timeout)
+        evicted = len(self.store.evict_expired(cutoff, limit))
+        with self._stats_lock:
+            self.expired_evictions += evicted
+        return evicted
+    
+    def start_reaper(self, interval: float = None) -> None:
+        """
+        Start a background thread that evicts expired sessions in small batches.
         
-        for session_id, session in self.sessions.items():
-            if self._is_session_expired(session):
-                expired_sessions.append(session_id)
+        Args:
+            interval: Seconds between sweeps, defaults to Config.SESSION_REAPER_INTERVAL
+        """
+        if self._reaper is not None and self._reaper.is_alive():
+            return
         
-        for session_id in expired_sessions:
-            self.delete_session(session_id)
+        interval = interval or Config.SESSION_REAPER_INTERVAL
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(target=self._reap, args=(interval,), name='session-reaper', daemon=True)
+        self._reaper.start()
+    
+    def stop_reaper(self) -> None:
+        """Stop the background reaper thread."""
+        self._reaper_stop.set()
+        if self._reaper is not None:
+            self._reaper.join()
+            self._reaper = None
+    
+    def get_stats(self) -> Dict:
+        """Get current session count and eviction counters."""
+        return {
+            'active_sessions': self.store.count(),
+            'max_sessions': self.max_sessions,
+            'expired_evictions': self.expired_evictions,
+            'pressure_evictions': self.pressure_evictions
+        }
+    
+    def _reap(self, interval: float) -> None:
+        """Reaper loop: evict expired sessions without holding the store for long."""
+        while not self._reaper_stop.wait(interval):
+            try:
+                while self.evict_expired_batch(Config.SESSION_REAPER_BATCH) == Config.SESSION_REAPER_BATCH:
+                    # Let request threads in between batches
+                    time.sleep(0)
+            except Exception as e:
+                print(f"Error reaping expired sessions: {e}")
+    
+    def _export_response(self, session_id: str, profile: Optional[Dict], fields: Dict, response_data: Dict,
+                         score: float) -> None:
+        """Queue a recorded response for the analytics export, without the question and answer text."""
+        profile = profile or {}
+        self.exporter.record({
+            'session_id': session_id,
+            'recorded_at': fields['last_activity'],
+            'question_number': fields['questions_asked'],
+            'score': score,
+            'response_words': len(response_data['response'].split()),
+            'target_role': profile.get('target_role') or None,
+            'career_field': profile.get('career_field') or None,
+            'experience_level': profile.get('experience_level') or None,
+            'interview_type': profile.get('interview_type') or None,
+            'category': response_data['category'],
+            'difficulty': response_data['difficulty']
+        })
+    
+    def _get_active_session(self, session_id: str, include_responses: bool = True) -> Optional[Dict]:
+        """Load a session, dropping it if expired and recording the activity otherwise."""
+        session = self.store.get(session_id, include_responses=include_responses)
+        if session is None:
+            return None
         
-        return len(expired_sessions)
+        # Check if session has expired
+        if self._is_session_expired(session):
+            if self.delete_session(session_id):
+                with self._stats_lock:
+                    self.expired_evictions += 1
+            return None
+        
+        # Update last activity; the store does it under its own lock, since the memory store
+        # hands back its live record
+        self.store.touch(session_id, datetime.now())
+        return session
+    
+    @staticmethod
+    def _new_stats() -> Dict:
+        """Empty running score aggregates."""
+        return {'count': 0, 'sum': 0, 'min': None, 'max': None, 'by_category': {}, 'by_difficulty': {}}
+    
+    @staticmethod
+    def _as_score(value) -> float:
+        """Coerce an evaluation score to a number, defaulting unparseable scores to 5."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 5.0
+    
+    def _record_score(self, stats: Dict, category: str, difficulty: str, score: float) -> None:
+        """Fold one score into the overall, per-category and per-difficulty aggregates."""
+        buckets = [
+            stats,
+            stats['by_category'].setdefault(category, {'count': 0, 'sum': 0, 'min': None, 'max': None}),
+            stats['by_difficulty'].setdefault(difficulty, {'count': 0, 'sum': 0, 'min': None, 'max': None})
+        ]
+        for bucket in buckets:
+            bucket['count'] += 1
+            bucket['sum'] += score
+            bucket['min'] = score if bucket['min'] is None else min(bucket['min'], score)
+            bucket['max'] = score if bucket['max'] is None else max(bucket['max'], score)
+    
+    @staticmethod
+    def _average(bucket: Dict) -> float:
+        """Average score of an aggregate bucket."""
+        return round(bucket['sum'] / bucket['count'], 2) if bucket['count'] else 0
+    
+    def _describe(self, bucket: Dict) -> Dict:
+        """Public view of an aggregate bucket."""
+        return {
+            'count': bucket['count'],
+            'average': self._average(bucket),
+            'min': bucket['min'],
+            'max': bucket['max']
+        }
     
     def _is_session_expired(self, session: Dict) -> bool:
         """Check if a session has expired."""
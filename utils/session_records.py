@@ -0,0 +1,310 @@
+import sys
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Dict, Iterator
+
+from config import Config
+
+CATEGORY_CODES = {name: code for code, name in enumerate(Config.INTERVIEW_CATEGORIES)}
+DIFFICULTY_CODES = {name: code for code, name in enumerate(Config.DIFFICULTY_LEVELS)}
+
+# Short strings that repeat across evaluations (fallback text, list items) are interned
+INTERN_MAX_LENGTH = 200
+
+
+class ResponseRecord(MutableMapping):
+    """Compact stored response that still reads and writes like the original response dict."""
+
+    __slots__ = ('_question', '_response', '_evaluation', '_category', '_difficulty', '_timestamp')
+
+    KEYS = ('question', 'response', 'evaluation', 'category', 'difficulty', 'timestamp')
+
+    def __init__(self, question: str, response: str, evaluation: Dict, category: str = None,
+                 difficulty: str = None, timestamp: float = None):
+        """
+        Initialize the record.
+
+        Args:
+            question: The question that was asked
+            response: User's response
+            evaluation: Evaluation of the response
+            category: Question category
+            difficulty: Difficulty the question was asked at
+            timestamp: Epoch seconds when the response was recorded
+        """
+        self._question = _intern(question)
+        self._response = response
+        self._evaluation = _intern_evaluation(evaluation)
+        self._category = encode_category(category)
+        self._difficulty = encode_difficulty(difficulty)
+        self._timestamp = timestamp
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ResponseRecord':
+        """Build a record from a response dict."""
+        timestamp = data.get('timestamp')
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        return cls(data['question'], data['response'], data['evaluation'],
+                   data.get('category'), data.get('difficulty'), timestamp)
+
+    def to_dict(self) -> Dict:
+        """Convert back to a plain response dict."""
+        return {key: self[key] for key in self.KEYS if self[key] is not None}
+
+    def __getitem__(self, key: str):
+        if key == 'question':
+            return self._question
+        if key == 'response':
+            return self._response
+        if key == 'evaluation':
+            return self._evaluation
+        if key == 'category':
+            return decode_category(self._category)
+        if key == 'difficulty':
+            return decode_difficulty(self._difficulty)
+        if key == 'timestamp':
+            return datetime.fromtimestamp(self._timestamp).isoformat() if self._timestamp is not None else None
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == 'question':
+            self._question = _intern(value)
+        elif key == 'response':
+            self._response = value
+        elif key == 'evaluation':
+            self._evaluation = _intern_evaluation(value)
+        elif key == 'category':
+            self._category = encode_category(value)
+        elif key == 'difficulty':
+            self._difficulty = encode_difficulty(value)
+        elif key == 'timestamp':
+            self._timestamp = datetime.fromisoformat(value).timestamp() if isinstance(value, str) else value
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError('Response fields cannot be deleted')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+
+class SessionRecord(MutableMapping):
+    """
+    Compact in-memory session that still reads and writes like the original session dict.
+
+    Timestamps are stored as epoch floats, the difficulty as a small int, covered categories
+    as a bitmask over Config.INTERVIEW_CATEGORIES and scores as a double array. Reading a key
+    converts back to the dict representation (datetimes, a set, a difficulty name).
+    """
+
+    __slots__ = (
+        '_user_profile', '_created_at', '_last_activity', '_questions_asked', '_current_question',
+        '_responses', '_scores', '_categories', '_extra_categories', '_difficulty', '_complete', '_stats',
+        '_submissions', '_version'
+    )
+
+    KEYS = (
+        'user_profile', 'created_at', 'last_activity', 'questions_asked', 'current_question', 'responses',
+        'scores', 'categories_covered', 'difficulty_level', 'session_complete', 'stats',
+        'submissions', 'version'
+    )
+    OPTIONAL_KEYS = ('stats', 'submissions')  # absent until first set
+
+    def __init__(self):
+        """Initialize an empty record; use from_dict to populate it."""
+        self._user_profile = {}
+        self._created_at = 0.0
+        self._last_activity = 0.0
+        self._questions_asked = 0
+        self._current_question = None
+        self._responses = []
+        self._scores = array('d')
+        self._categories = 0
+        self._extra_categories = None
+        self._difficulty = 0
+        self._complete = False
+        self._stats = None
+        self._submissions = None
+        self._version = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SessionRecord':
+        """Build a record from a session dict."""
+        record = cls()
+        for key in cls.KEYS:
+            if key in data:
+                record[key] = data[key]
+        return record
+
+    def to_dict(self) -> Dict:
+        """Convert back to a plain session dict, with responses as plain dicts."""
+        data = {key: self[key] for key in self}
+        data['responses'] = [response.to_dict() for response in self._responses]
+        data['scores'] = list(self._scores)
+        return data
+
+    @property
+    def last_activity_ts(self) -> float:
+        """Last activity as epoch seconds, without building a datetime."""
+        return self._last_activity
+
+    def __getitem__(self, key: str):
+        if key == 'user_profile':
+            return self._user_profile
+        if key == 'created_at':
+            return datetime.fromtimestamp(self._created_at)
+        if key == 'last_activity':
+            return datetime.fromtimestamp(self._last_activity)
+        if key == 'questions_asked':
+            return self._questions_asked
+        if key == 'current_question':
+            return self._current_question
+        if key == 'responses':
+            return self._responses
+        if key == 'scores':
+            return self._scores
+        if key == 'categories_covered':
+            return self._decode_categories()
+        if key == 'difficulty_level':
+            return decode_difficulty(self._difficulty)
+        if key == 'session_complete':
+            return self._complete
+        if key == 'stats':
+            if self._stats is None:
+                raise KeyError(key)
+            return self._stats
+        if key == 'submissions':
+            if self._submissions is None:
+                raise KeyError(key)
+            return self._submissions
+        if key == 'version':
+            return self._version
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == 'user_profile':
+            self._user_profile = {name: _intern(field) for name, field in value.items()}
+        elif key == 'created_at':
+            self._created_at = _as_timestamp(value)
+        elif key == 'last_activity':
+            self._last_activity = _as_timestamp(value)
+        elif key == 'questions_asked':
+            self._questions_asked = value
+        elif key == 'current_question':
+            self._current_question = _intern(value)
+        elif key == 'responses':
+            self._responses = [
+                response if isinstance(response, ResponseRecord) else ResponseRecord.from_dict(response)
+                for response in value
+            ]
+        elif key == 'scores':
+            self._scores = value if isinstance(value, array) and value.typecode == 'd' else array('d', value)
+        elif key == 'categories_covered':
+            self._encode_categories(value)
+        elif key == 'difficulty_level':
+            self._difficulty = encode_difficulty(value)
+        elif key == 'session_complete':
+            self._complete = bool(value)
+        elif key == 'stats':
+            self._stats = value
+        elif key == 'submissions':
+            self._submissions = value
+        elif key == 'version':
+            self._version = value
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError('Session fields cannot be deleted')
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self.KEYS if key not in self.OPTIONAL_KEYS or self._is_set(key))
+
+    def __len__(self) -> int:
+        return len(self.KEYS) - sum(not self._is_set(key) for key in self.OPTIONAL_KEYS)
+
+    def _is_set(self, key: str) -> bool:
+        """Whether an optional field has been set."""
+        return getattr(self, '_' + key) is not None
+
+    def _encode_categories(self, categories) -> None:
+        """Store known categories as a bitmask and keep any others aside."""
+        mask = 0
+        extra = []
+        for category in categories:
+            code = CATEGORY_CODES.get(category)
+            if code is None:
+                extra.append(_intern(category))
+            else:
+                mask |= 1 << code
+        self._categories = mask
+        self._extra_categories = tuple(extra) or None
+
+    def _decode_categories(self) -> set:
+        """Rebuild the covered-categories set."""
+        categories = {name for name, code in CATEGORY_CODES.items() if self._categories & (1 << code)}
+        if self._extra_categories:
+            categories.update(self._extra_categories)
+        return categories
+
+
+def encode_category(category):
+    """Encode a category as its index in Config.INTERVIEW_CATEGORIES, keeping unknown names as strings."""
+    if category is None:
+        return None
+    code = CATEGORY_CODES.get(category)
+    return code if code is not None else _intern(category)
+
+
+def decode_category(value):
+    """Reverse encode_category."""
+    if isinstance(value, int):
+        return Config.INTERVIEW_CATEGORIES[value]
+    return value
+
+
+def encode_difficulty(difficulty):
+    """Encode a difficulty as its index in Config.DIFFICULTY_LEVELS."""
+    if difficulty is None:
+        return None
+    code = DIFFICULTY_CODES.get(difficulty)
+    return code if code is not None else _intern(difficulty)
+
+
+def decode_difficulty(value):
+    """Reverse encode_difficulty."""
+    if isinstance(value, int):
+        return Config.DIFFICULTY_LEVELS[value]
+    return value
+
+
+def _intern(value):
+    """Intern short strings so repeated values share one object."""
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _intern_evaluation(evaluation: Dict) -> Dict:
+    """Intern the repeated strings in an evaluation dict."""
+    if not isinstance(evaluation, dict):
+        return evaluation
+    return {
+        sys.intern(key): [_intern(item) for item in value] if isinstance(value, list) else _intern(value)
+        for key, value in evaluation.items()
+    }
+
+
+def _as_timestamp(value) -> float:
+    """Accept a datetime, an ISO-format string or epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
@@ -0,0 +1,468 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from utils.session_records import ResponseRecord, SessionRecord
+
+# A mutation reads a session and returns the top-level fields to write and the response to
+# append (or None), or None to leave the session unchanged
+Mutation = Callable[[Dict], Optional[Tuple[Dict, Optional[Dict]]]]
+
+
+class SessionStore:
+    """Storage backend interface used by SessionManager."""
+
+    def get(self, session_id: str, include_responses: bool = True) -> Optional[Dict]:
+        """Load a session, or None if it doesn't exist. Responses may be omitted when not needed."""
+        raise NotImplementedError
+
+    def get_responses(self, session_id: str, offset: int, limit: int) -> List[Dict]:
+        """Get a slice of a session's responses in the order they were added."""
+        raise NotImplementedError
+
+    def put(self, session_id: str, session: Dict) -> None:
+        """Write a complete session, replacing any existing one."""
+        raise NotImplementedError
+
+    def update(self, session_id: str, fields: Dict) -> bool:
+        """Overwrite individual top-level fields of a session."""
+        raise NotImplementedError
+
+    def mutate(self, session_id: str, change: Mutation, idempotency_key: Optional[str] = None) -> bool:
+        """
+        Read, modify and write a session atomically, even across processes sharing the store.
+
+        The change sees the session without its responses and must not call back into the store.
+        With an idempotency key, the change is skipped if a response with that key was already
+        appended, and the appended response is recorded under it. Returns False if the session
+        doesn't exist.
+        """
+        raise NotImplementedError
+
+    def get_submission(self, session_id: str, idempotency_key: str) -> Optional[Dict]:
+        """Get the response appended under an idempotency key, or None if there isn't one."""
+        raise NotImplementedError
+
+    def touch(self, session_id: str, last_activity: datetime) -> None:
+        """Record activity on a session."""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """Delete a session and its responses."""
+        raise NotImplementedError
+
+    def evict_expired(self, cutoff: datetime, limit: int) -> List[str]:
+        """Delete up to limit sessions with no activity since the cutoff, returning their ids."""
+        raise NotImplementedError
+
+    def evict_oldest(self, count: int) -> List[str]:
+        """Delete the count least recently active sessions, returning their ids."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Get the number of stored sessions."""
+        raise NotImplementedError
+
+
+class _Shard:
+    """One partition of the memory store: sessions in last-activity order behind their own lock."""
+
+    __slots__ = ('sessions', 'lock')
+
+    def __init__(self):
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process dictionary backend. Sessions are shared live, so callers' edits apply directly.
+    
+    The table is split into shards by session id, each with its own lock, so requests for
+    different sessions rarely contend. Within a shard sessions are kept in last-activity order:
+    every touch moves a session to the end, so the oldest sessions are always at the front and
+    expiry never has to scan the whole table. Sessions are held as compact SessionRecord
+    objects that behave like the session dict.
+    """
+
+    def __init__(self, shards: int = None):
+        """
+        Initialize the store.
+        
+        Args:
+            shards: Number of independently locked partitions, defaults to Config.SESSION_SHARDS
+        """
+        self._shards = [_Shard() for _ in range(shards or Config.SESSION_SHARDS)]
+
+    def get(self, session_id: str, include_responses: bool = True) -> Optional[Dict]:
+        shard = self._shard(session_id)
+        with shard.lock:
+            return shard.sessions.get(session_id)
+
+    def get_responses(self, session_id: str, offset: int, limit: int) -> List[Dict]:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            responses = session['responses'][offset:offset + limit] if session else []
+        return [response.to_dict() for response in responses]
+
+    def put(self, session_id: str, session: Dict) -> None:
+        record = session if isinstance(session, SessionRecord) else SessionRecord.from_dict(session)
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.sessions[session_id] = record
+            shard.sessions.move_to_end(session_id)
+
+    def update(self, session_id: str, fields: Dict) -> bool:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            if session is None:
+                return False
+            session.update(fields)
+            if 'last_activity' in fields:
+                shard.sessions.move_to_end(session_id)
+            return True
+
+    def mutate(self, session_id: str, change: Mutation, idempotency_key: Optional[str] = None) -> bool:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            if session is None:
+                return False
+            submissions = session.get('submissions') or {}
+            if idempotency_key and idempotency_key in submissions:
+                return True
+
+            result = change(session)
+            if result is None:
+                return True
+            fields, response_data = result
+            if response_data is not None:
+                session['responses'].append(ResponseRecord.from_dict(response_data))
+                if idempotency_key:
+                    # Keys map to the response's position; only the most recent are kept, as
+                    # retries arrive within seconds
+                    submissions = dict(submissions)
+                    submissions[idempotency_key] = len(session['responses']) - 1
+                    while len(submissions) > Config.SUBMISSION_KEYS_PER_SESSION:
+                        del submissions[next(iter(submissions))]
+                    session['submissions'] = submissions
+            session.update(fields)
+            if 'last_activity' in fields:
+                shard.sessions.move_to_end(session_id)
+            return True
+
+    def get_submission(self, session_id: str, idempotency_key: str) -> Optional[Dict]:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            index = (session.get('submissions') or {}).get(idempotency_key) if session else None
+            return session['responses'][index].to_dict() if index is not None else None
+
+    def touch(self, session_id: str, last_activity: datetime) -> None:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            if session is not None:
+                session['last_activity'] = last_activity
+                shard.sessions.move_to_end(session_id)
+
+    def delete(self, session_id: str) -> bool:
+        shard = self._shard(session_id)
+        with shard.lock:
+            return shard.sessions.pop(session_id, None) is not None
+
+    def evict_expired(self, cutoff: datetime, limit: int) -> List[str]:
+        evicted = []
+        cutoff = cutoff.timestamp()
+        for shard in self._shards:
+            # Each shard is locked only for its own short batch
+            with shard.lock:
+                while shard.sessions and len(evicted) < limit:
+                    session_id, session = next(iter(shard.sessions.items()))
+                    if session.last_activity_ts >= cutoff:
+                        break
+                    del shard.sessions[session_id]
+                    evicted.append(session_id)
+            if len(evicted) >= limit:
+                break
+        return evicted
+
+    def evict_oldest(self, count: int) -> List[str]:
+        evicted = []
+        while len(evicted) < count:
+            # The globally oldest session is at the front of one of the shards
+            oldest = None
+            for shard in self._shards:
+                with shard.lock:
+                    if shard.sessions:
+                        session_id, session = next(iter(shard.sessions.items()))
+                        if oldest is None or session.last_activity_ts < oldest[2]:
+                            oldest = (shard, session_id, session.last_activity_ts)
+            if oldest is None:
+                break
+
+            shard, session_id, _ = oldest
+            with shard.lock:
+                if shard.sessions.pop(session_id, None) is not None:
+                    evicted.append(session_id)
+        return evicted
+
+    def count(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
+
+    def _shard(self, session_id: str) -> _Shard:
+        """Get the shard that owns a session id."""
+        return self._shards[hash(session_id) % len(self._shards)]
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite backend in WAL mode, shareable by several worker processes on one host."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            last_activity REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_last_activity ON sessions (last_activity);
+        CREATE TABLE IF NOT EXISTS responses (
+            session_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            idempotency_key TEXT,
+            PRIMARY KEY (session_id, seq)
+        ) WITHOUT ROWID;
+    """
+
+    # Created after the migration below, since older databases lack the column. NULLs are
+    # distinct, so responses without a key never conflict.
+    INDEXES = """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_responses_idempotency_key ON responses (session_id, idempotency_key);
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(self.SCHEMA)
+        columns = [row[1] for row in connection.execute('PRAGMA table_info(responses)')]
+        if 'idempotency_key' not in columns:
+            connection.execute('ALTER TABLE responses ADD COLUMN idempotency_key TEXT')
+        connection.executescript(self.INDEXES)
+
+    def get(self, session_id: str, include_responses: bool = True) -> Optional[Dict]:
+        connection = self._connection()
+        session = self._load(connection, session_id)
+        if session is not None and include_responses:
+            session['responses'] = [
+                json.loads(data) for (data,) in connection.execute(
+                    'SELECT data FROM responses WHERE session_id = ? ORDER BY seq', (session_id,)
+                )
+            ]
+        return session
+
+    def get_responses(self, session_id: str, offset: int, limit: int) -> List[Dict]:
+        return [
+            json.loads(data) for (data,) in self._connection().execute(
+                'SELECT data FROM responses WHERE session_id = ? AND seq >= ? ORDER BY seq LIMIT ?',
+                (session_id, offset, limit)
+            )
+        ]
+
+    def put(self, session_id: str, session: Dict) -> None:
+        data = {key: value for key, value in session.items() if key not in ('responses', 'last_activity')}
+
+        with self._transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, data, last_activity) VALUES (?, ?, ?)',
+                (session_id, json.dumps(_encode_session(data)), _as_datetime(session['last_activity']).timestamp())
+            )
+            connection.execute('DELETE FROM responses WHERE session_id = ?', (session_id,))
+            connection.executemany(
+                'INSERT INTO responses (session_id, seq, data) VALUES (?, ?, ?)',
+                [(session_id, seq, json.dumps(response)) for seq, response in enumerate(session.get('responses', []))]
+            )
+
+    def update(self, session_id: str, fields: Dict) -> bool:
+        with self._transaction() as connection:
+            return self._update_fields(connection, session_id, fields)
+
+    def mutate(self, session_id: str, change: Mutation, idempotency_key: Optional[str] = None) -> bool:
+        # BEGIN IMMEDIATE takes the write lock before the read, so no other process can interleave
+        with self._transaction() as connection:
+            session = self._load(connection, session_id)
+            if session is None:
+                return False
+            if idempotency_key and connection.execute(
+                'SELECT 1 FROM responses WHERE session_id = ? AND idempotency_key = ?', (session_id, idempotency_key)
+            ).fetchone():
+                return True
+
+            result = change(session)
+            if result is None:
+                return True
+
+            fields, response_data = result
+            self._update_fields(connection, session_id, fields)
+            if response_data is not None:
+                # Only the new response row is written; earlier responses are untouched
+                connection.execute(
+                    'INSERT INTO responses (session_id, seq, data, idempotency_key) '
+                    'SELECT ?, COALESCE(MAX(seq) + 1, 0), ?, ? FROM responses WHERE session_id = ?',
+                    (session_id, json.dumps(response_data), idempotency_key or None, session_id)
+                )
+            return True
+
+    def get_submission(self, session_id: str, idempotency_key: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            'SELECT data FROM responses WHERE session_id = ? AND idempotency_key = ?', (session_id, idempotency_key)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def touch(self, session_id: str, last_activity: datetime) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                'UPDATE sessions SET last_activity = ? WHERE session_id = ?',
+                (last_activity.timestamp(), session_id)
+            )
+
+    def delete(self, session_id: str) -> bool:
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM responses WHERE session_id = ?', (session_id,))
+            return connection.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,)).rowcount > 0
+
+    def evict_expired(self, cutoff: datetime, limit: int) -> List[str]:
+        return self._evict(
+            'SELECT session_id FROM sessions WHERE last_activity < ? ORDER BY last_activity LIMIT ?',
+            (cutoff.timestamp(), limit)
+        )
+
+    def evict_oldest(self, count: int) -> List[str]:
+        return self._evict('SELECT session_id FROM sessions ORDER BY last_activity LIMIT ?', (count,))
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def _evict(self, query: str, params: tuple) -> List[str]:
+        """Delete the sessions selected by an indexed query, returning their ids."""
+        with self._transaction() as connection:
+            session_ids = [session_id for (session_id,) in connection.execute(query, params)]
+            connection.executemany('DELETE FROM responses WHERE session_id = ?', [(sid,) for sid in session_ids])
+            connection.executemany('DELETE FROM sessions WHERE session_id = ?', [(sid,) for sid in session_ids])
+        return session_ids
+
+    @staticmethod
+    def _load(connection: sqlite3.Connection, session_id: str) -> Optional[Dict]:
+        """Read a session row without its responses."""
+        row = connection.execute(
+            'SELECT data, last_activity FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        session = _decode_session(json.loads(row[0]))
+        session['last_activity'] = datetime.fromtimestamp(row[1])
+        return session
+
+    def _update_fields(self, connection: sqlite3.Connection, session_id: str, fields: Dict) -> bool:
+        """Merge fields into a session row inside an open transaction."""
+        row = connection.execute('SELECT data FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            return False
+
+        fields = dict(fields)
+        last_activity = fields.pop('last_activity', None)
+
+        if fields:
+            data = json.loads(row[0])
+            data.update(_encode_session(fields))
+            connection.execute('UPDATE sessions SET data = ? WHERE session_id = ?', (json.dumps(data), session_id))
+        if last_activity is not None:
+            connection.execute(
+                'UPDATE sessions SET last_activity = ? WHERE session_id = ?',
+                (_as_datetime(last_activity).timestamp(), session_id)
+            )
+        return True
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use and again after a fork."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _transaction(self):
+        """Open a write transaction that takes the database write lock up front."""
+        return _Transaction(self._connection())
+
+
+class _Transaction:
+    """Context manager for a BEGIN IMMEDIATE ... COMMIT/ROLLBACK block."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def create_session_store() -> SessionStore:
+    """Create the session store selected by Config.SESSION_STORE."""
+    backend = Config.SESSION_STORE.lower()
+    if backend == 'memory':
+        return MemorySessionStore()
+    if backend == 'sqlite':
+        return SQLiteSessionStore(Config.SESSION_DB_PATH)
+    raise ValueError(f"Unknown session store backend: {Config.SESSION_STORE}")
+
+
+def _encode_session(data: Dict) -> Dict:
+    """Convert session fields to JSON-serializable values."""
+    encoded = {}
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, set):
+            value = sorted(value)
+        encoded[key] = value
+    return encoded
+
+
+def _decode_session(data: Dict) -> Dict:
+    """Restore session fields stored by _encode_session."""
+    if 'created_at' in data:
+        data['created_at'] = _as_datetime(data['created_at'])
+    if 'categories_covered' in data:
+        data['categories_covered'] = set(data['categories_covered'])
+    return data
+
+
+def _as_datetime(value) -> datetime:
+    """Accept either a datetime or an ISO-format string."""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# Published in place of a result when the leader stopped without one (cancelled, interrupted);
+# followers seeing it start the call again rather than inherit the leader's BaseException
+_ABANDONED = object()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so only one of them reaches the upstream.
+
+    The first caller for a key runs the call; callers arriving while it is in flight wait for
+    and share its result or exception. Threads and coroutines share the same in-flight table,
+    so a coroutine can join a call started by a thread and vice versa. Only a result or an
+    Exception is shared: if the leader stops with a BaseException such as a cancellation, a
+    waiting caller takes over and makes the call itself.
+    """
+
+    def __init__(self):
+        """Initialize an empty in-flight table."""
+        self._calls = {}  # key -> Future
+        self._lock = threading.Lock()
+
+        self.upstream = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a call, or wait for an identical one already in flight.
+
+        Args:
+            key: Identity of the call; equal keys are coalesced
+            fn: Function making the upstream call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The call's result, shared by every coalesced caller
+        """
+        future, leader = self._join(key)
+        if not leader:
+            result = future.result()
+            if result is _ABANDONED:
+                return self.do(key, fn, *args, **kwargs)
+            return result
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Async version of do; fn is a coroutine function."""
+        future, leader = self._join(key)
+        if not leader:
+            # Shielded so a cancelled follower doesn't cancel the shared future for the rest
+            result = await asyncio.shield(asyncio.wrap_future(future))
+            if result is _ABANDONED:
+                return await self.ado(key, fn, *args, **kwargs)
+            return result
+
+        # The call runs in its own task, so cancelling the leader leaves it running for the followers
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+        task.add_done_callback(lambda done: self._finish_task(key, future, done))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict:
+        """Get upstream and coalesced call counts and the number of calls in flight."""
+        with self._lock:
+            in_flight = len(self._calls)
+
+        return {
+            'in_flight': in_flight,
+            'upstream': self.upstream,
+            'coalesced': self.coalesced
+        }
+
+    def _join(self, key: Hashable):
+        """Register as the leader for a key, or get the leader's future."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self.upstream += 1
+            return future, True
+
+    def _finish_task(self, key: Hashable, future: Future, task: asyncio.Future) -> None:
+        """Publish the outcome of an async leader's task."""
+        if task.cancelled():
+            self._finish(key, future, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish(key, future, error=task.exception())
+        else:
+            self._finish(key, future, result=task.result())
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None) -> None:
+        """Publish the leader's outcome and let later callers start a fresh call."""
+        with self._lock:
+            self._calls.pop(key, None)
+
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.set_result(_ABANDONED)
@@ -0,0 +1,120 @@
+import math
+import re
+from typing import Dict, List, Tuple
+
+from config import Config
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+LINE_SPACE_PATTERN = re.compile(r"[ \t]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+TRUNCATION_MARKER = ' […] '
+
+# Compact evaluation keys requested from the model, expanded before anything else sees them
+EVALUATION_KEYS = {
+    's': 'score',
+    'st': 'strengths',
+    'w': 'weaknesses',
+    'f': 'feedback',
+    'i': 'improvement_areas',
+    'r': 'resources'
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without a tokenizer.
+
+    Words and punctuation marks are roughly one token each, and long or unusual
+    words split into several, so the larger of the word count and a quarter of the
+    character count is a close, slightly pessimistic estimate for English.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return max(len(TOKEN_PATTERN.findall(text)), math.ceil(len(text) / 4))
+
+
+def compact_whitespace(text: str) -> str:
+    """Collapse runs of spaces, strip every line and keep at most one blank line in a row."""
+    lines = [LINE_SPACE_PATTERN.sub(' ', line).strip() for line in str(text).strip().split('\n')]
+    return BLANK_LINES_PATTERN.sub('\n\n', '\n'.join(lines))
+
+
+def fit_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Shorten a text to about a token budget, keeping its beginning and end.
+
+    Args:
+        text: Text to fit
+        max_tokens: Token budget
+
+    Returns:
+        Tuple of (text, truncated); the cut is marked with an ellipsis
+    """
+    text = compact_whitespace(text)
+    if estimate_tokens(text) <= max_tokens:
+        return text, False
+
+    # Most of the budget goes to the opening, where answers set up their example,
+    # and the rest to the ending, where the result usually is
+    chars = max_tokens * 4
+    head = text[:int(chars * 0.7)].rsplit(' ', 1)[0]
+    tail = text[-int(chars * 0.3):].split(' ', 1)[-1]
+    return head + TRUNCATION_MARKER + tail, True
+
+
+def fit_qa_pairs(questions_answers: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], bool]:
+    """
+    Fit Q&A pairs into the Q&A prompt budget.
+
+    Each question and answer is capped, and the answer cap shrinks when there are
+    many pairs so the combined prompt stays within Config.QA_PROMPT_MAX_TOKENS.
+
+    Args:
+        questions_answers: List of (question, answer) tuples
+
+    Returns:
+        Tuple of (fitted pairs, whether anything was truncated)
+    """
+    if not questions_answers:
+        return [], False
+
+    per_pair = Config.QA_PROMPT_MAX_TOKENS // len(questions_answers)
+    question_cap = min(Config.QA_QUESTION_MAX_TOKENS, max(20, per_pair // 4))
+    answer_cap = min(Config.QA_ANSWER_MAX_TOKENS, max(40, per_pair - question_cap))
+
+    fitted = []
+    truncated = False
+    for question, answer in questions_answers:
+        question, question_cut = fit_tokens(question, question_cap)
+        answer, answer_cut = fit_tokens(answer, answer_cap)
+        fitted.append((question, answer))
+        truncated = truncated or question_cut or answer_cut
+    return fitted, truncated
+
+
+def output_budget(call_type: str, items: int = 1) -> int:
+    """
+    Completion token cap for a call type, sized to the output it is expected to produce.
+
+    Args:
+        call_type: Kind of call, as used by LLMClient
+        items: Number of questions or Q&A pairs the output covers, for list-shaped outputs
+
+    Returns:
+        Maximum completion tokens
+    """
+    per_item = Config.LLM_OUTPUT_TOKENS_PER_ITEM.get(call_type)
+    if per_item is not None:
+        return min(Config.LLM_MAX_OUTPUT_TOKENS, Config.LLM_OUTPUT_TOKENS_OVERHEAD + per_item * max(1, items))
+    return Config.LLM_OUTPUT_TOKENS.get(call_type, Config.OPENAI_MAX_TOKENS)
+
+
+def expand_evaluation(evaluation: Dict) -> Dict:
+    """Expand compact evaluation keys; full-length keys pass through unchanged."""
+    return {EVALUATION_KEYS.get(key, key): value for key, value in evaluation.items()}
@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production servers, e.g.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Background threads are started per worker by the gunicorn config; other servers that
+don't fork after loading this module get them started here.
+"""
+
+import os
+
+from app import create_app
+
+app = create_app(start_background=os.environ.get('MOCKMATE_PRELOAD') != '1')